@@ -21,8 +21,9 @@
 
 import json
 import statistics
+from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple, cast
+from typing import Any, Callable, Dict, List, Tuple, cast
 
 from autonomy.analyse.benchmark.html import (
     BLOCK_TEMPLATE,
@@ -34,10 +35,26 @@ from autonomy.analyse.benchmark.html import (
 )
 
 
+SAMPLES_FILE = "samples.jsonl"
+NS_PER_MS = 1e6
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Get the q-th percentile of the values, interpolating linearly between the closest ranks."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
 STATISTICS = {
     "Mean": statistics.mean,
     "Maximum": max,
     "Minimum": min,
+    "P50": partial(percentile, q=50),
+    "P90": partial(percentile, q=90),
+    "P99": partial(percentile, q=99),
 }
 
 
@@ -85,6 +102,67 @@ def read_benchmark_data(
     return benchmark_data
 
 
+def read_samples(
+    path: Path,
+    block_type: str = BlockTypes.ALL,
+    period: int = -1,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Returns the samples of every agent, grouped by behaviour block or ABCI request.
+
+    :param path: the path to the benchmarks directory.
+    :param block_type: the block type to keep the behaviours' samples of. The ABCI requests' samples are only kept for all the blocks.
+    :param period: the period to keep the samples of, -1 for all the periods.
+    :return: the samples of every agent, grouped by behaviour block or ABCI request.
+    """
+    samples: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    all_periods = period == -1
+    for agent_dir in path.iterdir():
+        samples_file = agent_dir / SAMPLES_FILE
+        if not samples_file.is_file():
+            continue
+        agent_samples = samples.setdefault(agent_dir.name, {})
+        with open(samples_file, encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                if not all_periods and record["period"] != period:
+                    continue
+                if "abci" in record:
+                    if block_type != BlockTypes.ALL:
+                        continue
+                    key = f"abci: {record['abci']}"
+                elif block_type in (BlockTypes.ALL, BlockTypes.TOTAL, record["block"]):
+                    key = f"{record['behaviour']}: {record['block']}"
+                else:
+                    continue
+                agent_samples.setdefault(key, []).append(record)
+    return samples
+
+
+def create_samples_table(samples: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Create a table with the percentiles of the samples of an agent, in milliseconds."""
+    header_columns = ["Samples", "Count", "Mean CPU", *STATISTICS]
+    thead = "".join(map(TH_TEMPLATE.format, header_columns))
+    tbody = ""
+    for key in sorted(samples):
+        wall_times = [record["wall_ns"] / NS_PER_MS for record in samples[key]]
+        cpu_times = [record["cpu_ns"] / NS_PER_MS for record in samples[key]]
+        rows = TD_TEMPLATE.format(key)
+        rows += TD_TEMPLATE.format(len(wall_times))
+        rows += TD_TEMPLATE.format(statistics.mean(cpu_times))
+        for aggregator in STATISTICS.values():
+            rows += TD_TEMPLATE.format(cast(Callable, aggregator)(wall_times))
+        tbody += TROW_TEMPLATE.format(rows)
+    return BLOCK_TEMPLATE.format(
+        table=TABLE_TEMPLATE.format(
+            colspan=len(header_columns),
+            block_type="samples (ms)",
+            thead=thead,
+            tbody=tbody,
+        ),
+    )
+
+
 def add_statistic(
     name: str,
     aggregator: Callable,
@@ -186,6 +264,7 @@ def aggregate(path: Path, block_type: str, period: int, output: Path) -> None:
         block_type=block_type,
         period=period,
     )
+    samples = read_samples(path, block_type=block_type, period=period)
     tables = [
         create_agent_table(
             agent=agent,
@@ -194,6 +273,7 @@ def aggregate(path: Path, block_type: str, period: int, output: Path) -> None:
                 BlockTypes.types if block_type == BlockTypes.ALL else (block_type,)
             ),
         )
+        + (create_samples_table(samples[agent]) if samples.get(agent) else "")
         for agent, data in benchmark_data.items()
     ]
 
@@ -36,3 +36,31 @@ ENTER_ROUND_REGEX = re.compile(r"Entered in the \'([a-z_]+)\' round for period (
 EXIT_ROUND_REGEX = re.compile(r"'([a-z_]+)' round is done with event: (Event\.[A-Z_]+)")
 
 LogRow = Tuple[datetime, str, str, int, str, str]
+
+# Length of a `TIME_FORMAT` timestamp with millisecond precision,
+# eg. `2023-01-23 15:39:20,424`
+TIMESTAMP_LENGTH = 23
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """
+    Parse a log timestamp.
+
+    Log timestamps have a fixed width, so the fields can be sliced out
+    directly which is a lot faster than `datetime.strptime`. Timestamps
+    that do not have the expected shape fall back to `datetime.strptime`.
+
+    :param timestamp: timestamp string in `TIME_FORMAT` format
+    :return: parsed timestamp
+    """
+    if len(timestamp) != TIMESTAMP_LENGTH or timestamp[19] != ",":
+        return datetime.strptime(timestamp, TIME_FORMAT)
+    return datetime(
+        int(timestamp[0:4]),
+        int(timestamp[5:7]),
+        int(timestamp[8:10]),
+        int(timestamp[11:13]),
+        int(timestamp[14:16]),
+        int(timestamp[17:19]),
+        int(timestamp[20:23]) * 1000,
+    )
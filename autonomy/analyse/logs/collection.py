@@ -21,10 +21,11 @@
 
 
 import re
+import tempfile
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Generator, List, Optional, TextIO, Tuple, cast
+from typing import Dict, Generator, List, Optional, TextIO, Tuple, cast
 
 from autonomy.analyse.logs.base import (
     ENTER_BEHAVIOUR_REGEX,
@@ -32,7 +33,7 @@ from autonomy.analyse.logs.base import (
     LOG_ROW_REGEX,
     LogRow,
     TIMESTAMP_REGEX,
-    TIME_FORMAT,
+    parse_timestamp,
 )
 from autonomy.analyse.logs.db import AgentLogsDB
 
@@ -56,8 +57,22 @@ class LogCollection(ABC):
         agent: str,
         db: AgentLogsDB,
         reset: bool = False,
-    ) -> "LogCollection":
-        """Create logs database."""
+    ) -> int:
+        """Create logs database and return the number of inserted rows."""
+
+    def create_agent_dbs(
+        self,
+        dbs: Dict[str, AgentLogsDB],
+        reset: bool = False,
+        max_workers: Optional[int] = None,  # pylint: disable=unused-argument
+    ) -> int:
+        """Create logs databases for the agents which are not ingested yet."""
+        n_rows = 0
+        for agent, db in dbs.items():
+            if db.exists() and not reset:
+                continue
+            n_rows += self.create_agent_db(agent=agent, db=db, reset=reset)
+        return n_rows
 
     @staticmethod
     def get_next_log_block(
@@ -92,7 +107,7 @@ class LogCollection(ABC):
 
                 match = LOG_ROW_REGEX.match(string=cast(str, line))
                 _timestamp, log_level, _, log_block, _ = cast(re.Match, match).groups()
-                timestamp = datetime.strptime(_timestamp, TIME_FORMAT)
+                timestamp = parse_timestamp(_timestamp)
                 match = ENTER_BEHAVIOUR_REGEX.match(string=log_block)
                 if match is not None:
                     (current_behaviour,) = match.groups()
@@ -126,14 +141,68 @@ class FromDirectory(LogCollection):
         agent: str,
         db: AgentLogsDB,
         reset: bool = False,
-    ) -> "FromDirectory":
+    ) -> int:
         """Create logs table for agent."""
 
         log_file = self.directory / f"{agent}.txt"
         db.create(reset=reset)
-        db.insert_many(
+        return db.insert_many(
             logs=self.parse(
                 file=log_file,
             )
         )
-        return self
+
+    def create_agent_dbs(
+        self,
+        dbs: Dict[str, AgentLogsDB],
+        reset: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """
+        Create logs tables for the agents which are not ingested yet.
+
+        The log files are parsed in parallel, one process per agent, into
+        temporary databases. Since SQLite only allows a single writer the
+        tables are then copied into the target database one at a time.
+
+        :param dbs: agent databases
+        :param reset: reset the existing tables
+        :param max_workers: number of worker processes, parse in the current process if set to 1
+        :return: number of inserted rows
+        """
+        agents = [agent for agent, db in dbs.items() if reset or not db.exists()]
+        if len(agents) < 2 or max_workers == 1:
+            return super().create_agent_dbs(
+                dbs={agent: dbs[agent] for agent in agents}, reset=reset
+            )
+
+        n_rows = 0
+        with tempfile.TemporaryDirectory() as temp_dir, ProcessPoolExecutor(
+            max_workers=min(max_workers or len(agents), len(agents))
+        ) as executor:
+            futures = {
+                agent: executor.submit(
+                    _parse_to_db,
+                    log_file=self.directory / f"{agent}.txt",
+                    agent=agent,
+                    db_file=Path(temp_dir, f"{agent}.db"),
+                )
+                for agent in agents
+            }
+            for agent, future in futures.items():
+                future.result()
+                n_rows += (
+                    dbs[agent]
+                    .create(reset=reset)
+                    .copy_from(file=Path(temp_dir, f"{agent}.db"))
+                )
+        return n_rows
+
+
+def _parse_to_db(log_file: Path, agent: str, db_file: Path) -> int:
+    """Parse a log file into a standalone database, runs in a worker process."""
+    db = AgentLogsDB(agent=agent, file=db_file).create(reset=True)
+    try:
+        return db.insert_many(logs=LogCollection.parse(file=log_file), index=False)
+    finally:
+        db.close()
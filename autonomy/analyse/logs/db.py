@@ -19,10 +19,13 @@
 
 """Database schemas and helpers"""
 
+import re
 import sqlite3
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Iterator, List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
 
 from autonomy.analyse.logs.base import LogRow
 
@@ -44,6 +47,33 @@ QUERY_CHECK_TABLE_EXISTS = (
 )
 QUERY_DROP_TABLE = "DROP TABLE {agent};"
 QUERY_INSERT_LOG = "INSERT INTO {agent} VALUES (?, ?, ?, ?, ?, ?);"
+QUERY_CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS {agent}_{column} ON {agent} ({column});"
+)
+QUERY_ATTACH_DB = "ATTACH DATABASE ? AS source;"
+QUERY_DETACH_DB = "DETACH DATABASE source;"
+QUERY_COPY_LOGS = "INSERT INTO {agent} SELECT * FROM source.{agent};"
+
+INDEXED_COLUMNS = (TIMESTAMP, PERIOD, ROUND)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-65536;",
+)
+DEFAULT_INSERT_BATCH_SIZE = 10_000
+REGEX_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a regex, the patterns are compiled once per query rather than once per row."""
+    return re.compile(pattern)
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    """Implements the SQLite `REGEXP` operator, `value REGEXP pattern`, with `re.match` semantics."""
+    return value is not None and _compile(pattern).match(value) is not None
 
 
 class AgentLogsDB:
@@ -60,6 +90,9 @@ class AgentLogsDB:
             database=self._db_path,
             detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
         )
+        for pragma in PRAGMAS:
+            self._db.execute(pragma)
+        self._db.create_function("REGEXP", 2, _regexp, deterministic=True)
 
     def select(  # pylint: disable=too-many-arguments
         self,
@@ -69,44 +102,98 @@ class AgentLogsDB:
         period: Optional[int] = None,
         round_name: Optional[str] = None,
         behaviour_name: Optional[str] = None,
+        include_regexes: Sequence[str] = (),
+        exclude_regexes: Sequence[str] = (),
     ) -> List[LogRow]:
         """Build select query."""
 
-        query = f"SELECT * from {self.agent}"  # nosec
-        paramaters: List[Any] = []
+        return list(
+            self.iter_select(
+                start_time=start_time,
+                end_time=end_time,
+                log_level=log_level,
+                period=period,
+                round_name=round_name,
+                behaviour_name=behaviour_name,
+                include_regexes=include_regexes,
+                exclude_regexes=exclude_regexes,
+            )
+        )
 
-        def _append_condition(_query: str, condition: str) -> str:
-            """Append condition at the end of the query."""
-            if "WHERE" in query:
-                return query + " AND " + condition
-            return query + " WHERE " + condition
+    def iter_select(  # pylint: disable=too-many-arguments
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        log_level: Optional[str] = None,
+        period: Optional[int] = None,
+        round_name: Optional[str] = None,
+        behaviour_name: Optional[str] = None,
+        include_regexes: Sequence[str] = (),
+        exclude_regexes: Sequence[str] = (),
+    ) -> Iterator[LogRow]:
+        """
+        Build select query and stream the matching rows.
+
+        The regex filters are evaluated by SQLite through the `REGEXP` function,
+        so the rows which are filtered out are never loaded in memory.
+
+        :param start_time: only select the rows after this time
+        :param end_time: only select the rows before this time
+        :param log_level: only select the rows with this log level
+        :param period: only select the rows of this period
+        :param round_name: only select the rows of this round
+        :param behaviour_name: only select the rows of this behaviour
+        :param include_regexes: only select the rows whose message matches any of these regexes
+        :param exclude_regexes: skip the rows whose message matches all of these regexes
+        :return: iterator over the selected rows
+        """
+
+        conditions: List[str] = []
+        paramaters: List[Any] = []
 
         if start_time is not None:
-            query = _append_condition(_query=query, condition=f"{TIMESTAMP}>?")
+            conditions.append(f"{TIMESTAMP}>?")
             paramaters.append(start_time)
 
         if end_time is not None:
-            query = _append_condition(_query=query, condition=f"{TIMESTAMP}<?")
+            conditions.append(f"{TIMESTAMP}<?")
             paramaters.append(end_time)
 
         if log_level is not None:
-            query = _append_condition(_query=query, condition=f"{LOG_LEVEL}=?")
+            conditions.append(f"{LOG_LEVEL}=?")
             paramaters.append(log_level)
 
         if period is not None:
-            query = _append_condition(_query=query, condition=f"{PERIOD}=?")
+            conditions.append(f"{PERIOD}=?")
             paramaters.append(period)
 
         if round_name is not None:
-            query = _append_condition(_query=query, condition=f"{ROUND}=?")
+            conditions.append(f"{ROUND}=?")
             paramaters.append(round_name)
 
         if behaviour_name is not None:
-            query = _append_condition(_query=query, condition=f"{BEHAVIOUR}=?")
+            conditions.append(f"{BEHAVIOUR}=?")
             paramaters.append(behaviour_name)
 
+        if len(include_regexes) > 0:
+            conditions.append(
+                "(" + " OR ".join([f"{MESSAGE} REGEXP ?"] * len(include_regexes)) + ")"
+            )
+            paramaters.extend(include_regexes)
+
+        if len(exclude_regexes) > 0:
+            conditions.append(
+                "("
+                + " OR ".join([f"NOT {MESSAGE} REGEXP ?"] * len(exclude_regexes))
+                + ")"
+            )
+            paramaters.extend(exclude_regexes)
+
+        query = f"SELECT * from {self.agent}"  # nosec
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
         query += ";"
-        return self.cursor.execute(query, paramaters).fetchall()
+        return iter(self.cursor.execute(query, paramaters))
 
     def execution_path(self) -> List[Tuple[int, str, str]]:
         """Extraction FSM execution path"""
@@ -137,7 +224,7 @@ class AgentLogsDB:
 
         exists = self.exists()
         if exists and not reset:
-            return self
+            return self.create_indexes()
 
         if exists and reset:
             self.delete()
@@ -147,15 +234,63 @@ class AgentLogsDB:
 
         return self
 
+    def create_indexes(self) -> "AgentLogsDB":
+        """Create indexes on the columns used for filtering."""
+        for column in INDEXED_COLUMNS:
+            self._db.execute(QUERY_CREATE_INDEX.format(agent=self.agent, column=column))
+        self._db.commit()
+        return self
+
     def insert_many(
         self,
         logs: Iterator[LogRow],
-    ) -> "AgentLogsDB":
-        """Insert a record"""
-        for timestamp, log_level, message, period, round_name, behaviour_name in logs:
-            self.cursor.execute(
-                QUERY_INSERT_LOG.format(agent=self.agent),
-                (timestamp, log_level, message, period, round_name, behaviour_name),
-            )
-        self._db.commit()
-        return self
+        batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+        index: bool = True,
+    ) -> int:
+        """
+        Insert records in batches.
+
+        All of the batches are inserted in a single transaction, the indexes
+        are built once the rows are in place since that is cheaper than
+        updating them on every insert.
+
+        :param logs: log rows to insert
+        :param batch_size: number of rows to insert per `executemany` call
+        :param index: build the column indexes after inserting the rows
+        :return: number of inserted rows
+        """
+        query = QUERY_INSERT_LOG.format(agent=self.agent)
+        logs = iter(logs)
+        n_rows = 0
+        with self._db:
+            while True:
+                batch = list(islice(logs, batch_size))
+                if len(batch) == 0:
+                    break
+                self._db.executemany(query, batch)
+                n_rows += len(batch)
+        if index:
+            self.create_indexes()
+        return n_rows
+
+    def copy_from(self, file: Path) -> int:
+        """
+        Copy the agent table from another logs database.
+
+        :param file: path to the database to copy the rows from
+        :return: number of copied rows
+        """
+        self._db.execute(QUERY_ATTACH_DB, (str(file),))
+        try:
+            with self._db:
+                n_rows = self._db.execute(
+                    QUERY_COPY_LOGS.format(agent=self.agent)
+                ).rowcount
+        finally:
+            self._db.execute(QUERY_DETACH_DB)
+        self.create_indexes()
+        return n_rows
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2023 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Cross agent timeline of the rounds and behaviours."""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from autonomy.analyse.logs.db import BEHAVIOUR, PERIOD, PRAGMAS, ROUND, TIMESTAMP
+
+
+ROUND_SPAN = "round"
+BEHAVIOUR_SPAN = "behaviour"
+STARTUP_SPAN = "agent_startup"
+
+QUERY_CREATE_SPANS_TABLE = (
+    "CREATE TEMP TABLE spans (kind TEXT, agent TEXT, period INTEGER, name TEXT, "
+    "occurrence INTEGER, entered TIMESTAMP, exited TIMESTAMP, latency REAL, "
+    "round_name TEXT);"
+)
+QUERY_CREATE_SPANS_INDEXES = (
+    "CREATE INDEX temp.spans_kind_name ON spans (kind, name);",
+    "CREATE INDEX temp.spans_kind_period_name ON spans (kind, period, name, occurrence);",
+)
+
+# A span starts on the first row logged after the agent moves to a new
+# round (or behaviour) and ends when the agent moves on to the next one.
+# The rows are ordered by `rowid` which preserves the order of the log file.
+# The spans are filtered only once they are extracted from the whole table,
+# so the filters do not change where a span ends or its occurrence number.
+QUERY_SELECT_SPANS = (
+    "SELECT * FROM ("
+    "SELECT ? AS kind, ? AS agent, {period}, name, "
+    "ROW_NUMBER() OVER (PARTITION BY {period}, name ORDER BY row_id), entered, exited, "
+    "(julianday(exited) - julianday(entered)) * 86400.0, {round} "
+    "FROM ("
+    "SELECT row_id, {period}, name, {round}, {timestamp} AS entered, "
+    "LEAD({timestamp}) OVER (ORDER BY row_id) AS exited "
+    "FROM ("
+    "SELECT rowid AS row_id, {timestamp}, {period}, {round}, {column} AS name, "
+    "LAG({column}) OVER (ORDER BY rowid) AS previous_name, "
+    "LAG({period}) OVER (ORDER BY rowid) AS previous_period "
+    "FROM {agent}"
+    ") WHERE previous_name IS NULL OR previous_name != name OR previous_period != {period}"
+    ") WHERE name != ?"
+    ")"
+)
+
+# Percentiles use the nearest rank method, the `p`th percentile is the
+# smallest latency which is greater or equal to `p` percent of the latencies.
+QUERY_LATENCY_STATS = (
+    "SELECT name, COUNT(*), AVG(latency), "
+    "MIN(CASE WHEN rank * 100 >= total * 50 THEN latency END), "
+    "MIN(CASE WHEN rank * 100 >= total * 95 THEN latency END), "
+    "MIN(CASE WHEN rank * 100 >= total * 99 THEN latency END), "
+    "MAX(latency) "
+    "FROM ("
+    "SELECT name, latency, "
+    "ROW_NUMBER() OVER (PARTITION BY name ORDER BY latency) AS rank, "
+    "COUNT(*) OVER (PARTITION BY name) AS total "
+    "FROM spans WHERE kind=? AND latency IS NOT NULL"
+    ") GROUP BY name ORDER BY 5 DESC, 1 LIMIT ?;"
+)
+QUERY_SLOWEST_SPANS = (
+    "SELECT agent, period, name, latency FROM spans "
+    "WHERE kind=? AND latency IS NOT NULL "
+    "ORDER BY latency DESC, agent, period LIMIT ?;"
+)
+QUERY_ROUND_SKEWS = (
+    "SELECT period, name, COUNT(*), "
+    "(julianday(MAX(entered)) - julianday(MIN(entered))) * 86400.0 AS enter_skew, "
+    "(julianday(MAX(exited)) - julianday(MIN(exited))) * 86400.0 "
+    "FROM spans WHERE kind=? "
+    "GROUP BY period, name, occurrence HAVING COUNT(*) > 1 "
+    "ORDER BY enter_skew DESC, period, name LIMIT ?;"
+)
+QUERY_AGENT_LAGS = (
+    "SELECT agent, COUNT(*), AVG(lag), MAX(lag) FROM ("
+    "SELECT agent, (julianday(entered) - julianday("
+    "MIN(entered) OVER (PARTITION BY period, name, occurrence)"
+    ")) * 86400.0 AS lag "
+    "FROM spans WHERE kind=?"
+    ") GROUP BY agent ORDER BY 3 DESC, agent;"
+)
+
+DEFAULT_TOP = 10
+
+# name, count, mean, p50, p95, p99, max
+LatencyStats = Tuple[str, int, float, float, float, float, float]
+# agent, period, name, latency
+SpanLatency = Tuple[str, int, str, float]
+# period, name, number of agents, enter skew, exit skew
+RoundSkew = Tuple[int, str, int, float, Optional[float]]
+# agent, number of rounds, mean lag, max lag
+AgentLag = Tuple[str, int, float, float]
+
+
+class AgentsTimeline:
+    """
+    Timeline of the rounds and behaviours of a set of agents.
+
+    The spans of every round and behaviour of the agents are extracted from
+    the agent log tables with window functions into an indexed temporary
+    table, the statistics are then computed by joining the agents on the
+    period and the round.
+    """
+
+    _db: sqlite3.Connection
+
+    def __init__(self, agents: List[str], file: Path) -> None:
+        """Initialize object."""
+
+        self.agents = agents
+        self._db_path = file
+        self._db = sqlite3.connect(database=self._db_path)
+        for pragma in PRAGMAS:
+            self._db.execute(pragma)
+
+    def create(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        period: Optional[int] = None,
+        round_name: Optional[str] = None,
+    ) -> "AgentsTimeline":
+        """
+        Extract the round and behaviour spans of the agents.
+
+        :param start_time: only keep the spans entered after this time
+        :param end_time: only keep the spans entered before this time
+        :param period: only keep the spans of this period
+        :param round_name: only keep the spans of this round
+        :return: the timeline
+        """
+
+        conditions: List[str] = []
+        paramaters: List[Any] = []
+
+        if start_time is not None:
+            conditions.append("entered>?")
+            paramaters.append(start_time)
+
+        if end_time is not None:
+            conditions.append("entered<?")
+            paramaters.append(end_time)
+
+        if period is not None:
+            conditions.append(f"{PERIOD}=?")
+            paramaters.append(period)
+
+        if round_name is not None:
+            conditions.append(f"{ROUND}=?")
+            paramaters.append(round_name)
+
+        with self._db:
+            self._db.execute(QUERY_CREATE_SPANS_TABLE)
+            for agent in self.agents:
+                for kind, column in ((ROUND_SPAN, ROUND), (BEHAVIOUR_SPAN, BEHAVIOUR)):
+                    query = "INSERT INTO spans " + QUERY_SELECT_SPANS.format(
+                        agent=agent,
+                        column=column,
+                        period=PERIOD,
+                        round=ROUND,
+                        timestamp=TIMESTAMP,
+                    )
+                    if len(conditions) > 0:
+                        query += " WHERE " + " AND ".join(conditions)
+                    self._db.execute(
+                        query + ";", (kind, agent, STARTUP_SPAN, *paramaters)
+                    )
+            for query in QUERY_CREATE_SPANS_INDEXES:
+                self._db.execute(query)
+        return self
+
+    def round_latencies(self, top: int = DEFAULT_TOP) -> List[LatencyStats]:
+        """Latency distribution of the rounds, slowest `p95` first."""
+
+        return self._db.execute(QUERY_LATENCY_STATS, (ROUND_SPAN, top)).fetchall()
+
+    def behaviour_latencies(self, top: int = DEFAULT_TOP) -> List[LatencyStats]:
+        """Latency distribution of the behaviours, slowest `p95` first."""
+
+        return self._db.execute(QUERY_LATENCY_STATS, (BEHAVIOUR_SPAN, top)).fetchall()
+
+    def slowest_rounds(self, top: int = DEFAULT_TOP) -> List[SpanLatency]:
+        """Slowest rounds across all of the agents and periods."""
+
+        return self._db.execute(QUERY_SLOWEST_SPANS, (ROUND_SPAN, top)).fetchall()
+
+    def round_skews(self, top: int = DEFAULT_TOP) -> List[RoundSkew]:
+        """Rounds with the largest difference between the agents entering them."""
+
+        return self._db.execute(QUERY_ROUND_SKEWS, (ROUND_SPAN, top)).fetchall()
+
+    def agent_lags(self) -> List[AgentLag]:
+        """How far behind the first agent each agent enters the rounds."""
+
+        return self._db.execute(QUERY_AGENT_LAGS, (ROUND_SPAN,)).fetchall()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
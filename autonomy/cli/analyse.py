@@ -33,6 +33,7 @@ from aea.configurations.data_types import PublicId
 from autonomy.analyse.benchmark.aggregate import BlockTypes, aggregate
 from autonomy.analyse.handlers import check_handlers
 from autonomy.analyse.logs.base import TIME_FORMAT
+from autonomy.analyse.logs.timeline import DEFAULT_TOP
 from autonomy.chain.config import ChainType
 from autonomy.cli.helpers.analyse import (
     ParseLogs,
@@ -56,6 +57,8 @@ from autonomy.deploy.constants import LOGGING_LEVELS
 
 TIME_FORMAT_TEMPLATE = "YYYY-MM-DD H:M:S,MS"
 BENCHMARKS_DIR = Path("./benchmarks.html")
+FSM_OUTPUT = "fsm"
+TIMELINE_OUTPUT = "timeline"
 
 filterwarnings("ignore")
 
@@ -231,11 +234,23 @@ def docstrings(ctx: Context, update: bool) -> None:
 )
 @click.option(
     "--fsm",
-    "fsm_path",
-    is_flag=True,
-    type=str,
+    "output",
+    flag_value=FSM_OUTPUT,
     help="Print only the FSM execution path",
 )
+@click.option(
+    "--timeline",
+    "output",
+    flag_value=TIMELINE_OUTPUT,
+    help="Print the round latency statistics and the skew between the selected agents",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TOP,
+    show_default=True,
+    help="Number of entries to show in the timeline statistics.",
+)
 @click.option(
     "-ir",
     "--include-regex",
@@ -252,6 +267,12 @@ def docstrings(ctx: Context, update: bool) -> None:
     type=str,
     help="Regex pattern to exclude from the result.",
 )
+@click.option(
+    "--workers",
+    "max_workers",
+    type=click.IntRange(min=1),
+    help="Number of processes used for parsing the agent logs. Defaults to one per agent.",
+)
 def _parse_logs(  # pylint: disable=too-many-arguments
     logs_dir: Optional[Path],
     agents: List[str],
@@ -264,7 +285,9 @@ def _parse_logs(  # pylint: disable=too-many-arguments
     include_regexes: List[str],
     exclude_regexes: List[str],
     reset_db: bool = False,
-    fsm_path: bool = False,
+    output: Optional[str] = None,
+    top: int = DEFAULT_TOP,
+    max_workers: Optional[int] = None,
 ) -> None:
     """A tool for analysing autonomous agent runtime logs"""
 
@@ -274,13 +297,19 @@ def _parse_logs(  # pylint: disable=too-many-arguments
         if parser.n_agents == 0:
             raise click.ClickException(f"Cannot find agent log data in {logs_dir}")
 
-    if len(agents) == 0:
-        raise click.ClickException(
-            f"Please provide agent IDs to select logs; Available agents: {parser.agents}"
-        )
+    try:
+        if len(agents) == 0:
+            raise click.ClickException(
+                f"Please provide agent IDs to select logs; Available agents: {parser.agents}"
+            )
 
-    parser.create_tables(reset=reset_db)
-    selection = (
+        parser.create_tables(reset=reset_db, max_workers=max_workers)
+        if parser.ingested_rows > 0:
+            click.echo(
+                f"Ingested {parser.ingested_rows} rows in {parser.ingest_time:.2f}s "
+                f"({parser.ingest_rate:.0f} rows/s)",
+                err=True,
+            )
         parser.select(
             agents=agents,
             start_time=start_time,
@@ -289,15 +318,29 @@ def _parse_logs(  # pylint: disable=too-many-arguments
             period=period,
             round_name=round_name,
             behaviour_name=behaviour_name,
-        )
-        .re_include(regexes=include_regexes)
-        .re_exclude(regexes=exclude_regexes)
-    )
+        ).re_include(regexes=include_regexes).re_exclude(regexes=exclude_regexes)
+
+        if output == FSM_OUTPUT:
+            return parser.execution_path()
+
+        if output == TIMELINE_OUTPUT:
+            return _print_timeline(parser, top=top)
 
-    if fsm_path:
-        return selection.execution_path()
+        return parser.table()
+    finally:
+        parser.close()
+
+
+def _print_timeline(parser: ParseLogs, top: int) -> None:
+    """Print the timeline statistics, only the filters which apply to a span are supported."""
+
+    unsupported = parser.non_span_filters
+    if len(unsupported) > 0:
+        raise click.ClickException(
+            f"{', '.join(unsupported)} cannot be used with --timeline"
+        )
 
-    return selection.table()
+    parser.timeline(top=top)
 
 
 @analyse_group.command(name="handlers")
@@ -27,7 +27,11 @@ from warnings import warn
 import click
 from aea.cli.ipfs_hash import hash_file, to_v0_string, to_v1_string
 
-from autonomy.cli.helpers.ipfs_hash import load_configuration, update_hashes
+from autonomy.cli.helpers.ipfs_hash import (
+    HASH_CACHE_FILE,
+    load_configuration,
+    update_hashes,
+)
 
 
 @click.group(name="hash")
@@ -43,10 +47,23 @@ def hash_group() -> None:
 )
 @click.option("--vendor", type=str)
 @click.option("--no-wrap", is_flag=True)
+@click.option(
+    "--max-workers",
+    type=int,
+    default=None,
+    help="Number of processes to hash the packages with, defaults to the number of CPUs.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Hash all the packages, even the ones which have not changed since the last run.",
+)
 def generate_all(
     packages_dir: Path,
     vendor: Optional[str],
     no_wrap: bool,
+    max_workers: Optional[int],
+    no_cache: bool,
 ) -> None:
     """Generate IPFS hashes."""
     message = (
@@ -61,7 +78,12 @@ def generate_all(
     click.echo(message=message)
     packages_dir = Path(packages_dir).absolute()
     return_code = update_hashes(
-        packages_dir, no_wrap, vendor=vendor, config_loader=load_configuration
+        packages_dir,
+        no_wrap,
+        vendor=vendor,
+        config_loader=load_configuration,
+        max_workers=max_workers,
+        cache_file=None if no_cache else packages_dir / HASH_CACHE_FILE,
     )
     sys.exit(return_code)
 
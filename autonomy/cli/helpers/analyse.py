@@ -19,11 +19,11 @@
 
 """Helpers for analyse command"""
 
-import re
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, cast
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, cast
 
 import click
 from aea.components.base import load_aea_package
@@ -53,6 +53,7 @@ from autonomy.analyse.logs.base import (
 )
 from autonomy.analyse.logs.collection import FromDirectory, LogCollection
 from autonomy.analyse.logs.db import AgentLogsDB
+from autonomy.analyse.logs.timeline import AgentsTimeline, DEFAULT_TOP, LatencyStats
 from autonomy.analyse.service import ServiceAnalyser, ServiceValidationFailed
 from autonomy.chain.config import ChainType, ContractConfigs
 from autonomy.chain.exceptions import FailedToRetrieveComponentMetadata
@@ -116,11 +117,17 @@ class ParseLogs:
     _collection: LogCollection
     _db_path: Path
 
-    results: Dict[str, List[LogRow]]
+    _agents: List[str]
+    _filters: Dict[str, Any]
 
     def __init__(self) -> None:
         """Initialize object."""
 
+        self.ingested_rows = 0
+        self.ingest_time = 0.0
+        self._agents = []
+        self._filters = {"include_regexes": [], "exclude_regexes": []}
+
     @property
     def agents(self) -> List[str]:
         """Available agents."""
@@ -145,22 +152,35 @@ class ParseLogs:
 
         return self
 
-    def create_tables(self, reset: bool = False) -> "ParseLogs":
+    def create_tables(
+        self, reset: bool = False, max_workers: Optional[int] = None
+    ) -> "ParseLogs":
         """Create required tables."""
 
-        for agent, db in self._dbs.items():
-            db_exists = db.exists()
-            if db_exists and not reset:
-                continue
-
-            self._collection.create_agent_db(
-                agent=agent,
-                db=db,
-                reset=reset,
-            )
+        start = time.perf_counter()
+        self.ingested_rows = self._collection.create_agent_dbs(
+            dbs=self._dbs,
+            reset=reset,
+            max_workers=max_workers,
+        )
+        self.ingest_time = time.perf_counter() - start
 
         return self
 
+    @property
+    def ingest_rate(self) -> float:
+        """Ingested rows per second."""
+
+        if self.ingest_time == 0.0:
+            return 0.0
+        return self.ingested_rows / self.ingest_time
+
+    def close(self) -> None:
+        """Close the database connections."""
+
+        for db in self._dbs.values():
+            db.close()
+
     def select(  # pylint: disable=too-many-arguments
         self,
         agents: List[str],
@@ -171,52 +191,56 @@ class ParseLogs:
         round_name: Optional[str],
         behaviour_name: Optional[str],
     ) -> "ParseLogs":
-        """Query and return results."""
-
-        results = {}
-        for agent in agents:
-            results[agent] = self._dbs[agent].select(
-                start_time=start_time,
-                end_time=end_time,
-                log_level=log_level,
-                period=period,
-                round_name=round_name,
-                behaviour_name=behaviour_name,
-            )
-
-        self.results = results
+        """
+        Set the query filters.
+
+        The query is only executed when the results are consumed, so the
+        regex filters set with `re_include` and `re_exclude` are evaluated
+        by SQLite and the rows are streamed instead of being loaded in memory.
+
+        :param agents: agents to select the logs of
+        :param start_time: only select the rows after this time
+        :param end_time: only select the rows before this time
+        :param log_level: only select the rows with this log level
+        :param period: only select the rows of this period
+        :param round_name: only select the rows of this round
+        :param behaviour_name: only select the rows of this behaviour
+        :return: the log parser
+        """
+
+        self._agents = agents
+        self._filters.update(
+            {
+                "start_time": start_time,
+                "end_time": end_time,
+                "log_level": log_level,
+                "period": period,
+                "round_name": round_name,
+                "behaviour_name": behaviour_name,
+            }
+        )
         return self
 
     def re_include(self, regexes: List[str]) -> "ParseLogs":
-        """Apply a set of regexes on the result."""
-        if len(regexes) == 0:
-            return self
-
-        compiled_re = [re.compile(pattern) for pattern in regexes]
-
-        def _apply_filter(row: LogRow) -> bool:
-            return any(map(lambda _re: _re.match(row[2]) is not None, compiled_re))
-
-        for agent, logs in self.results.items():
-            self.results[agent] = list(filter(_apply_filter, logs))
+        """Only keep the rows matching any of the regexes."""
 
+        self._filters["include_regexes"].extend(regexes)
         return self
 
     def re_exclude(self, regexes: List[str]) -> "ParseLogs":
-        """Apply a set of regexes on the result."""
-
-        if len(regexes) == 0:
-            return self
+        """Drop the rows matching all of the regexes."""
 
-        compiled_re = [re.compile(pattern) for pattern in regexes]
-
-        def _apply_filter(row: LogRow) -> bool:
-            return any(map(lambda _re: _re.match(row[2]) is None, compiled_re))
+        self._filters["exclude_regexes"].extend(regexes)
+        return self
 
-        for agent, logs in self.results.items():
-            self.results[agent] = list(filter(_apply_filter, logs))
+    @property
+    def results(self) -> Dict[str, Iterator[LogRow]]:
+        """Query results, streamed from the database."""
 
-        return self
+        return {
+            agent: self._dbs[agent].iter_select(**self._filters)
+            for agent in self._agents
+        }
 
     def execution_path(self) -> None:
         """Output FSM path"""
@@ -246,6 +270,86 @@ class ParseLogs:
                 click.echo(f"[{timestamp}][{log_level}] {message}")
             click.echo("--- End ---")
 
+    @property
+    def non_span_filters(self) -> List[str]:
+        """Options of the filters which select log lines instead of spans."""
+
+        return [
+            option
+            for option, is_set in (
+                ("--log-level", self._filters.get("log_level") is not None),
+                ("--behaviour", self._filters.get("behaviour_name") is not None),
+                ("--include-regex", len(self._filters["include_regexes"]) > 0),
+                ("--exclude-regex", len(self._filters["exclude_regexes"]) > 0),
+            )
+            if is_set
+        ]
+
+    def timeline(self, top: int = DEFAULT_TOP) -> None:
+        """
+        Print the round latency statistics and the skew between the agents.
+
+        The statistics are computed over the round and behaviour spans, so
+        only the filters which apply to a span are supported.
+
+        :param top: number of entries to show in each section
+        """
+
+        timeline = AgentsTimeline(agents=self._agents, file=self._db_path).create(
+            start_time=self._filters.get("start_time"),
+            end_time=self._filters.get("end_time"),
+            period=self._filters.get("period"),
+            round_name=self._filters.get("round_name"),
+        )
+        try:
+            _echo_latencies(
+                title="Round latencies", stats=timeline.round_latencies(top)
+            )
+            _echo_latencies(
+                title="Behaviour latencies", stats=timeline.behaviour_latencies(top)
+            )
+
+            click.echo("--- Slowest rounds ---")
+            for agent, period, round_name, latency in timeline.slowest_rounds(top):
+                click.echo(f"{latency:.3f}s | {agent} | period {period} | {round_name}")
+
+            click.echo("--- Round skew between agents ---")
+            for (
+                period,
+                round_name,
+                n_agents,
+                enter_skew,
+                exit_skew,
+            ) in timeline.round_skews(top):
+                exit_skew_str = "-" if exit_skew is None else f"{exit_skew:.3f}s"
+                click.echo(
+                    f"period {period} | {round_name} | {n_agents} agents | "
+                    f"enter skew {enter_skew:.3f}s | exit skew {exit_skew_str}"
+                )
+
+            click.echo("--- Agent lag ---")
+            for agent, n_rounds, mean_lag, max_lag in timeline.agent_lags():
+                click.echo(
+                    f"{agent} | {n_rounds} rounds | "
+                    f"mean {mean_lag:.3f}s | max {max_lag:.3f}s"
+                )
+            click.echo("--- End ---")
+        finally:
+            timeline.close()
+
+
+def _echo_latencies(title: str, stats: List[LatencyStats]) -> None:
+    """Print a latency distribution table."""
+
+    click.echo(f"--- {title} ---")
+    click.echo("name | count | mean | p50 | p95 | p99 | max")
+    for name, count, *latencies in stats:
+        click.echo(
+            " | ".join(
+                [name, str(count), *(f"{latency:.3f}s" for latency in latencies)]
+            )
+        )
+
 
 def _get_content_from_ipfs(package_id: PackageId, file: str) -> bytes:
     """Read content from the IPFS registry."""
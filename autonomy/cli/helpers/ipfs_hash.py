@@ -19,9 +19,13 @@
 
 """IPFS hash helpers."""
 
+import hashlib
+import json
+import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import click
 from aea.cli.ipfs_hash import (
@@ -60,19 +64,238 @@ def load_configuration(
     return cast(PackageConfiguration, configuration_obj)
 
 
+HASH_CACHE_FILE = ".hash_cache.json"
+_IGNORED_DIRECTORIES = ("__pycache__",)
+
+PackageCacheEntry = Dict[str, Any]
+
+
+def _file_digest(file: Path) -> str:
+    """Get the sha256 digest of a file."""
+    return hashlib.sha256(file.read_bytes()).hexdigest()
+
+
+def _package_files(package_path: Path) -> Dict[str, Tuple[int, int]]:
+    """Get the modification time and size of the files of a package."""
+    files = {}
+    for file in sorted(package_path.rglob("*")):
+        if not file.is_file() or any(
+            part in _IGNORED_DIRECTORIES
+            for part in file.relative_to(package_path).parts
+        ):
+            continue
+        stat = file.stat()
+        files[file.relative_to(package_path).as_posix()] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+    return files
+
+
+def _is_unchanged(
+    package_path: Path,
+    cached: PackageCacheEntry,
+    dependency_hashes: Dict[str, str],
+    no_wrap: bool,
+) -> bool:
+    """
+    Check whether a package has not changed since it was hashed.
+
+    A file is unchanged if its modification time and size are the same,
+    or, if they are not, if its digest is the same, e.g. after a fresh checkout.
+
+    :param package_path: the path to the package root.
+    :param cached: the cache entry of the package.
+    :param dependency_hashes: the current hashes of the packages, by package id.
+    :param no_wrap: whether the wrapper node is used or not.
+    :return: whether the package is unchanged.
+    """
+    if cached.get("no_wrap") != no_wrap:
+        return False
+
+    if any(
+        dependency_hashes.get(dependency) != package_hash
+        for dependency, package_hash in cached["dependencies"].items()
+    ):
+        return False
+
+    files = _package_files(package_path)
+    if files.keys() != cached["files"].keys():
+        return False
+
+    for file, (mtime, size) in files.items():
+        cached_mtime, cached_size, cached_digest = cached["files"][file]
+        if (mtime, size) == (cached_mtime, cached_size):
+            continue
+        if size != cached_size or _file_digest(package_path / file) != cached_digest:
+            return False
+
+    return True
+
+
+def _update_dependencies(
+    package_id: PackageId, config_file: Path, public_id_to_hash_mappings: Dict
+) -> List[PackageId]:
+    """
+    Update the hashes of the dependencies in the configuration file of a package.
+
+    :param package_id: the package id.
+    :param config_file: the path to the configuration file of the package.
+    :param public_id_to_hash_mappings: the hashes of the packages of the previous dependency levels.
+    :return: the dependencies of the package.
+    """
+    item_config, extra_config = load_yaml(config_file)
+    if package_id.package_type == PackageType.SERVICE:
+        agent_id = PackageId(PackageType.AGENT, PublicId.from_str(item_config["agent"]))
+        item_config["agent"] = str(
+            PublicId(
+                author=agent_id.author,
+                name=agent_id.name,
+                version=agent_id.version,
+                package_hash=public_id_to_hash_mappings[agent_id],
+            )
+        )
+        dependencies = [agent_id.without_hash()]
+    else:
+        extend_public_ids(item_config, public_id_to_hash_mappings)
+        dependencies = list(DependencyTree.get_all_dependencies(item_config))
+
+    dump_yaml(config_file, item_config, extra_config)
+    return dependencies
+
+
+def _make_cache_entry(  # pylint: disable=too-many-arguments
+    package_path: Path,
+    key: str,
+    package_hash: str,
+    no_wrap: bool,
+    dependencies: List[PackageId],
+    dependency_hashes: Dict[str, str],
+) -> PackageCacheEntry:
+    """
+    Make the cache entry of a package which has just been hashed.
+
+    :param package_path: the path to the package root.
+    :param key: the identifier of the hash.
+    :param package_hash: the hash of the package.
+    :param no_wrap: whether the wrapper node is used or not.
+    :param dependencies: the dependencies of the package.
+    :param dependency_hashes: the current hashes of the packages, by package id.
+    :return: the cache entry.
+    """
+    return {
+        "key": key,
+        "hash": package_hash,
+        "no_wrap": no_wrap,
+        "dependencies": {
+            str(dependency): dependency_hashes[str(dependency)]
+            for dependency in dependencies
+            if str(dependency) in dependency_hashes
+        },
+        "files": {
+            file: (mtime, size, _file_digest(package_path / file))
+            for file, (mtime, size) in _package_files(package_path).items()
+        },
+    }
+
+
+def _process_package(  # pylint: disable=too-many-arguments
+    package_id: PackageId,
+    package_path: Path,
+    public_id_to_hash_mappings: Dict,
+    no_wrap: bool,
+    config_loader: Callable[[PackageType, Path], PackageConfiguration],
+    cached: Optional[PackageCacheEntry],
+) -> Tuple[str, str, PackageCacheEntry]:
+    """
+    Update the dependencies and the fingerprint of a package, and hash it.
+
+    :param package_id: the package id.
+    :param package_path: the path to the package root.
+    :param public_id_to_hash_mappings: the hashes of the packages of the previous dependency levels.
+    :param no_wrap: whether to use the wrapper node or not.
+    :param config_loader: the configuration loader.
+    :param cached: the cache entry of the package, if any.
+    :return: the identifier of the hash, the hash of the package and its new cache entry.
+    """
+    dependency_hashes = {
+        str(dependency): package_hash
+        for dependency, package_hash in public_id_to_hash_mappings.items()
+    }
+    if cached is not None and _is_unchanged(
+        package_path, cached, dependency_hashes, no_wrap
+    ):
+        return cached["key"], cached["hash"], cached
+
+    click.echo(
+        "Processing package {} of type {}".format(
+            package_path.name, package_id.package_type
+        )
+    )
+
+    config_file = package_path / cast(
+        str, PACKAGE_TYPE_TO_CONFIG_FILE.get(package_id.package_type.value)
+    )
+    dependencies = _update_dependencies(
+        package_id, config_file, public_id_to_hash_mappings
+    )
+    configuration_obj = config_loader(package_id.package_type.value, package_path)
+    sort_configuration_file(configuration_obj)
+    update_fingerprint(configuration_obj)
+    key, package_hash = hash_package(
+        configuration_obj, package_id.package_type, no_wrap=no_wrap
+    )
+
+    cache_entry = _make_cache_entry(
+        package_path, key, package_hash, no_wrap, dependencies, dependency_hashes
+    )
+    return key, package_hash, cache_entry
+
+
+def _load_hash_cache(cache_file: Optional[Path]) -> Dict[str, PackageCacheEntry]:
+    """Load the hash cache, an invalid or missing cache is treated as empty."""
+    if cache_file is None or not cache_file.is_file():
+        return {}
+    try:
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
 # TODO: extract into utils
 # Add input validations
-def update_hashes(  # pylint: disable=too-many-locals
+def update_hashes(  # pylint: disable=too-many-locals,too-many-arguments
     packages_dir: Path,
     no_wrap: bool = False,
     vendor: Optional[str] = None,
     config_loader: Callable[
         [PackageType, Path], PackageConfiguration
     ] = load_configuration,
+    max_workers: Optional[int] = 1,
+    cache_file: Optional[Path] = None,
 ) -> int:
-    """Process all AEA packages, update fingerprint, and update packages.json file."""
+    """
+    Process all AEA packages, update fingerprint, and update packages.json file.
+
+    The packages of a dependency level do not depend on each other, so they are processed in parallel
+    across `max_workers` processes, or sequentially in this process if `max_workers` is 1.
+    If a `cache_file` is given, the packages which have not changed since they were last hashed,
+    and whose dependencies' hashes have not changed either, are not processed again.
+
+    :param packages_dir: the packages directory.
+    :param no_wrap: whether to use the wrapper node or not.
+    :param vendor: if given, only the packages of this author are hashed.
+    :param config_loader: the configuration loader, it needs to be picklable to use more than one worker.
+    :param max_workers: the number of processes to use, the number of CPUs if `None`.
+    :param cache_file: the file to persist the hashes of the packages in.
+    :return: the return code.
+    """
     return_code = 0
     package_hashes: Dict[str, str] = {}
+    cache = _load_hash_cache(cache_file)
+    executor = (
+        ProcessPoolExecutor(max_workers=max_workers) if max_workers != 1 else None
+    )
 
     try:
         public_id_to_hash_mappings: Dict = {}
@@ -82,52 +305,70 @@ def update_hashes(  # pylint: disable=too-many-locals
             for tree_level in dependency_tree
         ]
         packages[0] = packages[0] + list(map(to_package_id, SCAFFOLD_PACKAGES))
-        for tree_level in packages:
-            for package_id, package_path in tree_level:
-                click.echo(
-                    "Processing package {} of type {}".format(
-                        package_path.name, package_id.package_type
-                    )
+        # the dependency tree does not account for the agents of the services,
+        # so the services of a level are processed after the rest of the level
+        packages = [
+            sub_level
+            for tree_level in packages
+            for sub_level in (
+                [
+                    package
+                    for package in tree_level
+                    if package[0].package_type != PackageType.SERVICE
+                ],
+                [
+                    package
+                    for package in tree_level
+                    if package[0].package_type == PackageType.SERVICE
+                ],
+            )
+            if sub_level
+        ]
+        for level, tree_level in enumerate(packages):
+            start = time.perf_counter()
+            arguments = [
+                (
+                    package_id,
+                    package_path,
+                    public_id_to_hash_mappings,
+                    no_wrap,
+                    config_loader,
+                    cache.get(str(package_id)),
                 )
+                for package_id, package_path in tree_level
+            ]
+            if executor is None:
+                results = [_process_package(*args) for args in arguments]
+            else:
+                futures = [
+                    executor.submit(_process_package, *args) for args in arguments
+                ]
+                results = [future.result() for future in futures]
 
-                config_file = package_path / cast(
-                    str, PACKAGE_TYPE_TO_CONFIG_FILE.get(package_id.package_type.value)
-                )
-                item_config, extra_config = load_yaml(config_file)
-                if package_id.package_type == PackageType.SERVICE:
-                    agent_id = PackageId(
-                        PackageType.AGENT, PublicId.from_str(item_config["agent"])
-                    )
-                    item_config["agent"] = str(
-                        PublicId(
-                            author=agent_id.author,
-                            name=agent_id.name,
-                            version=agent_id.version,
-                            package_hash=public_id_to_hash_mappings[agent_id],
-                        )
-                    )
-                else:
-                    extend_public_ids(item_config, public_id_to_hash_mappings)
-
-                dump_yaml(config_file, item_config, extra_config)
-
-                configuration_obj = config_loader(
-                    package_id.package_type.value, package_path
-                )
-                sort_configuration_file(configuration_obj)
-                update_fingerprint(configuration_obj)
-                key, package_hash = hash_package(
-                    configuration_obj, package_id.package_type, no_wrap=no_wrap
-                )
+            for (package_id, _), (key, package_hash, cache_entry) in zip(
+                tree_level, results
+            ):
                 public_id_to_hash_mappings[package_id] = package_hash
+                cache[str(package_id)] = cache_entry
 
                 if vendor is not None and package_id.author != vendor:
                     continue  # pragma: nocover
                 package_hashes[key] = package_hash
+
+            click.echo(
+                f"Processed dependency level {level} ({len(tree_level)} packages) "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+
+        if cache_file is not None:
+            cache_file.write_text(json.dumps(cache, indent=2), encoding="utf-8")
         click.echo("Done!")
 
     except Exception:  # pylint: disable=broad-except  # pragma: nocover
         traceback.print_exc()
         return_code = 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     return return_code
@@ -22,11 +22,11 @@ import json
 import logging
 import os
 import platform
+import secrets
 import signal
 import subprocess  # nosec
 import sys
 from asyncio import AbstractEventLoop, AbstractServer, CancelledError, Task
-from io import BytesIO
 from logging import Logger
 from pathlib import Path
 from threading import Event, Thread
@@ -85,6 +85,7 @@ from packages.valory.connections.abci.tendermint_encoder import (
     _TendermintProtocolEncoder,
 )
 from packages.valory.protocols.abci import AbciMessage
+from packages.valory.protocols.abci.custom_types import CheckTxType, CheckTxTypeEnum
 
 
 PUBLIC_ID = PublicId.from_str("valory/abci:0.1.0")
@@ -101,7 +102,10 @@ DEFAULT_P2P_LISTEN_ADDRESS = f"{_TCP}{DEFAULT_LISTEN_ADDRESS}:{DEFAULT_P2P_PORT}
 DEFAULT_RPC_LISTEN_ADDRESS = f"{_TCP}{LOCALHOST}:{DEFAULT_RPC_PORT}"
 MAX_READ_IN_BYTES = 2**20  # Max we'll consume on a read stream (1 MiB)
 MAX_VARINT_BYTES = 10  # Max size of varint we support
+DEFAULT_READ_CHUNK_SIZE = 2**16  # Max we'll read from a stream at once (64 KiB)
+VARINT_TABLE_SIZE = 2**12  # Number of varint codings which are precomputed
 DEFAULT_TENDERMINT_LOG_FILE = "tendermint.log"
+DIALOGUE_LESS_REQUESTS = ("check_tx", "deliver_tx")
 
 
 class DecodeVarintError(Exception):
@@ -157,17 +161,24 @@ class _TendermintABCISerializer:
             log_msg = "Expecting uint64 from Protobuf"
             raise EncodeVarintError(f"{log_msg}: {number}")
 
+        if number < VARINT_TABLE_SIZE:
+            return _VARINT_TABLE[number]
+        return cls._encode_varint(number)
+
+    @staticmethod
+    def _encode_varint(number: int) -> bytes:
+        """Encode a valid uint64 number in varint coding, without using the precomputed table."""
         number <<= 1  # Shift to int64
-        buf = b""
+        buf = bytearray()
         while True:
             towrite = number & 0x7F
             number >>= 7
             if number:
-                buf += bytes((towrite | 0x80,))
+                buf.append(towrite | 0x80)
             else:
-                buf += bytes((towrite,))
+                buf.append(towrite)
                 break
-        return buf
+        return bytes(buf)
 
     @classmethod
     async def decode_varint(
@@ -204,6 +215,35 @@ class _TendermintABCISerializer:
             raise DecodeVarintError("could not decode varint")
         return result >> 1
 
+    @classmethod
+    def decode_varint_from_buffer(
+        cls,
+        buffer: Union[bytes, bytearray, memoryview],
+        max_length: int = MAX_VARINT_BYTES,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Decode a number from its varint coding at the beginning of a buffer, without consuming it.
+
+        :param buffer: the buffer to read from.
+        :param max_length: the max number of bytes that can be read.
+        :return: the decoded int and the number of bytes of its varint coding,
+            or None if the buffer does not contain a complete varint yet.
+
+        :raise: DecodeVarintError if the varint could not be decoded.
+        """
+        enforce(max_length >= 1, "max bytes must be at least one")
+        shift = 0
+        result = 0
+        for nb_read_bytes in range(min(len(buffer), max_length)):
+            byte = buffer[nb_read_bytes]
+            result |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return result >> 1, nb_read_bytes + 1
+        if len(buffer) >= max_length:
+            raise DecodeVarintError("could not decode varint")
+        return None
+
     @classmethod
     async def _read_one(cls, buffer: asyncio.StreamReader) -> Optional[int]:
         """
@@ -220,24 +260,79 @@ class _TendermintABCISerializer:
     @classmethod
     def write_message(cls, message: Response) -> bytes:
         """Write a message in a buffer."""
-        buffer = BytesIO(b"")
         protobuf_bytes = message.SerializeToString()
-        encoded = cls.encode_varint(len(protobuf_bytes))
-        buffer.write(encoded)
-        buffer.write(protobuf_bytes)
-        return buffer.getvalue()
+        return cls.encode_varint(len(protobuf_bytes)) + protobuf_bytes
+
+    @classmethod
+    def write_message_into(cls, message: Response, buffer: bytearray) -> None:
+        """Append a message, prefixed by its varint-coded length, to a buffer."""
+        protobuf_bytes = message.SerializeToString()
+        buffer += cls.encode_varint(len(protobuf_bytes))
+        buffer += protobuf_bytes
 
 
-class VarintMessageReader:  # pylint: disable=too-few-public-methods
-    """Varint message reader."""
+_VARINT_TABLE: Tuple[bytes, ...] = tuple(
+    _TendermintABCISerializer._encode_varint(number)  # pylint: disable=protected-access
+    for number in range(VARINT_TABLE_SIZE)
+)
+
 
-    def __init__(self, reader: asyncio.StreamReader) -> None:
+class VarintMessageReader:
+    """
+    Varint message reader.
+
+    The reader keeps an internal buffer, which is filled with chunks of up to `read_chunk_size` bytes from the stream.
+    The varint prefixes and the messages are parsed out of this buffer, so decoding a varint does not cost a read per byte,
+    and several pipelined messages which arrive with a single read are decoded without awaiting the stream again.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+    ) -> None:
         """Initialize the reader."""
+        enforce(read_chunk_size >= 1, "read chunk size must be at least one")
         self._reader = reader
+        self._read_chunk_size = read_chunk_size
+        self._buffer = bytearray()
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Get the number of bytes which have been read from the stream but have not been consumed yet."""
+        return len(self._buffer)
+
+    async def _fill_buffer(self) -> bool:
+        """Read a chunk from the stream into the buffer, and return whether the stream has not reached EOF."""
+        data = await self._reader.read(self._read_chunk_size)
+        self._buffer += data
+        return len(data) > 0
+
+    async def _read_varint(self) -> int:
+        """Read the next varint from the buffer, filling it from the stream if necessary."""
+        while True:
+            try:
+                decoded = _TendermintABCISerializer.decode_varint_from_buffer(
+                    self._buffer
+                )
+            except DecodeVarintError:
+                # the stream cannot be resynchronized, discard the buffered bytes
+                self._buffer.clear()
+                raise
+            if decoded is not None:
+                varint, nb_read_bytes = decoded
+                del self._buffer[:nb_read_bytes]
+                return varint
+            if not await self._fill_buffer():
+                # EOF is reached
+                if len(self._buffer) == 0:
+                    raise EOFError()
+                self._buffer.clear()
+                raise DecodeVarintError("could not decode varint")
 
     async def read_next_message(self) -> bytes:
         """Read next message."""
-        varint = await _TendermintABCISerializer.decode_varint(self._reader)
+        varint = await self._read_varint()
         if varint > MAX_READ_IN_BYTES:
             raise TooLargeVarint(received_size=varint, max_size=MAX_READ_IN_BYTES)
         message_bytes = await self.read_until(varint)
@@ -246,14 +341,13 @@ class VarintMessageReader:  # pylint: disable=too-few-public-methods
         return message_bytes
 
     async def read_until(self, n: int) -> bytes:
-        """Wait until n bytes are read from the stream."""
-        result = BytesIO(b"")
-        read_bytes = 0
-        while read_bytes < n:
-            data = await self._reader.read(n - read_bytes)
-            result.write(data)
-            read_bytes += len(data)
-        return result.getvalue()
+        """Wait until n bytes are read from the stream, or EOF is reached, and consume them from the buffer."""
+        while len(self._buffer) < n:
+            if not await self._fill_buffer():
+                break
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
 
 
 class ABCIApplicationServicer(types_pb2_grpc.ABCIApplicationServicer):
@@ -863,25 +957,35 @@ class GrpcServerChannel:  # pylint: disable=too-many-instance-attributes
 class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
     """TCP server channel to handle incoming communication from the Tendermint node."""
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         target_skill_id: PublicId,
         address: str,
         port: int,
         logger: Optional[Logger] = None,
+        drain_writes: bool = False,
+        use_dialogue_less_routing: bool = False,
     ):
         """
         Initialize the TCP server.
 
+        Responses which are sent to the same peer during the same event loop iteration
+        are coalesced, and written to the socket at once.
+
         :param target_skill_id: the public id of the target skill.
         :param address: the listen address.
         :param port: the port to listen from.
         :param logger: the logger.
+        :param drain_writes: whether sending a response waits for the write buffer of the socket to be drained.
+        :param use_dialogue_less_routing: whether the transaction requests are routed to the skill
+            without keeping their dialogues in the connection. They are still delivered in envelopes.
         """
         self.target_skill_id = target_skill_id
         self.address = address
         self.port = port
         self.logger = logger or logging.getLogger()
+        self.drain_writes = drain_writes
+        self.use_dialogue_less_routing = use_dialogue_less_routing
 
         # channel state
         self._loop: Optional[AbstractEventLoop] = None
@@ -900,6 +1004,11 @@ class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
         # this dictionary associates requests to socket name
         # such that responses are sent to the right receiver
         self._request_id_to_socket: Dict[DialogueLabel, str] = {}
+        # responses waiting to be written, and the tasks which will write them, by socket name
+        self._pending_writes: Dict[str, bytearray] = {}
+        self._flush_tasks: Dict[str, Task] = {}
+        # the socket names of the transaction requests routed without dialogues, by dialogue nonce
+        self._dialogue_less_requests: Dict[str, str] = {}
 
     @property
     def is_stopped(self) -> bool:
@@ -932,10 +1041,16 @@ class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
         self._server.close()
         await self._server.wait_closed()
 
+        for flush_task in self._flush_tasks.values():
+            flush_task.cancel()
+
         self.queue = None
         self._server = None
         self._streams_by_socket = {}
         self._request_id_to_socket = {}
+        self._pending_writes = {}
+        self._flush_tasks = {}
+        self._dialogue_less_requests = {}
 
     async def receive_messages(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
@@ -996,6 +1111,9 @@ class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
         """Handle a single message from a peer."""
         try:
             req_type = message.WhichOneof("value")
+            if self.use_dialogue_less_routing and req_type in DIALOGUE_LESS_REQUESTS:
+                await self._route_without_dialogue(req_type, message, peer_name)
+                return
             result = _TendermintProtocolDecoder.process(
                 message, self._dialogues, str(self.target_skill_id)
             )
@@ -1014,6 +1132,41 @@ class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
         except Exception as e:  # pylint: disable=broad-except  # pragma: no cover
             self.logger.error(f"Unhandled exception {type(e).__name__}: {e}")
 
+    async def _route_without_dialogue(
+        self, req_type: str, message: Request, peer_name: str
+    ) -> None:
+        """
+        Route a transaction request to the skill without keeping its dialogue in the connection.
+
+        The request is the first message of a new dialogue, so the skill handles it as any other request.
+        Its response is matched to the peer by the nonce of the dialogue, instead of updating the connection's dialogues.
+        The request is still delivered to the skill in an envelope through the multiplexer,
+        this only saves the bookkeeping of the connection's dialogues.
+
+        :param req_type: the type of the request, i.e., `check_tx` or `deliver_tx`.
+        :param message: the request.
+        :param peer_name: the name of the peer which sent the request.
+        """
+        nonce = secrets.token_hex(DialogueLabel.NONCE_BYTES_NB)
+        if req_type == "check_tx":
+            request = AbciMessage(
+                performative=AbciMessage.Performative.REQUEST_CHECK_TX,
+                dialogue_reference=(nonce, ""),
+                tx=message.check_tx.tx,
+                type=CheckTxType(CheckTxTypeEnum(message.check_tx.type)),
+            )
+        else:
+            request = AbciMessage(
+                performative=AbciMessage.Performative.REQUEST_DELIVER_TX,
+                dialogue_reference=(nonce, ""),
+                tx=message.deliver_tx.tx,
+            )
+        request.sender = self._dialogues.self_address
+        request.to = str(self.target_skill_id)
+        self._dialogue_less_requests[nonce] = peer_name
+        envelope = Envelope(to=request.to, sender=request.sender, message=request)
+        await cast(asyncio.Queue, self.queue).put(envelope)
+
     async def get_message(self) -> Envelope:
         """Get a message from the queue."""
         return await cast(asyncio.Queue, self.queue).get()
@@ -1022,18 +1175,58 @@ class TcpServerChannel:  # pylint: disable=too-many-instance-attributes
         """Send a message."""
         self.logger = cast(Logger, self.logger)
         message = cast(AbciMessage, envelope.message)
-        dialogue = self._dialogues.update(message)
-        if dialogue is None:  # pragma: nocover
-            self.logger.warning(f"Could not create dialogue for message={message}")
+        peer_name = self._dialogue_less_requests.pop(
+            message.dialogue_reference[0], None
+        )
+        if peer_name is None:
+            dialogue = self._dialogues.update(message)
+            if dialogue is None:  # pragma: nocover
+                self.logger.warning(f"Could not create dialogue for message={message}")
+                return
+
+            # we only deal with atomic request-response cycles, so it is safe to remove the reference
+            peer_name = self._request_id_to_socket.pop(
+                dialogue.incomplete_dialogue_label
+            )
+        protobuf_message = _TendermintProtocolEncoder.process(message)
+        await self._write(peer_name, protobuf_message)
+
+    async def _write(self, peer_name: str, protobuf_message: Response) -> None:
+        """Write a response to a peer, coalescing the responses sent during the same event loop iteration."""
+        pending = self._pending_writes.setdefault(peer_name, bytearray())
+        _TendermintABCISerializer.write_message_into(protobuf_message, pending)
+
+        flush_task = self._flush_tasks.get(peer_name)
+        if flush_task is None:
+            flush_task = asyncio.ensure_future(self._flush(peer_name))
+            flush_task.add_done_callback(self._log_flush_error)
+            self._flush_tasks[peer_name] = flush_task
+        if self.drain_writes:
+            await asyncio.shield(flush_task)
+
+    def _log_flush_error(self, flush_task: Task) -> None:
+        """Log the error of a flush task, which is not awaited by the senders unless the writes are drained."""
+        if flush_task.cancelled():
             return
+        exception = flush_task.exception()
+        if exception is not None:
+            self.logger.error(
+                f"An error occurred while writing the responses: {type(exception).__name__}: {exception}"
+            )
 
-        # we only deal with atomic request-response cycles, so it is safe to remove the reference
-        peer_name = self._request_id_to_socket.pop(dialogue.incomplete_dialogue_label)
+    async def _flush(self, peer_name: str) -> None:
+        """Write the responses which are pending for a peer, after letting the event loop run an iteration."""
+        # yield, so that the responses sent during this event loop iteration are written at once
+        await asyncio.sleep(0)
+        self._flush_tasks.pop(peer_name, None)
+        data = self._pending_writes.pop(peer_name, None)
+        if not data or peer_name not in self._streams_by_socket:  # pragma: nocover
+            return
         _reader, writer = self._streams_by_socket[peer_name]
-        protobuf_message = _TendermintProtocolEncoder.process(message)
-        data = _TendermintABCISerializer.write_message(protobuf_message)
         self.logger.debug(f"Writing {len(data)} bytes")
         writer.write(data)
+        if self.drain_writes:
+            await writer.drain()
 
 
 class StoppableThread(
@@ -1355,6 +1548,8 @@ class ABCIServerConnection(Connection):  # pylint: disable=too-many-instance-att
                 address=self.host,
                 port=self.port,
                 logger=self.logger,
+                drain_writes=self.drain_writes,
+                use_dialogue_less_routing=self.use_dialogue_less_routing,
             )
 
     def _process_connection_params(self) -> None:
@@ -1365,6 +1560,9 @@ class ABCIServerConnection(Connection):  # pylint: disable=too-many-instance-att
         - host
         - port
         - target_skill_id
+        - drain_writes
+        - use_dialogue_less_routing: whether the transaction requests are routed to the skill without keeping their dialogues
+          in the connection, which is only supported over TCP
         """
         self.host = cast(str, self.configuration.config.get("host"))
         self.port = cast(int, self.configuration.config.get("port"))
@@ -1380,6 +1578,12 @@ class ABCIServerConnection(Connection):  # pylint: disable=too-many-instance-att
         if target_skill_id is None:  # pragma: no cover
             raise ValueError("Provided target_skill_id is not a valid public id.")
         self.target_skill_id = target_skill_id
+        self.drain_writes = cast(
+            bool, self.configuration.config.get("drain_writes", False)
+        )
+        self.use_dialogue_less_routing = cast(
+            bool, self.configuration.config.get("use_dialogue_less_routing", False)
+        )
 
     def _process_tendermint_params(self) -> None:
         """
@@ -31,7 +31,8 @@ from cmath import inf
 from contextlib import suppress
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Callable, Generator, List, NoReturn, cast
+from types import SimpleNamespace
+from typing import Any, Callable, Generator, List, NoReturn, Tuple, cast
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -39,7 +40,7 @@ import docker
 import pytest
 import requests
 from _pytest.fixtures import SubRequest  # type: ignore
-from aea.configurations.base import ConnectionConfig
+from aea.configurations.base import ConnectionConfig, PublicId
 from aea.connections.base import ConnectionStates
 from aea.identity.base import Identity
 from aea.mail.base import Envelope
@@ -70,11 +71,24 @@ from packages.valory.connections.abci.connection import (
     DEFAULT_LISTEN_ADDRESS,
     DecodeVarintError,
     EncodeVarintError,
+    LOCALHOST,
+    PUBLIC_ID,
     ShortBufferLengthError,
+    TcpServerChannel,
     TooLargeVarint,
+    VARINT_TABLE_SIZE,
     VarintMessageReader,
     _TendermintABCISerializer,
 )
+from packages.valory.connections.abci.dialogues import AbciDialogues
+from packages.valory.connections.abci.tendermint.abci.types_pb2 import (  # type: ignore
+    Request,
+    RequestCheckTx,
+    RequestDeliverTx,
+    RequestEcho,
+    Response,
+    ResponseDeliverTx,
+)
 from packages.valory.protocols.abci import AbciMessage
 from packages.valory.protocols.abci.custom_types import (
     BlockParams,
@@ -641,21 +655,380 @@ async def test_varint_message_reader() -> None:
     stream_reader = MagicMock(read=read)
     vmr = VarintMessageReader(stream_reader)
 
-    with mock.patch.object(
-        _TendermintABCISerializer, "decode_varint", new=patch_async_methods(inf)
-    ):
+    with mock.patch.object(vmr, "_read_varint", new=patch_async_methods(inf)):
         with pytest.raises(TooLargeVarint):
             await vmr.read_next_message()
 
-    with mock.patch.object(
-        _TendermintABCISerializer, "decode_varint", new=patch_async_methods(10)
-    ):
+    with mock.patch.object(vmr, "_read_varint", new=patch_async_methods(10)):
         with mock.patch.object(vmr, "read_until", new=patch_async_methods(b"")):
             with pytest.raises(ShortBufferLengthError):
                 await vmr.read_next_message()
 
-    with mock.patch.object(
-        _TendermintABCISerializer, "decode_varint", new=patch_async_methods(5)
-    ):
+    with mock.patch.object(vmr, "_read_varint", new=patch_async_methods(5)):
         res = await vmr.read_next_message()
         assert res == b"hello"
+
+
+@settings(database=database.InMemoryExampleDatabase())
+@given(integers(min_value=0, max_value=(1 << 64) - 1))
+def test_decode_varint_from_buffer(value: int) -> None:
+    """Test that decoding a varint from a buffer matches the encoding."""
+    encoded_value = _TendermintABCISerializer.encode_varint(value)
+    decoder = _TendermintABCISerializer.decode_varint_from_buffer
+    assert decoder(encoded_value + b"trailing") == (value, len(encoded_value))
+    # an incomplete varint is not decoded
+    assert decoder(encoded_value[:-1]) is None
+
+
+def test_decode_varint_from_buffer_raises() -> None:
+    """Test that decode_varint_from_buffer raises when the varint is longer than the max length."""
+    with pytest.raises(DecodeVarintError, match="could not decode varint"):
+        _TendermintABCISerializer.decode_varint_from_buffer(b"\x80" * 10)
+
+
+@pytest.mark.parametrize("read_chunk_size", [1, 3, 2**16])
+@pytest.mark.asyncio
+async def test_varint_message_reader_pipelined(read_chunk_size: int) -> None:
+    """Test that VarintMessageReader decodes pipelined messages, independently of how they are chunked."""
+    messages = [b"", b"a", b"hello" * 30, bytes(range(256))]
+    reader = asyncio.StreamReader()
+    for message in messages:
+        reader.feed_data(_TendermintABCISerializer.encode_varint(len(message)))
+        reader.feed_data(message)
+    reader.feed_eof()
+
+    vmr = VarintMessageReader(reader, read_chunk_size=read_chunk_size)
+    for message in messages:
+        assert await vmr.read_next_message() == message
+    assert vmr.buffered_bytes == 0
+    with pytest.raises(EOFError):
+        await vmr.read_next_message()
+
+
+@pytest.mark.asyncio
+async def test_varint_message_reader_eof() -> None:
+    """Test VarintMessageReader when the EOF is reached in the middle of a frame."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"\x80")
+    reader.feed_eof()
+    vmr = VarintMessageReader(reader)
+    with pytest.raises(DecodeVarintError, match="could not decode varint"):
+        await vmr.read_next_message()
+    assert vmr.buffered_bytes == 0
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(_TendermintABCISerializer.encode_varint(10) + b"hello")
+    reader.feed_eof()
+    vmr = VarintMessageReader(reader)
+    with pytest.raises(ShortBufferLengthError):
+        await vmr.read_next_message()
+    assert vmr.buffered_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_varint_message_reader_invalid_varint() -> None:
+    """Test that VarintMessageReader discards the buffer on an invalid varint."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"\x80" * 10 + b"hello")
+    vmr = VarintMessageReader(reader)
+    with pytest.raises(DecodeVarintError, match="could not decode varint"):
+        await vmr.read_next_message()
+    assert vmr.buffered_bytes == 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_varint_message_reader_benchmark() -> None:
+    """Benchmark the buffered VarintMessageReader against decoding the varint a byte at a time."""
+    n_messages = 20_000
+    message = b"x" * 64
+    frame = _TendermintABCISerializer.encode_varint(len(message)) + message
+
+    def make_reader() -> asyncio.StreamReader:
+        reader = asyncio.StreamReader(limit=len(frame) * n_messages)
+        reader.feed_data(frame * n_messages)
+        reader.feed_eof()
+        return reader
+
+    reader = make_reader()
+    start = time.perf_counter()
+    for _ in range(n_messages):
+        size = await _TendermintABCISerializer.decode_varint(reader)
+        assert await reader.readexactly(size) == message
+    per_byte_time = time.perf_counter() - start
+
+    vmr = VarintMessageReader(make_reader())
+    start = time.perf_counter()
+    for _ in range(n_messages):
+        assert await vmr.read_next_message() == message
+    buffered_time = time.perf_counter() - start
+
+    logging.info(
+        f"Per-byte varint decoding: {n_messages / per_byte_time:.0f} requests/s, "
+        f"buffered reader: {n_messages / buffered_time:.0f} requests/s"
+    )
+
+
+@pytest.mark.parametrize(
+    "value", [0, 1, VARINT_TABLE_SIZE - 1, VARINT_TABLE_SIZE, (1 << 64) - 1]
+)
+def test_encode_varint_table(value: int) -> None:
+    """Test that the precomputed varint codings match the computed ones."""
+    assert _TendermintABCISerializer.encode_varint(
+        value
+    ) == _TendermintABCISerializer._encode_varint(value)
+
+
+class TestTcpServerChannelSend:
+    """Test the write coalescing of TcpServerChannel.send."""
+
+    peer_name = "127.0.0.1:12345"
+    n_responses = 5
+
+    def _setup_channel(self, drain_writes: bool) -> TcpServerChannel:
+        """Set up a channel with a mocked peer."""
+        channel = TcpServerChannel(
+            MagicMock(), ANY_ADDRESS, 0, drain_writes=drain_writes
+        )
+        channel._dialogues = MagicMock()
+        channel._dialogues.update.side_effect = lambda message: MagicMock(
+            incomplete_dialogue_label=message
+        )
+        self.writer = MagicMock(drain=mock.AsyncMock())
+        channel._streams_by_socket[self.peer_name] = (MagicMock(), self.writer)
+        return channel
+
+    def _send_all(self, channel: TcpServerChannel) -> List[Response]:
+        """Send a batch of responses in the same event loop iteration."""
+        responses = [
+            Response(deliver_tx=ResponseDeliverTx(code=i))
+            for i in range(self.n_responses)
+        ]
+        envelopes = []
+        for _ in responses:
+            label = MagicMock()
+            channel._request_id_to_socket[label] = self.peer_name
+            envelopes.append(MagicMock(message=label))
+        encodings = dict(zip(envelopes, responses))
+
+        async def send_all() -> None:
+            with mock.patch(
+                "packages.valory.connections.abci.connection._TendermintProtocolEncoder.process",
+                side_effect=lambda label: encodings[
+                    next(env for env in envelopes if env.message is label)
+                ],
+            ):
+                await asyncio.gather(*(channel.send(env) for env in envelopes))
+                # let the pending flush run
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+
+        asyncio.run(send_all())
+        return responses
+
+    @pytest.mark.parametrize("drain_writes", [False, True])
+    def test_send_coalesces_writes(self, drain_writes: bool) -> None:
+        """Test that the responses sent in the same event loop iteration are written at once."""
+        channel = self._setup_channel(drain_writes)
+        responses = self._send_all(channel)
+        self.writer.write.assert_called_once_with(
+            b"".join(
+                _TendermintABCISerializer.write_message(response)
+                for response in responses
+            )
+        )
+        assert self.writer.drain.await_count == int(drain_writes)
+        assert channel._pending_writes == {}
+        assert channel._flush_tasks == {}
+        assert channel._request_id_to_socket == {}
+
+    def test_flush_error_logged(self) -> None:
+        """Test that the errors raised while writing the responses, which are not awaited, are logged."""
+        channel = self._setup_channel(drain_writes=False)
+        channel.logger = MagicMock()
+        self.writer.write.side_effect = ConnectionResetError("reset")
+        self._send_all(channel)
+        channel.logger.error.assert_called_once_with(
+            "An error occurred while writing the responses: ConnectionResetError: reset"
+        )
+
+    @pytest.mark.benchmark
+    def test_write_benchmark(self) -> None:
+        """Benchmark sending the responses to a block's transactions through TcpServerChannel.send."""
+        n_responses = 10_000
+        messages = [
+            AbciMessage(
+                performative=AbciMessage.Performative.RESPONSE_DELIVER_TX,
+                dialogue_reference=("", ""),
+                code=0,
+                data=b"x" * 32,
+                log="",
+                info="",
+                gas_wanted=0,
+                gas_used=0,
+                events=Events([]),
+                codespace="",
+            )
+            for _ in range(n_responses)
+        ]
+
+        async def send_all(channel: TcpServerChannel) -> float:
+            """Send the responses one after the other, as the multiplexer does."""
+            start = time.perf_counter()
+            for message in messages:
+                await channel.send(cast(Envelope, SimpleNamespace(message=message)))
+            await asyncio.gather(*channel._flush_tasks.values())
+            return time.perf_counter() - start
+
+        rates, n_writes = {}, {}
+        for drain_writes in (False, True):
+            channel = self._setup_channel(drain_writes)
+            channel._dialogues.update.side_effect = lambda message: SimpleNamespace(
+                incomplete_dialogue_label=id(message)
+            )
+            channel._request_id_to_socket.update(
+                (id(message), self.peer_name) for message in messages
+            )
+            rates[drain_writes] = n_responses / asyncio.run(send_all(channel))
+            n_writes[drain_writes] = self.writer.write.call_count
+
+        logging.info(
+            f"Sending {n_responses} responses: {rates[False]:.0f} responses/s in {n_writes[False]} writes, "
+            f"{rates[True]:.0f} responses/s in {n_writes[True]} writes when draining them."
+        )
+
+
+class TestTcpServerChannelDialogueLessRouting:
+    """Test routing the transaction requests without dialogues in TcpServerChannel."""
+
+    target_skill_id = "dummy_author/dummy:0.1.0"
+
+    async def _serve(
+        self, requests: List[Request], use_dialogue_less_routing: bool
+    ) -> Tuple[List[Response], List[AbciMessage], TcpServerChannel]:
+        """Send the requests to a channel over TCP, serving them with a dummy app."""
+        channel = TcpServerChannel(
+            PublicId.from_str(self.target_skill_id),
+            LOCALHOST,
+            0,
+            use_dialogue_less_routing=use_dialogue_less_routing,
+        )
+        await channel.connect(asyncio.get_running_loop())
+        port = channel._server.sockets[0].getsockname()[1]  # type: ignore
+        app = ABCIAppTest(self.target_skill_id)
+        received: List[AbciMessage] = []
+
+        async def serve_requests() -> NoReturn:
+            while True:
+                envelope = await channel.get_message()
+                request = cast(AbciMessage, envelope.message)
+                received.append(request)
+                await channel.send(
+                    Envelope(
+                        to=envelope.sender,
+                        sender=envelope.to,
+                        message=app.handle(request),
+                    )
+                )
+
+        serving_task = asyncio.ensure_future(serve_requests())
+        reader, writer = await asyncio.open_connection(LOCALHOST, port)
+        writer.write(
+            b"".join(
+                _TendermintABCISerializer.write_message(request) for request in requests
+            )
+        )
+        message_reader = VarintMessageReader(reader)
+        responses = []
+        for _ in requests:
+            response = Response()
+            response.ParseFromString(await message_reader.read_next_message())
+            responses.append(response)
+
+        writer.close()
+        serving_task.cancel()
+        await channel.disconnect()
+        return responses, received, channel
+
+    @staticmethod
+    def _requests(n_txs: int) -> List[Request]:
+        """Get an echo request, followed by check_tx and deliver_tx requests."""
+        requests = [Request(echo=RequestEcho(message="echo"))]
+        requests.append(Request(check_tx=RequestCheckTx(tx=b"checked")))
+        for i in range(n_txs):
+            requests.append(Request(deliver_tx=RequestDeliverTx(tx=b"tx%d" % i)))
+        return requests
+
+    @pytest.mark.parametrize("use_dialogue_less_routing", (False, True))
+    def test_dialogue_less_routing(self, use_dialogue_less_routing: bool) -> None:
+        """Test that the transaction requests are only kept in the connection's dialogues if the dialogue-less routing is disabled."""
+        with mock.patch.object(
+            AbciDialogues, "update", autospec=True, side_effect=AbciDialogues.update
+        ) as update:
+            responses, received, channel = asyncio.run(
+                self._serve(self._requests(3), use_dialogue_less_routing)
+            )
+
+        assert [response.WhichOneof("value") for response in responses] == [
+            "echo",
+            "check_tx",
+            "deliver_tx",
+            "deliver_tx",
+            "deliver_tx",
+        ]
+        assert responses[0].echo.message == "echo"
+        assert [response.deliver_tx.code for response in responses[2:]] == [0, 0, 0]
+        assert [(request.performative, request.tx) for request in received[1:]] == [
+            (AbciMessage.Performative.REQUEST_CHECK_TX, b"checked"),
+            (AbciMessage.Performative.REQUEST_DELIVER_TX, b"tx0"),
+            (AbciMessage.Performative.REQUEST_DELIVER_TX, b"tx1"),
+            (AbciMessage.Performative.REQUEST_DELIVER_TX, b"tx2"),
+        ]
+        assert all(
+            request.sender == str(PUBLIC_ID) and request.to == self.target_skill_id
+            for request in received
+        )
+        # with the dialogue-less routing, only the response to the echo request goes through the connection's dialogues
+        assert update.call_count == (1 if use_dialogue_less_routing else len(received))
+        assert channel._dialogue_less_requests == {}
+
+    @pytest.mark.parametrize("use_dialogue_less_routing", (False, True))
+    def test_dialogue_less_routing_creates_no_dialogues(
+        self, use_dialogue_less_routing: bool
+    ) -> None:
+        """Test that the connection creates no dialogue for the transaction requests routed without dialogues."""
+        n_txs = 10
+        with mock.patch.object(
+            AbciDialogue, "__init__", autospec=True, side_effect=AbciDialogue.__init__
+        ) as create_dialogue:
+            responses, *_ = asyncio.run(
+                self._serve(self._requests(n_txs), use_dialogue_less_routing)
+            )
+
+        assert len(responses) == n_txs + 2
+        # the dummy app creates a dialogue for every request, the connection only for the routed ones
+        n_app_dialogues = n_txs + 2
+        n_connection_dialogues = 1 if use_dialogue_less_routing else n_txs + 2
+        assert create_dialogue.call_count == n_app_dialogues + n_connection_dialogues
+
+    @pytest.mark.benchmark
+    def test_dialogue_less_routing_benchmark(self) -> None:
+        """Benchmark the transactions per second through TcpServerChannel, with and without the dialogue-less routing."""
+        n_txs = 2_000
+        requests = self._requests(n_txs)
+
+        rates = []
+        for use_dialogue_less_routing in (False, True):
+            start = time.perf_counter()
+            responses, *_ = asyncio.run(
+                self._serve(requests, use_dialogue_less_routing)
+            )
+            rates.append(n_txs / (time.perf_counter() - start))
+            assert len(responses) == len(requests)
+
+        routed_rate, dialogue_less_rate = rates
+        logging.info(
+            f"Routed through the connection's dialogues: {routed_rate:.0f} txs/s, "
+            f"routed without dialogues: {dialogue_less_rate:.0f} txs/s "
+            f"({dialogue_less_rate / routed_rate:.1f}x)"
+        )
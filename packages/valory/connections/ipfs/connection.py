@@ -18,13 +18,33 @@
 # ------------------------------------------------------------------------------
 """A connection responsible for uploading and downloading files from IPFS."""
 import asyncio
+import json
 import os
+import re
 import tempfile
+import threading
+import time
 from asyncio import Task
-from concurrent.futures import Executor
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import suppress
+from io import BytesIO
 from pathlib import Path
 from shutil import rmtree
-from typing import Any, Callable, Dict, Optional, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import requests
 from aea.configurations.base import PublicId
@@ -33,8 +53,11 @@ from aea.mail.base import Envelope
 from aea.protocols.base import Address, Message
 from aea.protocols.dialogue.base import Dialogue as BaseDialogue
 from aea_cli_ipfs.exceptions import DownloadError
-from aea_cli_ipfs.ipfs_utils import IPFSTool
+from aea_cli_ipfs.ipfs_utils import DEFAULT_IPFS_URI_BASE, IPFSTool
+from ipfshttpclient import multipart
 from ipfshttpclient.exceptions import ErrorResponse
+from ipfshttpclient.http import build_client_sync
+from ipfshttpclient.http_common import ClientSyncBase
 
 from packages.valory.protocols.ipfs import IpfsMessage
 from packages.valory.protocols.ipfs.dialogues import IpfsDialogue
@@ -42,6 +65,14 @@ from packages.valory.protocols.ipfs.dialogues import IpfsDialogues as BaseIpfsDi
 
 
 PUBLIC_ID = PublicId.from_str("valory/ipfs:0.1.0")
+IPFS_FILE_LINK_TYPE = 2
+IPFS_DIR_LINK_TYPE = 1
+DEFAULT_FILES_CACHE_SIZE = 0  # Max size of the cached files in bytes, 0 disables it
+DEFAULT_MAX_WORKERS = 4  # Number of threads of the executor running the IPFS operations
+DEFAULT_MAX_PENDING_REQUESTS = (
+    1000  # Max requests being handled before sending a new one waits
+)
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
 
 class IpfsDialogues(BaseIpfsDialogues):
@@ -73,7 +104,242 @@ class IpfsDialogues(BaseIpfsDialogues):
         )
 
 
-class IpfsConnection(Connection):
+class InMemoryFilesStream(multipart.StreamBase, multipart.StreamFileMixin):
+    """
+    Generator that encodes in-memory files into HTTP multipart, without touching the filesystem.
+
+    The produced body is the same as the one produced for the equivalent files on disk,
+    i.e., a single file, or a directory with the files placed directly under it,
+    so the resulting IPFS hashes are the same.
+    """
+
+    def __init__(
+        self,
+        files: Dict[str, bytes],
+        dir_name: Optional[str] = None,
+        chunk_size: int = multipart.default_chunk_size,
+    ) -> None:
+        """
+        Initialize the stream.
+
+        :param files: a mapping of the file names to their content.
+        :param dir_name: the name of the directory to place the files under, if any.
+        :param chunk_size: the maximum size that any single chunk of the body may have, in bytes.
+        """
+        self.files = files
+        self.dir_name = dir_name
+        super().__init__(dir_name or "files", chunk_size=chunk_size)
+
+    def _body(self) -> Iterator[bytes]:
+        """Yields the body of the stream."""
+        prefix = ""
+        if self.dir_name is not None:
+            # directories are encoded as special empty files
+            yield from self._gen_file(
+                self.dir_name, content_type="application/x-directory"
+            )
+            prefix = f"{self.dir_name}/"
+        for name, data in self.files.items():
+            yield from self._gen_file(prefix + name, file=BytesIO(data))
+        yield from self._gen_end()
+
+
+class IpfsFilesCache:  # pylint: disable=too-many-instance-attributes
+    """
+    A content-addressed cache for the files retrieved from IPFS.
+
+    IPFS content is immutable by hash, so the cached files never need to be invalidated.
+    The files are kept in memory, and evicted in least-recently-used order once their total size exceeds `max_size`.
+    If a `cache_dir` is given, the files are also persisted there, so that they survive the eviction and restarts,
+    bounded by the same size.
+    The cache is safe to be used from the threads of the connection's executor.
+    """
+
+    def __init__(self, max_size: int, cache_dir: Optional[str] = None) -> None:
+        """
+        Initialize the cache.
+
+        :param max_size: the max total size of the cached files, in bytes. If zero, nothing gets cached.
+        :param cache_dir: the directory in which the files are persisted, if any.
+        """
+        if max_size < 0:
+            raise ValueError(
+                f"The size of the IPFS files cache cannot be negative, got {max_size}."
+            )
+        self._max_size = max_size
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        """Get the max total size of the cached files, in bytes."""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Get the total size of the files cached in memory, in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Get the number of hashes cached in memory."""
+        return len(self._entries)
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Get the metrics of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "size": self.size,
+        }
+
+    @staticmethod
+    def _entry_size(files: Dict[str, str]) -> int:
+        """Get the size of an entry, in bytes."""
+        return sum(
+            len(name) + len(data.encode("utf-8")) for name, data in files.items()
+        )
+
+    def _path(self, ipfs_hash: str) -> Optional[Path]:
+        """Get the path in which an entry is persisted, if it can be persisted."""
+        if self._cache_dir is None or re.fullmatch(r"\w+", ipfs_hash) is None:
+            return None
+        return self._cache_dir / f"{ipfs_hash}.json"
+
+    def get(self, ipfs_hash: str) -> Optional[Dict[str, str]]:
+        """
+        Get the files of a hash from the cache.
+
+        :param ipfs_hash: the hash of the files.
+        :return: a copy of the cached files, or None if they are not cached.
+        """
+        with self._lock:
+            files = self._entries.get(ipfs_hash)
+            if files is not None:
+                self._entries.move_to_end(ipfs_hash)
+                self.hits += 1
+                return dict(files)
+
+            path = self._path(ipfs_hash)
+            if path is not None and path.is_file():
+                files = self._load_persisted(path)
+                if files is not None:
+                    self._add(ipfs_hash, files)
+                    self.hits += 1
+                    return dict(files)
+
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _load_persisted(path: Path) -> Optional[Dict[str, str]]:
+        """Load a persisted entry, evicting it if it cannot be read, e.g., if it was truncated."""
+        try:
+            files = json.loads(path.read_text(encoding="utf-8"))
+            path.touch()
+        except (json.JSONDecodeError, OSError):
+            with suppress(OSError):
+                path.unlink()
+            return None
+        return files
+
+    def put(self, ipfs_hash: str, files: Dict[str, str]) -> None:
+        """
+        Put the files of a hash in the cache.
+
+        :param ipfs_hash: the hash of the files.
+        :param files: the files.
+        """
+        if self._max_size == 0 or self._entry_size(files) > self._max_size:
+            return
+        with self._lock:
+            if ipfs_hash in self._entries:
+                self._entries.move_to_end(ipfs_hash)
+                return
+            files = dict(files)
+            self._add(ipfs_hash, files)
+            path = self._path(ipfs_hash)
+            if path is not None:
+                path.write_text(json.dumps(files), encoding="utf-8")
+                self._evict_persisted()
+
+    def _add(self, ipfs_hash: str, files: Dict[str, str]) -> None:
+        """Add an entry in memory, evicting the least recently used ones if needed."""
+        size = self._entry_size(files)
+        self._entries[ipfs_hash] = files
+        self._sizes[ipfs_hash] = size
+        self._size += size
+        while self._size > self._max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(evicted)
+            self.evictions += 1
+
+    def _evict_persisted(self) -> None:
+        """Remove the least recently used persisted entries, until their total size fits the max size."""
+        paths = sorted(
+            cast(Path, self._cache_dir).glob("*.json"),
+            key=lambda path: path.stat().st_mtime,
+        )
+        total_size = sum(path.stat().st_size for path in paths)
+        for path in paths:
+            if total_size <= self._max_size:
+                break
+            total_size -= path.stat().st_size
+            path.unlink()
+
+
+class LatencyHistogram:
+    """A histogram of latencies, in seconds, with fixed buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """
+        Initialize the histogram.
+
+        :param buckets: the sorted upper bounds of the buckets. Larger latencies are counted in an extra, unbounded bucket.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, latency: float) -> None:
+        """Record a latency."""
+        self.counts[bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    @property
+    def mean(self) -> float:
+        """Get the mean latency."""
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the histogram as a dictionary, with the cumulative count of each bucket, keyed by its upper bound."""
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+        }
+
+
+class IpfsConnection(Connection):  # pylint: disable=too-many-instance-attributes
     """An async connection for sending and receiving files to IPFS."""
 
     connection_id = PUBLIC_ID
@@ -87,10 +353,45 @@ class IpfsConnection(Connection):
         super().__init__(**kwargs)  # pragma: no cover
         ipfs_domain = self.configuration.config.get("ipfs_domain")
         self.ipfs_tool: IPFSTool = IPFSTool(ipfs_domain)
+        self.use_streaming: bool = self.configuration.config.get("use_streaming", False)
+        self.streaming_chunk_size: int = self.configuration.config.get(
+            "streaming_chunk_size", multipart.default_chunk_size
+        )
+        self.files_cache = IpfsFilesCache(
+            self.configuration.config.get("files_cache_size", DEFAULT_FILES_CACHE_SIZE),
+            self.configuration.config.get("files_cache_dir", None),
+        )
+        self.max_workers: int = self.configuration.config.get(
+            "max_workers", DEFAULT_MAX_WORKERS
+        )
+        self.max_pending_requests: int = self.configuration.config.get(
+            "max_pending_requests", DEFAULT_MAX_PENDING_REQUESTS
+        )
+        # the max number of requests of each performative which can be handled at the same time
+        self.concurrency_limits: Dict[str, int] = self.configuration.config.get(
+            "concurrency_limits", {}
+        )
+        self.latency_histograms: Dict[str, LatencyHistogram] = {}
+        self._pending_requests: Optional[asyncio.Semaphore] = None
+        self._performative_semaphores: Dict[str, asyncio.Semaphore] = {}
         self.task_to_request: Dict[asyncio.Future, Envelope] = {}
         self.loop_executor: Optional[Executor] = None
         self.dialogues = IpfsDialogues(connection_id=PUBLIC_ID)
         self._response_envelopes: Optional[asyncio.Queue] = None
+        self._http_client: Optional[ClientSyncBase] = None
+
+    @property
+    def http_client(self) -> ClientSyncBase:
+        """
+        Get the HTTP client of the IPFS node's API, used to upload the in-memory files in streaming mode.
+
+        `IPFSTool` can only add files from the filesystem, so the multipart bodies built in memory are posted directly.
+        """
+        if self._http_client is None:
+            self._http_client = build_client_sync(
+                addr=self.ipfs_tool.addr, base=DEFAULT_IPFS_URI_BASE
+            )
+        return self._http_client
 
     @property
     def response_envelopes(self) -> asyncio.Queue:
@@ -105,6 +406,14 @@ class IpfsConnection(Connection):
         """Set up the connection."""
         self.ipfs_tool.check_ipfs_node_running()
         self._response_envelopes = asyncio.Queue()
+        self.loop_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="ipfs"
+        )
+        self._pending_requests = asyncio.Semaphore(self.max_pending_requests)
+        self._performative_semaphores = {
+            performative: asyncio.Semaphore(limit)
+            for performative, limit in self.concurrency_limits.items()
+        }
         self.state = ConnectionStates.connected
 
     async def disconnect(self) -> None:
@@ -118,13 +427,36 @@ class IpfsConnection(Connection):
             if not task.cancelled():  # pragma: nocover
                 task.cancel()
         self._response_envelopes = None
+        if self.loop_executor is not None:
+            self.loop_executor.shutdown(wait=False)
+            self.loop_executor = None
+        self._pending_requests = None
 
         self.state = ConnectionStates.disconnected
 
     async def send(self, envelope: Envelope) -> None:
-        """Send an envelope."""
-        task = self._handle_envelope(envelope)
+        """
+        Send an envelope.
+
+        If `max_pending_requests` are being handled, the method waits until one of them is done,
+        so that the requests are not accumulated inside the connection.
+
+        :param envelope: the envelope to send.
+        """
+        pending_requests = self._pending_requests
+        if pending_requests is None:
+            raise ValueError(
+                "`IPFSConnection` cannot send envelopes. Is the connection setup?"
+            )
+        await pending_requests.acquire()
+        try:
+            task = self._handle_envelope(envelope)
+        except Exception:
+            pending_requests.release()
+            raise
         task.add_done_callback(self._handle_done_task)
+        release = pending_requests.release
+        task.add_done_callback(lambda _: release())
         self.task_to_request[task] = envelope
 
     async def receive(self, *args: Any, **kwargs: Any) -> Optional[Envelope]:
@@ -132,18 +464,49 @@ class IpfsConnection(Connection):
         return await self.response_envelopes.get()
 
     def run_async(
-        self, func: Callable, *args: Any, timeout: Optional[float] = None
+        self,
+        func: Callable,
+        *args: Any,
+        timeout: Optional[float] = None,
+        performative: Optional[str] = None,
     ) -> Task:
-        """Run a function asynchronously by using threads."""
-        ipfs_operation = self.loop.run_in_executor(
-            self.loop_executor,
-            func,
-            *args,
-        )
+        """
+        Run a function asynchronously by using threads.
+
+        :param func: the function to run.
+        :param args: the arguments of the function.
+        :param timeout: the timeout for the operation, including the time spent waiting for its turn.
+        :param performative: the performative the operation handles, used to apply its concurrency limit and record its latency.
+        :return: the task of the operation.
+        """
+        ipfs_operation = self._run_in_executor(func, args, performative)
         timely_operation = asyncio.wait_for(ipfs_operation, timeout=timeout)
         task = self.loop.create_task(timely_operation)
         return task
 
+    async def _run_in_executor(
+        self, func: Callable, args: Tuple[Any, ...], performative: Optional[str]
+    ) -> Any:
+        """Run a function in the executor, respecting the concurrency limit of its performative."""
+        start = time.perf_counter()
+        semaphore = (
+            self._performative_semaphores.get(performative)
+            if performative is not None
+            else None
+        )
+        try:
+            if semaphore is None:
+                return await self.loop.run_in_executor(self.loop_executor, func, *args)
+            async with semaphore:
+                return await self.loop.run_in_executor(self.loop_executor, func, *args)
+        finally:
+            if performative is not None:
+                latency = time.perf_counter() - start
+                self.latency_histograms.setdefault(
+                    performative, LatencyHistogram()
+                ).observe(latency)
+                self.logger.debug(f"Handled `{performative}` in {latency:.3f}s.")
+
     def _handle_envelope(self, envelope: Envelope) -> Task:
         """Handle incoming envelopes by dispatching background tasks."""
         message = cast(IpfsMessage, envelope.message)
@@ -155,7 +518,9 @@ class IpfsConnection(Connection):
             task = self.run_async(self._handle_error, err)
             return task
         dialogue = self.dialogues.update(message)
-        task = self.run_async(handler, message, dialogue)
+        task = self.run_async(
+            handler, message, dialogue, performative=performative.value
+        )
         return task
 
     def _handle_store_files(
@@ -174,6 +539,10 @@ class IpfsConnection(Connection):
             err = "No files were present."
             self.logger.error(err)
             return self._handle_error(err, dialogue)
+        if self.use_streaming:
+            return self._handle_store_files_streaming(message, dialogue)
+        # the stored files are retrieved by their names
+        files_by_name = {os.path.basename(path): data for path, data in files.items()}
         if len(files) == 1:
             # a single file needs to be stored,
             # we don't need to create a dir
@@ -182,15 +551,9 @@ class IpfsConnection(Connection):
         else:
             # multiple files are present, which means that it's a directory
             # we begin by checking that they belong to the same directory
-            dirs = {os.path.dirname(path) for path in files.keys()}
+            dirs = self._get_dirs(files)
             if len(dirs) > 1:
-                err = f"Received files from different dirs {dirs}. "
-                self.logger.error(err)
-                self.logger.info(
-                    "If you want to send multiple files as a single dir, "
-                    "make sure the their path matches to one directory only."
-                )
-                return self._handle_error(err, dialogue)
+                return self._handle_different_dirs(dirs, dialogue)
 
             # "path" is the directory, it's the same for all the files
             path = dirs.pop()
@@ -211,6 +574,7 @@ class IpfsConnection(Connection):
             return self._handle_error(err, dialogue)
         finally:
             self.__remove_filepath(path)
+        self.files_cache.put(hash_, files_by_name)
         response_message = cast(
             IpfsMessage,
             dialogue.reply(
@@ -221,6 +585,114 @@ class IpfsConnection(Connection):
         )
         return response_message
 
+    def _handle_store_files_streaming(
+        self, message: IpfsMessage, dialogue: BaseDialogue
+    ) -> IpfsMessage:
+        """
+        Handle a STORE_FILES performative in streaming mode.
+
+        Uploads the provided files to ipfs straight from memory, without writing them to disk first.
+
+        :param message: The ipfs request.
+        :returns: the hash of the uploaded files.
+        """
+        files = message.files
+        dir_name = None
+        if len(files) > 1:
+            dirs = self._get_dirs(files)
+            if len(dirs) > 1:
+                return self._handle_different_dirs(dirs, dialogue)
+            dir_name = os.path.basename(dirs.pop())
+        try:
+            hash_ = self._add_from_memory(files, dir_name)
+            self.logger.debug(f"Successfully stored files with hash: {hash_}.")
+        except (
+            ValueError,
+            ErrorResponse,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:  # pragma: no cover
+            err = str(e)
+            self.logger.error(err)
+            return self._handle_error(err, dialogue)
+        self.files_cache.put(
+            hash_, {os.path.basename(path): data for path, data in files.items()}
+        )
+        response_message = cast(
+            IpfsMessage,
+            dialogue.reply(
+                performative=IpfsMessage.Performative.IPFS_HASH,
+                target_message=message,
+                ipfs_hash=hash_,
+            ),
+        )
+        return response_message
+
+    def _add_from_memory(
+        self, files: Mapping[str, Union[str, bytes]], dir_name: Optional[str] = None
+    ) -> str:
+        """
+        Add files to ipfs straight from memory.
+
+        The files are wrapped with a directory, exactly as `IPFSTool.add` does for files on disk.
+
+        :param files: a mapping of the file paths to their content.
+        :param dir_name: the name of the directory to place the files under, if any.
+        :return: the hash of the wrapping directory.
+        """
+        encoded_files = {
+            os.path.basename(path): data.encode("utf-8")
+            if isinstance(data, str)
+            else data
+            for path, data in files.items()
+        }
+        stream = InMemoryFilesStream(
+            encoded_files, dir_name, chunk_size=self.streaming_chunk_size
+        )
+        response = self.http_client.request(
+            "/add",
+            decoder="json",
+            data=stream.body(),
+            headers=stream.headers(),
+            opts={"pin": True, "wrap-with-directory": True},
+        )
+        return response[-1]["Hash"]  # pylint: disable=unsubscriptable-object
+
+    def _get_to_memory(self, ipfs_hash: str) -> Dict[str, bytes]:
+        """
+        Get the files resulting from an ipfs hash straight into memory, without writing them to disk first.
+
+        :param ipfs_hash: the hash of the directory which wraps the files.
+        :return: a mapping of the file names to their content.
+        """
+        links = self.__ls(ipfs_hash)
+        if len(links) > 1:
+            self.logger.warning(
+                f"Multiple files or dirs found in {ipfs_hash}. The first will be used. "
+            )
+        link = links.pop()
+        if link["Type"] == IPFS_DIR_LINK_TYPE:
+            dir_hash = link["Hash"]
+            links = [
+                file_link
+                for file_link in self.__ls(dir_hash)
+                if file_link["Type"] == IPFS_FILE_LINK_TYPE
+            ]
+        else:
+            links = [link]
+
+        files: Dict[str, bytes] = {}
+        for file_link in links:
+            content = bytearray()
+            chunks = self.ipfs_tool.client.cat(file_link["Hash"], stream=True)
+            for chunk in chunks:  # pylint: disable=not-an-iterable
+                content += chunk
+            files[file_link["Name"]] = bytes(content)
+        return files
+
+    def __ls(self, ipfs_hash: str) -> List[Dict[str, Any]]:
+        """List the links of an ipfs object."""
+        return list(self.ipfs_tool.client.ls(ipfs_hash)["Objects"][0]["Links"])
+
     def _handle_get_files(
         self, message: IpfsMessage, dialogue: BaseDialogue
     ) -> IpfsMessage:
@@ -232,27 +704,66 @@ class IpfsConnection(Connection):
         :param message: The ipfs request.
         :returns: the downloaded files.
         """
-        response_body: Dict[str, str] = {}
         ipfs_hash = message.ipfs_hash
-        with tempfile.TemporaryDirectory() as tmp_dir:
+        files = self.files_cache.get(ipfs_hash)
+        if files is not None:
+            self.logger.debug(
+                f"Retrieved files with hash {ipfs_hash} from the cache. "
+                f"Cache metrics: {self.files_cache.metrics}"
+            )
+        else:
             try:
-                self.ipfs_tool.download(ipfs_hash, tmp_dir)
+                if self.use_streaming:
+                    files = {
+                        name: data.decode("utf-8")
+                        for name, data in self._get_to_memory(ipfs_hash).items()
+                    }
+                else:
+                    files = self._download(ipfs_hash)
             except (
                 DownloadError,
                 PermissionError,
                 ErrorResponse,
+                IndexError,
             ) as e:
-                err = str(e)
+                err = str(e) or f"Nothing found for hash {ipfs_hash}."
+                self.logger.error(err)
+                return self._handle_error(err, dialogue)
+            except UnicodeDecodeError as e:
+                # the files are returned as text, so binary content cannot be retrieved
+                err = f"The files with hash {ipfs_hash} are not UTF-8 encoded text: {e}"
                 self.logger.error(err)
                 return self._handle_error(err, dialogue)
+            self.files_cache.put(ipfs_hash, files)
+
+        response_message = cast(
+            IpfsMessage,
+            dialogue.reply(
+                performative=IpfsMessage.Performative.FILES,
+                files=files,
+                target_message=message,
+            ),
+        )
+        return response_message
+
+    def _download(self, ipfs_hash: str) -> Dict[str, str]:
+        """
+        Download the files resulting from an ipfs hash, through a temporary directory.
 
-            files = os.listdir(tmp_dir)
-            if len(files) > 1:
+        :param ipfs_hash: the hash of the directory which wraps the files.
+        :return: a mapping of the file names to their content.
+        """
+        files: Dict[str, str] = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.ipfs_tool.download(ipfs_hash, tmp_dir)
+
+            downloaded_files = os.listdir(tmp_dir)
+            if len(downloaded_files) > 1:
                 self.logger.warning(
                     f"Multiple files or dirs found in {tmp_dir}. "
                     f"The first will be used. "
                 )
-            downloaded_file = files.pop()
+            downloaded_file = downloaded_files.pop()
             files_to_be_read = [downloaded_file]
             base_dir = Path(tmp_dir)
             if os.path.isdir(base_dir / downloaded_file):
@@ -261,17 +772,25 @@ class IpfsConnection(Connection):
 
             for file_path in files_to_be_read:
                 with open(base_dir / file_path, encoding="utf-8", mode="r") as file:
-                    response_body[file_path] = file.read()
-
-            response_message = cast(
-                IpfsMessage,
-                dialogue.reply(
-                    performative=IpfsMessage.Performative.FILES,
-                    files=response_body,
-                    target_message=message,
-                ),
-            )
-            return response_message
+                    files[file_path] = file.read()
+        return files
+
+    @staticmethod
+    def _get_dirs(files: Dict[str, Any]) -> Set[str]:
+        """Get the directories of the given files."""
+        return {os.path.dirname(path) for path in files.keys()}
+
+    def _handle_different_dirs(
+        self, dirs: Set[str], dialogue: BaseDialogue
+    ) -> IpfsMessage:
+        """Handle the case in which files from different directories have been received."""
+        err = f"Received files from different dirs {dirs}. "
+        self.logger.error(err)
+        self.logger.info(
+            "If you want to send multiple files as a single dir, "
+            "make sure the their path matches to one directory only."
+        )
+        return self._handle_error(err, dialogue)
 
     def _handle_error(  # pylint: disable=no-self-use
         self, reason: str, dialogue: BaseDialogue
@@ -22,10 +22,17 @@
 import asyncio
 import os
 import platform
+import re
 import tempfile
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union, cast
 from unittest import mock
 from unittest.mock import MagicMock
+from urllib.parse import unquote
 
 import pytest
 from aea.configurations.base import ConnectionConfig
@@ -38,10 +45,17 @@ from aea_test_autonomy.fixture_helpers import (  # noqa: F401; pylint: disable=u
     ipfs_daemon,
     use_ipfs_daemon,
 )
+from ipfshttpclient import multipart
+from ipfshttpclient.exceptions import ErrorResponse
 
 from packages.valory.connections.ipfs.connection import (
+    IPFS_DIR_LINK_TYPE,
+    IPFS_FILE_LINK_TYPE,
+    InMemoryFilesStream,
     IpfsConnection,
     IpfsDialogues,
+    IpfsFilesCache,
+    LatencyHistogram,
     PUBLIC_ID,
 )
 from packages.valory.protocols.ipfs import IpfsMessage
@@ -127,6 +141,7 @@ class TestIpfsConnection:
         ):
             assert len(self.connection.task_to_request) == 0
             await self.connection.send(self.dummy_envelope)
+            await asyncio.sleep(0.1)
             assert len(self.connection.task_to_request) == 1
 
     @pytest.mark.asyncio
@@ -280,3 +295,455 @@ class TestIpfsConnection:
             counterparty=ANY_SKILL,
             performative=IpfsMessage.Performative.GET_FILES,
         )
+
+
+class TestIpfsFilesCache:
+    """Tests for IpfsFilesCache."""
+
+    def test_negative_size(self) -> None:  # pylint: disable=no-self-use
+        """Test that the size of the cache cannot be negative."""
+        with pytest.raises(ValueError, match="cannot be negative"):
+            IpfsFilesCache(-1)
+
+    def test_disabled(self) -> None:  # pylint: disable=no-self-use
+        """Test that nothing gets cached with a zero size."""
+        cache = IpfsFilesCache(0)
+        cache.put("hash", {"file": "data"})
+        assert cache.get("hash") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self) -> None:  # pylint: disable=no-self-use
+        """Test the least-recently-used eviction and the metrics."""
+        # each entry is 10 bytes
+        cache = IpfsFilesCache(20)
+        cache.put("hash1", {"file": "data01"})
+        cache.put("hash2", {"file": "data02"})
+        assert cache.get("hash1") == {"file": "data01"}
+        cache.put("hash3", {"file": "data03"})
+        assert cache.get("hash2") is None
+        assert cache.get("hash3") == {"file": "data03"}
+        # an entry larger than the cache is not cached
+        cache.put("hash4", {"file": "x" * 100})
+        assert cache.get("hash4") is None
+        assert cache.metrics == {
+            "hits": 2,
+            "misses": 2,
+            "evictions": 1,
+            "entries": 2,
+            "size": 20,
+        }
+
+    def test_returns_copies(self) -> None:  # pylint: disable=no-self-use
+        """Test that mutating the retrieved files does not affect the cache."""
+        cache = IpfsFilesCache(100)
+        files = {"file": "data"}
+        cache.put("hash", files)
+        files["other"] = "data"
+        retrieved = cache.get("hash")
+        assert retrieved == {"file": "data"}
+        retrieved["other"] = "data"  # type: ignore
+        assert cache.get("hash") == {"file": "data"}
+
+    def test_persisted(self, tmp_path: Path) -> None:  # pylint: disable=no-self-use
+        """Test that the persisted entries survive the eviction and a new cache instance."""
+        cache = IpfsFilesCache(20, str(tmp_path))
+        cache.put("hash1", {"file": "data01"})
+        cache.put("hash2", {"file": "data02"})
+        cache.put("hash3", {"file": "data03"})
+        assert len(cache) == 2
+        # the persisted entries are bounded by the same size
+        assert len(list(tmp_path.iterdir())) == 1
+
+        new_cache = IpfsFilesCache(20, str(tmp_path))
+        assert new_cache.get("hash3") == {"file": "data03"}
+        assert new_cache.hits == 1
+
+    def test_persisted_corrupt(  # pylint: disable=no-self-use
+        self, tmp_path: Path
+    ) -> None:
+        """Test that a corrupt persisted entry is evicted and treated as a miss."""
+        cache = IpfsFilesCache(100, str(tmp_path))
+        cache.put("hash", {"file": "data"})
+        path = tmp_path / "hash.json"
+        path.write_text(path.read_text()[:-1])
+
+        new_cache = IpfsFilesCache(100, str(tmp_path))
+        assert new_cache.get("hash") is None
+        assert new_cache.misses == 1
+        assert not path.exists()
+
+        # the entry is healed once the files are retrieved again
+        new_cache.put("hash", {"file": "data"})
+        assert IpfsFilesCache(100, str(tmp_path)).get("hash") == {"file": "data"}
+
+
+class LocalIpfsStandIn:
+    """An in-memory stand-in of an IPFS node, serving the calls made in streaming mode."""
+
+    def __init__(self, chunk_size: int) -> None:
+        """Initialize the stand-in."""
+        self.chunk_size = chunk_size
+        self.objects: Dict[str, Union[bytes, List[Dict[str, Any]]]] = {}
+        self.n_uploaded_chunks = 0
+
+    def _put(self, obj: Union[bytes, List[Dict[str, Any]]]) -> str:
+        """Store an object and return its hash."""
+        hash_ = "Qm" + sha256(repr(obj).encode()).hexdigest()
+        self.objects[hash_] = obj
+        return hash_
+
+    def request(  # pylint: disable=unused-argument,too-many-locals
+        self,
+        path: str,
+        decoder: str,
+        data: Iterator[bytes],
+        headers: Dict[str, str],
+        opts: Dict[str, Any],
+    ) -> List[Dict[str, str]]:
+        """Handle an `/add` request wrapping the uploaded files with a directory."""
+        assert path == "/add" and opts["wrap-with-directory"]
+        chunks = list(data)
+        self.n_uploaded_chunks += len(chunks)
+        body = b"".join(chunks)
+        boundary = re.search(r'boundary="(\w+)"', headers["Content-Type"])
+        parts = body.split(b"--" + boundary.group(1).encode())[1:-1]  # type: ignore
+
+        entries: List[Dict[str, str]] = []
+        root_links: List[Dict[str, Any]] = []
+        dirs: Dict[str, List[Dict[str, Any]]] = {}
+        for part in parts:
+            raw_headers, content = part[2:].split(b"\r\n\r\n", 1)
+            filename = re.search(rb'filename="([^"]*)"', raw_headers)
+            name = unquote(filename.group(1).decode())  # type: ignore
+            if b"application/x-directory" in raw_headers:
+                dirs[name] = []
+                continue
+            hash_ = self._put(content[:-2])
+            entries.append({"Name": name, "Hash": hash_})
+            dir_name, _, file_name = name.rpartition("/")
+            link = {"Name": file_name, "Hash": hash_, "Type": IPFS_FILE_LINK_TYPE}
+            (dirs[dir_name] if dir_name else root_links).append(link)
+
+        for dir_name, links in dirs.items():
+            hash_ = self._put(sorted(links, key=lambda link: str(link["Name"])))
+            entries.append({"Name": dir_name, "Hash": hash_})
+            root_links.append(
+                {"Name": dir_name, "Hash": hash_, "Type": IPFS_DIR_LINK_TYPE}
+            )
+        wrapper_links = sorted(root_links, key=lambda link: str(link["Name"]))
+        entries.append({"Name": "", "Hash": self._put(wrapper_links)})
+        return entries
+
+    def _get(self, hash_: str) -> Union[bytes, List[Dict[str, Any]]]:
+        """Get an object."""
+        if hash_ not in self.objects:
+            raise ErrorResponse(f"{hash_} not found", None)
+        return self.objects[hash_]
+
+    def ls(self, hash_: str) -> Dict[str, Any]:
+        """List the links of a directory."""
+        return {"Objects": [{"Hash": hash_, "Links": self._get(hash_)}]}
+
+    def cat(
+        self, hash_: str, stream: bool = False  # pylint: disable=unused-argument
+    ) -> Iterator[bytes]:
+        """Stream the content of a file."""
+        data = self._get(hash_)
+        assert isinstance(data, bytes)
+        return (
+            data[offset : offset + self.chunk_size]
+            for offset in range(0, len(data), self.chunk_size)
+        )
+
+
+class TestIpfsConnectionStreaming:
+    """Tests for IpfsConnection in streaming mode, against a local IPFS stand-in."""
+
+    chunk_size = 16
+
+    def setup(self) -> None:
+        """Set up the tests."""
+        configuration = ConnectionConfig(
+            ipfs_domain=LOCAL_IPFS,
+            use_streaming=True,
+            streaming_chunk_size=self.chunk_size,
+            files_cache_size=2**20,
+            connection_id=IpfsConnection.connection_id,
+        )
+        # the IPFS node is replaced by the local stand-in
+        with mock.patch(
+            "packages.valory.connections.ipfs.connection.IPFSTool",
+        ):
+            self.connection = IpfsConnection(
+                configuration=configuration,
+                data_dir=MagicMock(),
+            )
+        self.stand_in = LocalIpfsStandIn(self.chunk_size)
+        self.connection.ipfs_tool.client = self.stand_in  # type: ignore
+        self.connection._http_client = self.stand_in  # type: ignore
+
+    @pytest.mark.parametrize(
+        ("files", "expected_files"),
+        [
+            (
+                {"dummy_filename": "dummy_content" * 10},
+                {"dummy_filename": "dummy_content" * 10},
+            ),
+            (
+                {
+                    "dummy_dir/dummy_filename1": "dummy_content1",
+                    "dummy_dir/dummy_filename2": "dummy_content2",
+                },
+                {
+                    "dummy_filename1": "dummy_content1",
+                    "dummy_filename2": "dummy_content2",
+                },
+            ),
+            (
+                {
+                    "dummy_dir/dummy_dir_nested/dummy_filename1": "dummy_content1",
+                    "dummy_dir/dummy_dir_nested/dummy_filename2": "dummy_content2",
+                },
+                {
+                    "dummy_filename1": "dummy_content1",
+                    "dummy_filename2": "dummy_content2",
+                },
+            ),
+        ],
+    )
+    def test_store_and_get_files(
+        self,
+        files: Dict[str, str],
+        expected_files: Dict[str, str],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that files are stored and retrieved without touching the filesystem."""
+        monkeypatch.chdir(tmp_path)
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.STORE_FILES, files=files  # type: ignore
+        )
+        dialogue = MagicMock()
+        self.connection._handle_store_files(message, dialogue)
+        ipfs_hash = dialogue.reply.call_args.kwargs["ipfs_hash"]
+        assert self.stand_in.n_uploaded_chunks > len(files)
+
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.GET_FILES, ipfs_hash=ipfs_hash  # type: ignore
+        )
+        self.connection._handle_get_files(message, dialogue)
+        assert dialogue.reply.call_args.kwargs["files"] == expected_files
+        assert not list(tmp_path.iterdir())
+
+    def test_get_files_cached(self) -> None:
+        """Test that the stored and the retrieved files are served from the cache."""
+        files = {"dummy_dir/file1": "content1", "dummy_dir/file2": "content2"}
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.STORE_FILES, files=files  # type: ignore
+        )
+        dialogue = MagicMock()
+        self.connection._handle_store_files(message, dialogue)
+        ipfs_hash = dialogue.reply.call_args.kwargs["ipfs_hash"]
+
+        # the files cannot be retrieved from the node anymore
+        self.stand_in.objects.clear()
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.GET_FILES, ipfs_hash=ipfs_hash  # type: ignore
+        )
+        for _ in range(2):
+            self.connection._handle_get_files(message, dialogue)
+            assert dialogue.reply.call_args.kwargs["files"] == {
+                "file1": "content1",
+                "file2": "content2",
+            }
+        assert self.connection.files_cache.hits == 2
+
+    def test_binary_payloads(self) -> None:
+        """Test that binary payloads are transferred in chunks."""
+        files = {"data.bin": bytes(range(256)) * 4}
+        ipfs_hash = self.connection._add_from_memory(files)
+        assert self.stand_in.n_uploaded_chunks >= len(files["data.bin"]) // 16
+        assert self.connection._get_to_memory(ipfs_hash) == files
+
+    @pytest.mark.parametrize("use_streaming", (True, False))
+    def test_get_files_not_utf8(self, use_streaming: bool) -> None:
+        """Test getting binary files, which cannot be decoded to text."""
+        ipfs_hash = self.connection._add_from_memory({"data.bin": b"\xff\xfe"})
+
+        def download(hash_: str, target_dir: str) -> None:
+            """Download the files of a hash, as `IPFSTool.download` does."""
+            for name, data in self.connection._get_to_memory(hash_).items():
+                Path(target_dir, name).write_bytes(data)
+
+        self.connection.use_streaming = use_streaming
+        self.connection.ipfs_tool.download.side_effect = download  # type: ignore
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.GET_FILES, ipfs_hash=ipfs_hash  # type: ignore
+        )
+        dialogue = MagicMock()
+        with mock.patch.object(self.connection.logger, "error") as mock_logger:
+            self.connection._handle_get_files(message, dialogue)
+        mock_logger.assert_called_once()
+        reply_kwargs = dialogue.reply.call_args.kwargs
+        assert reply_kwargs["performative"] == IpfsMessage.Performative.ERROR
+        assert reply_kwargs["reason"].startswith(
+            f"The files with hash {ipfs_hash} are not UTF-8 encoded text"
+        )
+        assert ipfs_hash not in self.connection.files_cache._entries
+
+    def test_store_files_different_dirs(self) -> None:
+        """Test storing files from different directories."""
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.STORE_FILES,  # type: ignore
+            files={"dir1/file": "content", "dir2/file": "content"},
+        )
+        dialogue = MagicMock()
+        with mock.patch.object(self.connection.logger, "error") as mock_logger:
+            self.connection._handle_store_files(message, dialogue)
+        mock_logger.assert_called_once()
+        assert (
+            dialogue.reply.call_args.kwargs["performative"]
+            == IpfsMessage.Performative.ERROR
+        )
+
+    def test_get_files_not_found(self) -> None:
+        """Test getting files for an unknown hash."""
+        message = IpfsMessage(
+            performative=IpfsMessage.Performative.GET_FILES, ipfs_hash="unknown"  # type: ignore
+        )
+        dialogue = MagicMock()
+        with mock.patch.object(self.connection.logger, "error") as mock_logger:
+            self.connection._handle_get_files(message, dialogue)
+        mock_logger.assert_called_once_with("unknown not found")
+        assert (
+            dialogue.reply.call_args.kwargs["performative"]
+            == IpfsMessage.Performative.ERROR
+        )
+
+    @pytest.mark.parametrize("n_files", [1, 3])
+    def test_in_memory_stream_matches_disk(  # pylint: disable=no-self-use
+        self, n_files: int, tmp_path: Path
+    ) -> None:
+        """Test that the in-memory multipart body is the same as the one for the same files on disk."""
+        files = {f"file{i}.json": f'{{"value": {i}}}'.encode() for i in range(n_files)}
+        dir_path = tmp_path / "dummy_dir"
+        dir_path.mkdir()
+        for name, data in files.items():
+            (dir_path / name).write_bytes(data)
+
+        dir_name = None
+        disk_path = dir_path / "file0.json"
+        if n_files > 1:
+            dir_name, disk_path = dir_path.name, dir_path
+        disk_body, disk_headers, _ = multipart.stream_filesystem_node(
+            str(disk_path), recursive=True
+        )
+        stream = InMemoryFilesStream(files, dir_name)
+
+        def normalize(body: Iterator[bytes], headers: Dict[str, str]) -> List[bytes]:
+            """Split a body into its parts, without the absolute paths, in a deterministic order."""
+            boundary = re.search(r'boundary="(\w+)"', headers["Content-Type"])
+            parts = b"".join(body).split(boundary.group(1).encode())  # type: ignore
+            # the order of the files does not matter, as the links of a directory are sorted
+            return sorted(re.sub(rb"Abspath: [^\r]*\r\n", b"", part) for part in parts)
+
+        assert normalize(disk_body, disk_headers) == normalize(
+            stream.body(), stream.headers()
+        )
+
+
+def test_latency_histogram() -> None:
+    """Test LatencyHistogram."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    assert histogram.mean == 0.0
+    for latency in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(latency)
+    assert histogram.as_dict() == {
+        "buckets": {"le_0.1": 2, "le_1.0": 3, "le_inf": 4},
+        "count": 4,
+        "mean": 2.65 / 4,
+        "max": 2.0,
+    }
+
+
+class TestIpfsConnectionConcurrency:
+    """Tests for the executor and the concurrency limits of IpfsConnection."""
+
+    def setup(self) -> None:
+        """Set up the tests."""
+        configuration = ConnectionConfig(
+            ipfs_domain=LOCAL_IPFS,
+            max_workers=3,
+            max_pending_requests=4,
+            concurrency_limits={IpfsMessage.Performative.GET_FILES.value: 2},
+            connection_id=IpfsConnection.connection_id,
+        )
+        with mock.patch(
+            "packages.valory.connections.ipfs.connection.IPFSTool",
+        ):
+            self.connection = IpfsConnection(
+                configuration=configuration,
+                data_dir=MagicMock(),
+            )
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+
+    def _handle_get_files(  # pylint: disable=unused-argument
+        self, message: IpfsMessage, dialogue: Any
+    ) -> None:
+        """A handler which records how many requests are handled at the same time."""
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(timeout=10)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+
+    def _envelope(self) -> Envelope:  # pylint: disable=no-self-use
+        """Get a GET_FILES envelope."""
+        message, _ = IpfsDialogues(connection_id=ANY_SKILL).create(
+            counterparty=str(PUBLIC_ID),
+            performative=IpfsMessage.Performative.GET_FILES,
+            ipfs_hash="hash",
+        )
+        return Envelope(to=str(PUBLIC_ID), sender=ANY_SKILL, message=message)
+
+    @pytest.mark.asyncio
+    async def test_limits(self) -> None:
+        """Test the backpressure on the sent requests, the per-performative limit and the latency histograms."""
+        await self.connection.connect()
+        executor = cast(ThreadPoolExecutor, self.connection.loop_executor)
+        assert executor._max_workers == 3
+
+        n_requests = 6
+        with mock.patch.object(
+            self.connection, "_handle_get_files", new=self._handle_get_files
+        ):
+            for _ in range(4):
+                await asyncio.wait_for(self.connection.send(self._envelope()), 1)
+            assert len(self.connection.task_to_request) == 4
+            # `send` waits once `max_pending_requests` are being handled
+            blocked_sends = [
+                asyncio.ensure_future(self.connection.send(self._envelope()))
+                for _ in range(n_requests - 4)
+            ]
+            await asyncio.sleep(0.1)
+            assert not any(send.done() for send in blocked_sends)
+            assert len(self.connection.task_to_request) == 4
+            self.release.set()
+            await asyncio.wait_for(asyncio.gather(*blocked_sends), timeout=10)
+            for _ in range(n_requests):
+                await asyncio.wait_for(self.connection.receive(), timeout=10)
+
+        assert self.max_running == 2
+        histogram = self.connection.latency_histograms[
+            IpfsMessage.Performative.GET_FILES.value
+        ]
+        assert histogram.count == n_requests
+        await self.connection.disconnect()
+        assert self.connection.loop_executor is None
+        with pytest.raises(ValueError):
+            await self.connection.send(self._envelope())
@@ -19,10 +19,27 @@
 
 """This module contains the class to connect to an Gnosis Safe contract."""
 import binascii
+import json
 import logging
 import secrets
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from aea.common import JSONLike
 from aea.configurations.base import PublicId
@@ -32,9 +49,9 @@ from aea_ledger_ethereum import EthereumApi
 from eth_typing import ChecksumAddress, HexAddress, HexStr
 from hexbytes import HexBytes
 from packaging.version import Version
-from requests import HTTPError
-from web3.exceptions import ContractLogicError, TransactionNotFound
-from web3.types import BlockIdentifier, Nonce, TxData, TxParams, Wei
+from requests import HTTPError, Timeout
+from web3.exceptions import BlockNotFound, ContractLogicError, TransactionNotFound
+from web3.types import BlockIdentifier, EventData, Nonce, TxData, TxParams, Wei
 
 from packages.valory.contracts.gnosis_safe.encode import encode_typed_data
 from packages.valory.contracts.gnosis_safe_proxy_factory.contract import (
@@ -55,6 +72,29 @@ NULL_ADDRESS: str = "0x" + "0" * 40
 SAFE_CONTRACT = "0xd9Db270c1B5E3Bd161E8c8503c55cEABeE709552"
 DEFAULT_CALLBACK_HANDLER = "0xf48f2B2d2a534e402487b3ee7C18c33Aec0Fe5e4"
 PROXY_FACTORY_CONTRACT = "0xa6B71E26C5e0845f74c812102Ca7114b6a896AB2"
+# the number of blocks of the first window of an event scan, adapted as the scan progresses
+EVENT_SCAN_WINDOW = 10_000
+MAX_EVENT_SCAN_WINDOW = 100_000
+# the number of windows which are scanned concurrently
+EVENT_SCAN_WORKERS = 4
+# the errors raised by the providers when a window is too large, e.g., because of a timeout or a results' limit
+EVENT_SCAN_ERRORS = (ValueError, Timeout)
+EVENT_SCAN_ERROR_CODES = (-32005,)
+EVENT_SCAN_ERROR_MESSAGES = (
+    "query returned more than",
+    "query timeout",
+    "response size",
+    "block range",
+    "range is too large",
+    "range too large",
+    "limit exceeded",
+    "too many results",
+)
+# the number of times the windows of a scan can be split before giving up
+MAX_EVENT_SCAN_SPLITS = 32
+# the number of scanned ranges which are cached, and the total number of their entries
+EVENT_SCAN_CACHE_SIZE = 16
+EVENT_SCAN_CACHE_MAX_ENTRIES = 10_000
 SAFE_DEPLOYED_BYTECODE = "0x608060405273ffffffffffffffffffffffffffffffffffffffff600054167fa619486e0000000000000000000000000000000000000000000000000000000060003514156050578060005260206000f35b3660008037600080366000845af43d6000803e60008114156070573d6000fd5b3d6000f3fea2646970667358221220d1429297349653a4918076d650332de1a1068c5f3e07c5c82360c277770b955264736f6c63430007060033"
 
 
@@ -68,6 +108,133 @@ def checksum_address(agent_address: str) -> ChecksumAddress:
     return ChecksumAddress(HexAddress(HexStr(agent_address)))
 
 
+class ScannedEvents(NamedTuple):
+    """The events of a scanned block range."""
+
+    from_block: int
+    to_block: int
+    to_block_hash: str
+    entries: List[EventData]
+
+
+def _is_window_error(error: Exception) -> bool:
+    """Check whether the error is raised by the provider because the window is too large."""
+    if isinstance(error, Timeout):
+        return True
+    details = error.args[0] if error.args else ""
+    if isinstance(details, dict):
+        if details.get("code", None) in EVENT_SCAN_ERROR_CODES:
+            return True
+        details = details.get("message", "")
+    message = str(details).lower()
+    return any(pattern in message for pattern in EVENT_SCAN_ERROR_MESSAGES)
+
+
+def _submit_windows(
+    submit: Callable[[int, int], Future],
+    retries: Deque[Tuple[int, int]],
+    cursor: int,
+    to_block: int,
+    window: int,
+) -> Tuple[List[Tuple[int, int, Future]], int]:
+    """
+    Submit the next batch of windows to scan, starting with the windows which are retried.
+
+    :param submit: a function submitting the scan of the given inclusive block range.
+    :param retries: the windows to retry, consumed in place.
+    :param cursor: the first block which has not been scheduled yet.
+    :param to_block: the last block to scan.
+    :param window: the number of blocks of the new windows.
+    :return: the first block, the last block and the future of each window of the batch, and the updated cursor.
+    """
+    batch: List[Tuple[int, int]] = []
+    while len(batch) < EVENT_SCAN_WORKERS and (retries or cursor <= to_block):
+        if retries:
+            batch.append(retries.popleft())
+            continue
+        window_end = min(cursor + window - 1, to_block)
+        batch.append((cursor, window_end))
+        cursor = window_end + 1
+    return [(start, end, submit(start, end)) for start, end in batch], cursor
+
+
+def _collect_windows(
+    futures: List[Tuple[int, int, Future]],
+    completed: Dict[int, Tuple[int, List[EventData]]],
+    retries: Deque[Tuple[int, int]],
+    max_splits: int,
+) -> int:
+    """
+    Collect the entries of a batch of windows, splitting the windows which failed because they are too large.
+
+    :param futures: the first block, the last block and the future of each window of the batch.
+    :param completed: the last block and the entries of the completed windows by first block, updated in place.
+    :param retries: the windows to retry, updated in place with the halves of the failed windows.
+    :param max_splits: the number of times the windows can still be split.
+    :return: the number of windows which have been split.
+    """
+    splits = 0
+    for start, end, future in futures:
+        try:
+            completed[start] = (end, future.result())
+        except EVENT_SCAN_ERRORS as e:
+            if start == end or splits >= max_splits or not _is_window_error(e):
+                raise
+            _logger.debug(f"Scanning blocks {start}-{end} failed: {e}")
+            splits += 1
+            middle = (start + end) // 2
+            retries.extend(((start, middle), (middle + 1, end)))
+    return splits
+
+
+def _scan_windows(
+    get_logs: Callable[[int, int], List[EventData]],
+    from_block: int,
+    to_block: int,
+    window: int = EVENT_SCAN_WINDOW,
+    max_splits: int = MAX_EVENT_SCAN_SPLITS,
+) -> Iterator[Tuple[int, List[EventData]]]:
+    """
+    Scan a block range in adaptive windows.
+
+    The windows are scanned concurrently. A window which fails because it exceeds the provider's range or results' limit
+    is split in two and retried, and the size of the next windows is halved,
+    while it is doubled after a batch of windows which all succeeded. Any other error is raised,
+    as well as the errors of a window of a single block and the ones raised once the windows have been split `max_splits` times.
+
+    :param get_logs: a function returning the entries of the given inclusive block range.
+    :param from_block: the first block to scan.
+    :param to_block: the last block to scan.
+    :param window: the number of blocks of the first windows.
+    :param max_splits: the number of times the windows can be split.
+    :yields: the last block and the entries of each scanned window, in block order.
+    """
+    retries: Deque[Tuple[int, int]] = deque()
+    completed: Dict[int, Tuple[int, List[EventData]]] = {}
+    cursor = next_block = from_block
+    splits = 0
+    with ThreadPoolExecutor(max_workers=EVENT_SCAN_WORKERS) as executor:
+        while retries or cursor <= to_block:
+            futures, cursor = _submit_windows(
+                partial(executor.submit, get_logs), retries, cursor, to_block, window
+            )
+            new_splits = _collect_windows(
+                futures, completed, retries, max_splits - splits
+            )
+            splits += new_splits
+            # shrink the windows after a failed batch, and grow them after a successful one
+            window = (
+                max(1, window // 2)
+                if new_splits
+                else min(2 * window, MAX_EVENT_SCAN_WINDOW)
+            )
+
+            while next_block in completed:
+                end, entries = completed.pop(next_block)
+                yield end, entries
+                next_block = end + 1
+
+
 class SafeOperation(Enum):
     """Operation types."""
 
@@ -81,6 +248,9 @@ class GnosisSafeContract(Contract):
 
     contract_id = PUBLIC_ID
     _SENTINEL_OWNERS = "0x0000000000000000000000000000000000000001"
+    # the most recently used scanned ranges, per provider, contract, event and filters
+    _scanned_events: "OrderedDict[Tuple[str, ...], ScannedEvents]" = OrderedDict()
+    _scanned_events_lock = threading.Lock()
 
     @classmethod
     def get_raw_transaction(
@@ -735,6 +905,177 @@ class GnosisSafeContract(Contract):
 
         return dict(amount_spent=total_spent)
 
+    @classmethod
+    def _to_block_number(cls, ledger_api: EthereumApi, block: BlockIdentifier) -> int:
+        """Resolve a block identifier to a block number."""
+        if isinstance(block, int):
+            return block
+        if block == "earliest":
+            return 0
+        if block == "latest":
+            return ledger_api.api.eth.block_number
+        if isinstance(block, str) and block.startswith("0x"):
+            return int(block, 16)
+        return ledger_api.api.eth.get_block(block)["number"]
+
+    @classmethod
+    def _get_block_hash(cls, ledger_api: EthereumApi, block_number: int) -> str:
+        """Get the hash of the given block, or an empty string if it does not exist."""
+        try:
+            return ledger_api.api.eth.get_block(block_number)["hash"].hex()
+        except BlockNotFound:
+            return ""
+
+    @classmethod
+    def _get_scanned_events(cls, key: Tuple[str, ...]) -> Optional[ScannedEvents]:
+        """Get the scanned range of the given key."""
+        with cls._scanned_events_lock:
+            scanned = cls._scanned_events.get(key, None)
+            if scanned is not None:
+                cls._scanned_events.move_to_end(key)
+            return scanned
+
+    @classmethod
+    def _get_valid_scanned_events(
+        cls, ledger_api: EthereumApi, key: Tuple[str, ...]
+    ) -> Optional[ScannedEvents]:
+        """Get the scanned range of the given key, unless the hash of its last block has changed."""
+        scanned = cls._get_scanned_events(key)
+        if scanned is not None and (
+            not scanned.to_block_hash
+            or scanned.to_block_hash
+            != cls._get_block_hash(ledger_api, scanned.to_block)
+        ):
+            # the chain has been reorganized or replaced since the range was scanned
+            return None
+        return scanned
+
+    @classmethod
+    def _set_scanned_events(cls, key: Tuple[str, ...], scanned: ScannedEvents) -> None:
+        """Set the scanned range of the given key, evicting the least recently used ones while the cache is too large."""
+        with cls._scanned_events_lock:
+            if len(scanned.entries) > EVENT_SCAN_CACHE_MAX_ENTRIES:
+                cls._scanned_events.pop(key, None)
+                return
+            cls._scanned_events[key] = scanned
+            cls._scanned_events.move_to_end(key)
+            n_entries = sum(
+                len(cached.entries) for cached in cls._scanned_events.values()
+            )
+            while (
+                len(cls._scanned_events) > EVENT_SCAN_CACHE_SIZE
+                or n_entries > EVENT_SCAN_CACHE_MAX_ENTRIES
+            ):
+                _, evicted = cls._scanned_events.popitem(last=False)
+                n_entries -= len(evicted.entries)
+
+    @classmethod
+    def scan_events(  # pylint: disable=too-many-arguments,too-many-locals
+        cls,
+        ledger_api: EthereumApi,
+        contract_address: str,
+        event_name: str,
+        from_block: BlockIdentifier = "earliest",
+        to_block: BlockIdentifier = "latest",
+        argument_filters: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[EventData]:
+        """
+        Stream the events of a contract in the given block range.
+
+        The range is scanned in adaptive windows, as `eth_getLogs` requests over large ranges
+        time out or exceed the providers' limits. The scanned range is cached per provider, contract, event and filters,
+        and it is extended window by window, so later or interrupted queries only scan the blocks which have not been scanned yet.
+        The cache is dropped if the hash of its last block has changed, e.g., because of a reorg.
+
+        :param ledger_api: the ledger API object
+        :param contract_address: the contract address
+        :param event_name: the name of the event
+        :param from_block: from which block to search for events
+        :param to_block: to which block to search for events
+        :param argument_filters: the filters on the event's indexed arguments
+        :yields: the events, in block order
+        """
+        start = cls._to_block_number(ledger_api, from_block)
+        end = cls._to_block_number(ledger_api, to_block)
+        if start > end:
+            return
+
+        event = getattr(
+            cls.get_instance(ledger_api, contract_address).events, event_name
+        )
+
+        def get_logs(window_start: int, window_end: int) -> List[EventData]:
+            """Get the entries of the given window."""
+            return list(
+                event.get_logs(
+                    argument_filters=argument_filters,
+                    fromBlock=window_start,
+                    toBlock=window_end,
+                )
+            )
+
+        key = (
+            str(getattr(ledger_api.api.provider, "endpoint_uri", "")),
+            contract_address.lower(),
+            event_name,
+            json.dumps(argument_filters or {}, sort_keys=True),
+        )
+        scanned = cls._get_valid_scanned_events(ledger_api, key)
+        if scanned is not None and end < scanned.from_block - 1:
+            # the range is before the scanned one, scan it without replacing the cache
+            for _, entries in _scan_windows(get_logs, start, end):
+                yield from entries
+            return
+        if scanned is None or start > scanned.to_block + 1:
+            scanned = ScannedEvents(start, start - 1, "", [])
+
+        scanned_from, scanned_to, scanned_to_hash, cached_entries = scanned
+        # the entries are only extended in place by the scan which owns the list,
+        # the other scans only read the entries up to the last block of their snapshot
+        scanned_entries = list(cached_entries)
+        if start < scanned_from:
+            prefix_entries: List[EventData] = []
+            for _, entries in _scan_windows(get_logs, start, scanned_from - 1):
+                prefix_entries.extend(entries)
+                yield from entries
+            prefix_entries.extend(scanned_entries)
+            scanned_from, scanned_entries = start, prefix_entries
+            cls._set_scanned_events(
+                key,
+                ScannedEvents(
+                    scanned_from, scanned_to, scanned_to_hash, scanned_entries
+                ),
+            )
+
+        cached_to = min(end, scanned_to)
+        yield from (
+            entry
+            for entry in cached_entries
+            if start <= entry["blockNumber"] <= cached_to
+        )
+
+        if end <= scanned_to:
+            return
+
+        new_to = scanned_to
+        try:
+            for window_end, entries in _scan_windows(get_logs, scanned_to + 1, end):
+                scanned_entries.extend(entries)
+                new_to = window_end
+                yield from entries
+        finally:
+            # the hash is fetched once the scan completes or is interrupted, so that the progress is kept
+            scanned_to_hash = (
+                cls._get_block_hash(ledger_api, new_to) if new_to > scanned_to else ""
+            )
+            if scanned_to_hash:
+                cls._set_scanned_events(
+                    key,
+                    ScannedEvents(
+                        scanned_from, new_to, scanned_to_hash, scanned_entries
+                    ),
+                )
+
     @classmethod
     def get_safe_txs(
         cls,
@@ -754,18 +1095,16 @@ class GnosisSafeContract(Contract):
         """
 
         ledger_api = cast(EthereumApi, ledger_api)
-        factory_contract = cls.get_instance(ledger_api, contract_address)
-        entries = factory_contract.events.ExecutionSuccess.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block,
-        ).get_all_entries()
+        entries = cls.scan_events(
+            ledger_api, contract_address, "ExecutionSuccess", from_block, to_block
+        )
 
         return dict(
             txs=list(
                 map(
                     lambda entry: dict(
-                        tx_hash=entry.transactionHash.hex(),
-                        block_number=entry.blockNumber,
+                        tx_hash=entry["transactionHash"].hex(),
+                        block_number=entry["blockNumber"],
                     ),
                     entries,
                 )
@@ -792,16 +1131,14 @@ class GnosisSafeContract(Contract):
         :return: the added owner events
         """
         ledger_api = cast(EthereumApi, ledger_api)
-        safe_contract = cls.get_instance(ledger_api, contract_address)
-        entries = safe_contract.events.RemovedOwner.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block,
-        ).get_all_entries()
+        entries = cls.scan_events(
+            ledger_api, contract_address, "RemovedOwner", from_block, to_block
+        )
         if removed_owner is None:
             removed_owner_events = list(
                 dict(
-                    tx_hash=entry.transactionHash.hex(),
-                    block_number=entry.blockNumber,
+                    tx_hash=entry["transactionHash"].hex(),
+                    block_number=entry["blockNumber"],
                     owner=entry["args"]["owner"],
                 )
                 for entry in entries
@@ -813,8 +1150,8 @@ class GnosisSafeContract(Contract):
         checksummed_removed_owner = ledger_api.api.to_checksum_address(removed_owner)
         removed_owner_events = list(
             dict(
-                tx_hash=entry.transactionHash.hex(),
-                block_number=entry.blockNumber,
+                tx_hash=entry["transactionHash"].hex(),
+                block_number=entry["blockNumber"],
                 owner=entry["args"]["owner"],
             )
             for entry in entries
@@ -847,17 +1184,19 @@ class GnosisSafeContract(Contract):
          :return: the zero transfer events
         """
         ledger_api = cast(EthereumApi, ledger_api)
-        safe_contract = cls.get_instance(ledger_api, contract_address)
         sender_address = ledger_api.api.to_checksum_address(sender_address)
-        entries = safe_contract.events.SafeReceived.create_filter(
-            fromBlock=from_block,
-            toBlock=to_block,
+        entries = cls.scan_events(
+            ledger_api,
+            contract_address,
+            "SafeReceived",
+            from_block,
+            to_block,
             argument_filters=dict(sender=sender_address),
-        ).get_all_entries()
+        )
         zero_transfer_events = list(
             dict(
-                tx_hash=entry.transactionHash.hex(),
-                block_number=entry.blockNumber,
+                tx_hash=entry["transactionHash"].hex(),
+                block_number=entry["blockNumber"],
                 sender=ledger_api.api.to_checksum_address(entry["args"]["sender"]),
             )
             for entry in entries
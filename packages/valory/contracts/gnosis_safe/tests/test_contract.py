@@ -20,6 +20,7 @@
 """Tests for valory/gnosis contract."""
 
 import binascii
+import json
 import secrets
 import time
 from pathlib import Path
@@ -43,15 +44,20 @@ from aea_test_autonomy.configurations import (
 from aea_test_autonomy.docker.base import skip_docker_tests
 from aea_test_autonomy.helpers.contracts import get_register_contract
 from hexbytes import HexBytes
+from requests import Timeout
 from web3 import Web3
 from web3.datastructures import AttributeDict
 from web3.eth import Eth
-from web3.exceptions import ContractLogicError
+from web3.exceptions import BlockNotFound, ContractLogicError
 from web3.types import TxData
 
+from packages.valory.contracts.gnosis_safe import contract as contract_module
 from packages.valory.contracts.gnosis_safe.contract import (
+    EVENT_SCAN_WORKERS,
     GnosisSafeContract,
     SAFE_CONTRACT,
+    ScannedEvents,
+    _scan_windows,
 )
 from packages.valory.contracts.gnosis_safe_proxy_factory.tests.test_contract import (
     PACKAGE_DIR as PROXY_DIR,
@@ -843,3 +849,242 @@ class TestOwnerManagement(BaseContractTestHardHatSafeNet):
         assert (
             remove_events[0].get("owner") == old_owner
         ), "a different owner than expected was removed"
+
+
+class TestEventScanning:
+    """Test the chunked scanning of the events."""
+
+    event_blocks = (0, 5, 5, 40, 99, 150)
+    max_window = 16
+
+    def setup_method(self) -> None:
+        """Set up the test."""
+        self.scanned_windows: List[Tuple[int, int]] = []
+        self.block_number = 120
+        self.block_hashes: Dict[int, HexBytes] = {}
+
+    def get_logs(self, start: int, end: int) -> List[AttributeDict]:
+        """Get the logs of a fake chain, failing for windows which are too large."""
+        if end - start + 1 > self.max_window:
+            raise ValueError("query returned more than 10000 results")
+        self.scanned_windows.append((start, end))
+        return [
+            AttributeDict(dict(blockNumber=block, transactionHash=HexBytes(block)))
+            for block in self.event_blocks
+            if start <= block <= min(end, self.block_number)
+        ]
+
+    def ledger_api(self) -> mock.MagicMock:
+        """Get a fake ledger api."""
+        ledger_api = mock.MagicMock()
+        ledger_api.api.provider.endpoint_uri = "http://fake-provider"
+        ledger_api.api.eth.block_number = self.block_number
+        ledger_api.api.eth.get_block.side_effect = lambda number: dict(
+            hash=self.block_hashes.get(number, HexBytes(number))
+        )
+        return ledger_api
+
+    def scan(self, **kwargs: Any) -> List[int]:
+        """Scan the `ExecutionSuccess` events and return their blocks."""
+        event = mock.MagicMock(
+            get_logs=lambda fromBlock, toBlock, **_: self.get_logs(fromBlock, toBlock)
+        )
+        with mock.patch.object(
+            GnosisSafeContract,
+            "get_instance",
+            return_value=mock.MagicMock(events=mock.MagicMock(ExecutionSuccess=event)),
+        ):
+            return [
+                entry["blockNumber"]
+                for entry in GnosisSafeContract.scan_events(
+                    self.ledger_api(), SAFE_CONTRACT, "ExecutionSuccess", **kwargs
+                )
+            ]
+
+    def test_scan_windows(self) -> None:
+        """Test that the windows adapt to the provider's limits and are yielded in order."""
+        windows = list(_scan_windows(self.get_logs, 0, 120, window=100))
+        assert [end for end, _ in windows] == sorted(end for end, _ in windows)
+        assert windows[-1][0] == 120
+        assert [
+            entry["blockNumber"] for _, entries in windows for entry in entries
+        ] == [
+            0,
+            5,
+            5,
+            40,
+            99,
+        ]
+        scanned_blocks = sorted(
+            block
+            for start, end in self.scanned_windows
+            for block in range(start, end + 1)
+        )
+        assert scanned_blocks == list(range(121))
+
+    def test_scan_windows_failure(self) -> None:
+        """Test that a window of a single block which fails is not retried."""
+        self.max_window = 0
+        with pytest.raises(ValueError):
+            list(_scan_windows(self.get_logs, 0, 10))
+
+    @pytest.mark.parametrize(
+        "error",
+        (
+            ValueError({"code": -32005, "message": "limit exceeded"}),
+            ValueError(
+                {"code": -32000, "message": "Query returned more than 10000 results"}
+            ),
+            Timeout(),
+        ),
+    )
+    def test_scan_windows_window_errors(self, error: Exception) -> None:
+        """Test that the windows are split on the provider's range or results' limit errors."""
+
+        def get_logs(start: int, end: int) -> List[AttributeDict]:
+            """Fail for the windows which are too large."""
+            if end - start + 1 > self.max_window:
+                raise error
+            return self.get_logs(start, end)
+
+        assert sum(1 for _ in _scan_windows(get_logs, 0, 120, window=100)) > 0
+        assert sorted(
+            block
+            for start, end in self.scanned_windows
+            for block in range(start, end + 1)
+        ) == list(range(121))
+
+    @pytest.mark.parametrize(
+        "error",
+        (
+            ValueError({"code": -32000, "message": "execution reverted"}),
+            ValueError("invalid argument"),
+        ),
+    )
+    def test_scan_windows_other_errors(self, error: Exception) -> None:
+        """Test that the errors which are not caused by the size of the windows are not retried."""
+        get_logs = mock.MagicMock(side_effect=error)
+        with pytest.raises(ValueError):
+            list(_scan_windows(get_logs, 0, 1_000))
+        assert get_logs.call_count <= EVENT_SCAN_WORKERS
+
+    def test_scan_windows_max_splits(self) -> None:
+        """Test that a provider which always fails is only retried a bounded number of times."""
+        get_logs = mock.MagicMock(side_effect=Timeout())
+        with pytest.raises(Timeout):
+            list(_scan_windows(get_logs, 0, 10_000_000, max_splits=8))
+        assert get_logs.call_count <= 8 + 2 * EVENT_SCAN_WORKERS
+
+    def test_scan_events_cache_bounded(self) -> None:
+        """Test that only the most recently used scanned ranges are cached."""
+        with mock.patch.dict(
+            GnosisSafeContract._scanned_events, clear=True
+        ), mock.patch.object(contract_module, "EVENT_SCAN_CACHE_SIZE", 2):
+            for block_number in (10, 20, 30):
+                self.block_number = block_number
+                self.scan(to_block=block_number, argument_filters={"n": block_number})
+            assert [
+                scanned.to_block
+                for scanned in GnosisSafeContract._scanned_events.values()
+            ] == [20, 30]
+
+    def test_scan_events_cache_max_entries(self) -> None:
+        """Test that the ranges with too many entries are not cached."""
+        with mock.patch.dict(
+            GnosisSafeContract._scanned_events, clear=True
+        ), mock.patch.object(contract_module, "EVENT_SCAN_CACHE_MAX_ENTRIES", 4):
+            self.block_number = 30
+            assert self.scan() == [0, 5, 5]
+            assert len(GnosisSafeContract._scanned_events) == 1
+            self.block_number = 120
+            assert self.scan() == [0, 5, 5, 40, 99]
+            assert not GnosisSafeContract._scanned_events
+
+    def test_scan_events_cache_bounded_entries(self) -> None:
+        """Test that the least recently used ranges are evicted while the cached ranges have too many entries in total."""
+        with mock.patch.dict(
+            GnosisSafeContract._scanned_events, clear=True
+        ), mock.patch.object(contract_module, "EVENT_SCAN_CACHE_MAX_ENTRIES", 5):
+            self.block_number = 30
+            for n in range(3):
+                assert self.scan(argument_filters={"n": n}) == [0, 5, 5]
+            assert [
+                json.loads(key[-1])["n"] for key in GnosisSafeContract._scanned_events
+            ] == [2]
+
+    def test_scan_events_block_hash_fetched_once(self) -> None:
+        """Test that the hash of the last scanned block is only fetched once the scan completes."""
+        with mock.patch.dict(
+            GnosisSafeContract._scanned_events, clear=True
+        ), mock.patch.object(
+            GnosisSafeContract, "_get_block_hash", return_value="0x01"
+        ) as get_block_hash:
+            assert self.scan() == [0, 5, 5, 40, 99]
+            assert len(self.scanned_windows) > 1
+            get_block_hash.assert_called_once_with(mock.ANY, self.block_number)
+
+    def test_scan_events_interrupted(self) -> None:
+        """Test that the progress of an interrupted scan is cached."""
+        event = mock.MagicMock(
+            get_logs=lambda fromBlock, toBlock, **_: self.get_logs(fromBlock, toBlock)
+        )
+        with mock.patch.dict(
+            GnosisSafeContract._scanned_events, clear=True
+        ), mock.patch.object(
+            GnosisSafeContract,
+            "get_instance",
+            return_value=mock.MagicMock(events=mock.MagicMock(ExecutionSuccess=event)),
+        ):
+            events = GnosisSafeContract.scan_events(
+                self.ledger_api(), SAFE_CONTRACT, "ExecutionSuccess"
+            )
+            assert next(events)["blockNumber"] == 0
+            events.close()
+            (scanned,) = GnosisSafeContract._scanned_events.values()
+            assert 0 <= scanned.to_block < self.block_number
+            assert scanned.to_block_hash == HexBytes(scanned.to_block).hex()
+
+    def test_scan_events_missing_block_hash(self) -> None:
+        """Test that a range whose last block is not found is not cached."""
+        with mock.patch.dict(GnosisSafeContract._scanned_events, clear=True):
+            ledger_api = self.ledger_api()
+            ledger_api.api.eth.get_block.side_effect = BlockNotFound
+            assert GnosisSafeContract._get_block_hash(ledger_api, 1) == ""
+            key = ("key",)
+            GnosisSafeContract._set_scanned_events(key, ScannedEvents(0, 1, "", []))
+            assert GnosisSafeContract._get_valid_scanned_events(ledger_api, key) is None
+            ledger_api.api.eth.get_block.assert_called_once()
+
+    def test_scan_events_cached(self) -> None:
+        """Test that later scans only scan the new blocks."""
+        with mock.patch.dict(GnosisSafeContract._scanned_events, clear=True):
+            assert self.scan() == [0, 5, 5, 40, 99]
+
+            self.scanned_windows.clear()
+            self.block_number = 160
+            assert self.scan(from_block=10) == [40, 99, 150]
+            assert min(start for start, _ in self.scanned_windows) == 121
+
+            self.scanned_windows.clear()
+            assert self.scan(from_block=hex(5), to_block=50) == [5, 5, 40]
+            assert not self.scanned_windows
+
+    def test_scan_events_prefix(self) -> None:
+        """Test that a range starting before the scanned one only scans the missing blocks."""
+        with mock.patch.dict(GnosisSafeContract._scanned_events, clear=True):
+            assert self.scan(from_block=50) == [99]
+            self.scanned_windows.clear()
+            assert self.scan(from_block=0) == [0, 5, 5, 40, 99]
+            assert max(end for _, end in self.scanned_windows) == 49
+            self.scanned_windows.clear()
+            assert self.scan(from_block=0, to_block=10) == [0, 5, 5]
+            assert not self.scanned_windows
+
+    def test_scan_events_reorg(self) -> None:
+        """Test that the cache is dropped when the last scanned block has changed."""
+        with mock.patch.dict(GnosisSafeContract._scanned_events, clear=True):
+            assert self.scan() == [0, 5, 5, 40, 99]
+            self.scanned_windows.clear()
+            self.block_hashes[self.block_number] = HexBytes("0xdead")
+            assert self.scan() == [0, 5, 5, 40, 99]
+            assert min(start for start, _ in self.scanned_windows) == 0
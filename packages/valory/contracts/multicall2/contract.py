@@ -23,7 +23,7 @@ from typing import Any, Callable, Dict, List, Tuple
 
 from aea.common import JSONLike
 from aea.configurations.base import PublicId
-from aea.contracts.base import Contract
+from aea.contracts.base import Contract, contract_registry
 from aea.crypto.base import LedgerApi
 
 
@@ -147,10 +147,66 @@ class Multicall2Contract(Contract):
         calls = [call[0] for call in calls_and_decoders]
         decoders = [call[1] for call in calls_and_decoders]
         res = instance.functions.aggregate(calls).call()
+        # the block number is returned by the aggregate call itself,
+        # there is no need for an extra round trip to retrieve it
         block_number, call_responses = res[0], res[1]
         decoded_responses = [
             decoder(call_response)
             for decoder, call_response in zip(decoders, call_responses)
         ]
-        block_number = ledger_api.api.eth.block_number
         return block_number, decoded_responses
+
+    @classmethod
+    def get_aggregated_state(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        calls: List[Dict[str, Any]],
+        require_success: bool = False,
+    ) -> JSONLike:
+        """
+        Batch several read-only contract calls into a single 'GET_STATE' request.
+
+        Each call is described by a dictionary with the `contract_id` of a registered contract,
+        the `contract_address` of the targeted instance, the `fn_name` to call and its `args`.
+        The outputs of calls returning a single value are unwrapped, as `web3` does for plain calls.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the multicall address.
+        :param calls: the descriptions of the calls to batch.
+        :param require_success: whether the whole batch should revert if any of the calls fails.
+        :return: the block number and the decoded outputs, in the order of the calls, `None` for failed calls.
+        """
+        calls_and_decoders = [
+            cls.encode_function_call(
+                ledger_api,
+                contract_registry.make(call["contract_id"]).get_instance(
+                    ledger_api, call["contract_address"]
+                ),
+                fn_name=call["fn_name"],
+                args=call.get("args", []),
+            )
+            for call in calls
+        ]
+        instance = cls.get_instance(ledger_api, contract_address)
+        encoded_calls = [call for call, _ in calls_and_decoders]
+        block_number, _, call_responses = instance.functions.tryBlockAndAggregate(
+            require_success, encoded_calls
+        ).call()
+
+        results = [
+            cls._decode_result(decoder, success, return_data)
+            for (_, decoder), (success, return_data) in zip(
+                calls_and_decoders, call_responses
+            )
+        ]
+        return {"block_number": block_number, "results": results}
+
+    @staticmethod
+    def _decode_result(decoder: Callable, success: bool, return_data: bytes) -> Any:
+        """Decode the output of a batched call, unwrapping single values, or get `None` if the call failed."""
+        if not success:
+            _logger.warning(f"Batched call failed with return data {return_data!r}.")
+            return None
+        decoded = decoder(return_data)
+        return decoded[0] if len(decoded) == 1 else list(decoded)
@@ -20,6 +20,7 @@
 """Tests for valory/multicall2 contract."""
 from pathlib import Path
 from typing import Any, Dict, cast
+from unittest import mock
 
 from aea_test_autonomy.base_test_classes.contracts import BaseGanacheContractTest
 from aea_test_autonomy.configurations import DEFAULT_AMOUNT as DEFAULT_ETH_BALANCE
@@ -78,3 +79,48 @@ class TestTokenSettingsFactory(BaseGanacheContractTest):
             assert isinstance(response[0], int)
             actual_funds = response[0]
             assert actual_funds == expected_funds
+
+    def test_get_aggregated_state(self) -> None:
+        """Test get_aggregated_state."""
+        address, _pk = self.key_pairs()[1]
+        call = {
+            "contract_id": str(Multicall2Contract.contract_id),
+            "contract_address": self.contract_address,
+            "fn_name": "getEthBalance",
+            "args": [address],
+        }
+        contract_address = cast(str, self.contract_address)
+        state = self.contract.get_aggregated_state(
+            self.ledger_api, contract_address, [call, call]
+        )
+
+        assert isinstance(state["block_number"], int)
+        assert state["results"] == [DEFAULT_ETH_BALANCE, DEFAULT_ETH_BALANCE]
+
+
+def test_get_aggregated_state_failed_call() -> None:
+    """Test that the failed calls of a batch are reported as `None`."""
+    ledger_api = mock.MagicMock()
+    ledger_api.api.codec.decode.return_value = (1,)
+    multicall_instance = mock.MagicMock()
+    multicall_instance.functions.tryBlockAndAggregate.return_value.call.return_value = (
+        10,
+        b"block_hash",
+        [(True, b"1"), (False, b"")],
+    )
+    call = {
+        "contract_id": str(Multicall2Contract.contract_id),
+        "contract_address": "0x0",
+        "fn_name": "getEthBalance",
+        "args": ["0x0"],
+    }
+    with mock.patch(
+        "packages.valory.contracts.multicall2.contract.contract_registry"
+    ), mock.patch.object(
+        Multicall2Contract, "encode_function_call", return_value=({}, lambda _: (1,))
+    ), mock.patch.object(
+        Multicall2Contract, "get_instance", return_value=multicall_instance
+    ):
+        state = Multicall2Contract.get_aggregated_state(ledger_api, "0x0", [call, call])
+
+    assert state == {"block_number": 10, "results": [1, None]}
@@ -31,6 +31,8 @@ from aea.contracts.base import Contract
 from aea.crypto.base import LedgerApi
 from web3.types import BlockData, EventData, TxReceipt
 
+from packages.valory.contracts.multicall2.contract import Multicall2Contract
+
 
 PUBLIC_ID = PublicId.from_str("valory/service_registry:0.1.0")
 ETHEREUM_IDENTIFIER = "ethereum"
@@ -385,18 +387,38 @@ class ServiceRegistryContract(Contract):
         ledger_api: LedgerApi,
         contract_address: str,
         agent_instances: FrozenSet[str],
+        multicall_address: Optional[str] = None,
     ) -> Dict[str, str]:
         """
         Retrieve a mapping of the given agent instances to their operators.
 
-        Please keep in mind that this method performs a call for each agent instance.
+        Please keep in mind that, unless a multicall address is given, this method performs a call for each agent instance.
+        If a multicall address is given, all the calls are batched in a single `Multicall2.aggregate()` call.
 
         :param ledger_api: the ledger api.
         :param contract_address: the contract address.
         :param agent_instances: the agent instances to be mapped.
+        :param multicall_address: the address of a `Multicall2` contract to batch the calls with.
         :return: a mapping of the given agent instances to their operators.
         """
-        return {
-            agent: cls._get_operator(ledger_api, contract_address, agent)
-            for agent in agent_instances
-        }
+        if multicall_address is None:
+            return {
+                agent: cls._get_operator(ledger_api, contract_address, agent)
+                for agent in agent_instances
+            }
+
+        agents = list(agent_instances)
+        contract_instance = cls.get_instance(ledger_api, contract_address)
+        calls_and_decoders = [
+            Multicall2Contract.encode_function_call(
+                ledger_api,
+                contract_instance,
+                fn_name="mapAgentInstanceOperators",
+                args=[agent],
+            )
+            for agent in agents
+        ]
+        _, operators = Multicall2Contract.aggregate_and_decode(
+            ledger_api, multicall_address, calls_and_decoders
+        )
+        return {agent: operator for agent, (operator,) in zip(agents, operators)}
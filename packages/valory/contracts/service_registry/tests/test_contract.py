@@ -27,6 +27,7 @@ from aea_ledger_ethereum import EthereumCrypto
 from aea_test_autonomy.base_test_classes.contracts import BaseRegistriesContractsTest
 from aea_test_autonomy.docker.base import skip_docker_tests
 
+from packages.valory.contracts.multicall2.contract import Multicall2Contract
 from packages.valory.contracts.service_registry.contract import (
     DEPLOYED_BYTECODE_MD5_HASH_BY_CHAIN_ID,
     EXPECTED_CONTRACT_ADDRESS_BY_CHAIN_ID,
@@ -237,3 +238,30 @@ class TestServiceRegistryContract(BaseServiceRegistryContractTest):
             frozenset(OPERATORS_MAPPING.keys()),
         )
         assert actual_mapping == OPERATORS_MAPPING
+
+
+def test_get_operators_mapping_batched() -> None:
+    """Test that `get_operators_mapping` batches the calls when a multicall address is given."""
+    multicall_address = "0xcA11bde05977b3631167028862bE2a173976CA11"
+    ledger_api = mock.MagicMock()
+    with mock.patch.object(ServiceRegistryContract, "get_instance"), mock.patch.object(
+        Multicall2Contract, "encode_function_call"
+    ) as encode_mock, mock.patch.object(
+        Multicall2Contract,
+        "aggregate_and_decode",
+        return_value=(1, [(OPERATOR,)] * len(AGENT_INSTANCES)),
+    ) as aggregate_mock, mock.patch.object(
+        ServiceRegistryContract, "_get_operator"
+    ) as get_operator_mock:
+        actual_mapping = ServiceRegistryContract.get_operators_mapping(
+            ledger_api,
+            EXPECTED_CONTRACT_ADDRESS_BY_CHAIN_ID[CHAIN_ID],
+            frozenset(AGENT_INSTANCES),
+            multicall_address=multicall_address,
+        )
+
+    assert actual_mapping == OPERATORS_MAPPING
+    assert encode_mock.call_count == len(AGENT_INSTANCES)
+    aggregate_mock.assert_called_once()
+    assert aggregate_mock.call_args[0][1] == multicall_address
+    get_operator_mock.assert_not_called()
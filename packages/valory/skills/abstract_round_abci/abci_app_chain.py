@@ -19,8 +19,8 @@
 
 """This module contains utilities for AbciApps."""
 import logging
-from copy import deepcopy
-from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Type
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple, Type
 
 from aea.exceptions import enforce
 
@@ -38,6 +38,7 @@ _default_logger = logging.getLogger(
 )
 
 AbciAppTransitionMapping = Dict[AppState, AppState]
+AbciAppPath = List[Tuple[AppState, Type[AbciApp], Optional[AppState]]]
 
 
 def check_set_uniqueness(sets: Tuple) -> Optional[Any]:
@@ -51,97 +52,127 @@ def check_set_uniqueness(sets: Tuple) -> Optional[Any]:
     return None
 
 
-def chain(  # pylint: disable=too-many-locals,too-many-statements
-    abci_apps: Tuple[Type[AbciApp], ...],
+def _propagate_available_keys(
+    available_keys: Dict[AppState, Set[str]],
     abci_app_transition_mapping: AbciAppTransitionMapping,
-) -> Type[AbciApp]:
+    state_to_app: Dict[AppState, Type[AbciApp]],
+) -> bool:
     """
-    Concatenate multiple AbciApp types.
+    Propagate the keys available in the DB until a fixed point is reached.
 
-    The consistency checks assume that the first element in
-    abci_apps is the entry-point abci_app (i.e. the associated round of
-    the  initial_behaviour_cls of the AbstractRoundBehaviour in which
-    the chained AbciApp is used is one of the initial_states of the first element.)
+    An initial state is visited again every time the keys available when
+    entering it shrink, so the keys of each initial state only decrease and
+    the iteration terminates.
+
+    :param available_keys: the keys available when entering each reached initial state, updated in place.
+    :param abci_app_transition_mapping: the transition mapping of the chain.
+    :param state_to_app: the abci app of each initial state.
+    :return: whether all the pre-conditions are met.
     """
-    enforce(
-        len(abci_apps) > 1,
-        f"there must be a minimum of two AbciApps to chain, found ({len(abci_apps)})",
-    )
-    enforce(
-        len(set(abci_apps)) == len(abci_apps),
-        "Found multiple occurrences of same Abci App",
-    )
-    non_abstract_abci_apps = [
-        abci_app.__name__ for abci_app in abci_apps if not abci_app.is_abstract()
-    ]
-    enforce(
-        len(non_abstract_abci_apps) == 0,
-        f"found non-abstract AbciApp during chaining: {non_abstract_abci_apps}",
-    )
+    consistent = True
+    queue: Deque[AppState] = deque(available_keys)
+    while queue:
+        initial_state = queue.popleft()
+        app = state_to_app[initial_state]
+        for final_state in app.final_states:
+            if final_state not in abci_app_transition_mapping:
+                continue
+            if final_state not in app.db_post_conditions:
+                consistent = False
+                continue
+            next_initial_state = abci_app_transition_mapping[final_state]
+            next_keys = available_keys[initial_state].union(
+                app.db_post_conditions[final_state]
+            )
+            pre_conditions = state_to_app[next_initial_state].db_pre_conditions.get(
+                next_initial_state
+            )
+            if pre_conditions is None or not pre_conditions.issubset(next_keys):
+                consistent = False
+            keys = available_keys.get(next_initial_state)
+            if keys is None or not keys.issubset(next_keys):
+                available_keys[next_initial_state] = (
+                    next_keys if keys is None else keys.intersection(next_keys)
+                )
+                queue.append(next_initial_state)
+    return consistent
 
-    # Get the apps rounds
-    rounds = tuple(app.get_all_rounds() for app in abci_apps)
-    round_ids = tuple(
-        {round_.auto_round_id() for round_ in app.get_all_rounds()} for app in abci_apps
-    )
 
-    # Ensure there are no common rounds
-    common_round_classes = check_set_uniqueness(rounds)
-    enforce(
-        not common_round_classes,
-        f"rounds in common between abci apps are not allowed ({common_round_classes})",
-    )
+def _propagate_db_conditions(
+    entry_app: Type[AbciApp],
+    abci_app_transition_mapping: AbciAppTransitionMapping,
+    initial_state_to_app: Dict[AppState, Type[AbciApp]],
+) -> Tuple[Dict[AppState, Set[str]], bool]:
+    """
+    Propagate the DB post-conditions through the chained apps.
 
-    # Ensure there are no common round_ids
-    common_round_ids = check_set_uniqueness(round_ids)
-    enforce(
-        not common_round_ids,
-        f"round ids in common between abci apps are not allowed ({common_round_ids})",
-    )
+    For every initial state reachable from the entry-point, the keys which are
+    in the DB on every path leading to it are computed with a fixed-point
+    iteration over the graph of the apps, instead of enumerating the paths.
+    The keys only accumulate along a path, so the keys available on every
+    path are the intersection of the keys available on each of them.
 
-    # Ensure all states in app transition mapping (keys and values) are final states or initial states, respectively.
-    all_final_states = {
-        final_state for app in abci_apps for final_state in app.final_states
+    :param entry_app: the entry-point abci app.
+    :param abci_app_transition_mapping: the transition mapping of the chain.
+    :param initial_state_to_app: the abci app of each mapped initial state.
+    :return: the post-conditions of the final states of the chain and whether all the pre-conditions are met.
+    """
+    entry_state = entry_app.initial_round_cls
+    state_to_app = {**initial_state_to_app, entry_state: entry_app}
+    available_keys: Dict[AppState, Set[str]] = {
+        entry_state: set(entry_app.db_pre_conditions.get(entry_state, set()))
     }
-    all_initial_states = {
-        initial_state for app in abci_apps for initial_state in app.initial_states
-    }.union({app.initial_round_cls for app in abci_apps})
-    for key, value in abci_app_transition_mapping.items():
-        if key not in all_final_states:
-            raise ValueError(
-                f"Found non-final state {key} specified in abci_app_transition_mapping."
-            )
-        if value not in all_initial_states:
-            raise ValueError(
-                f"Found non-initial state {value} specified in abci_app_transition_mapping."
+    consistent = _propagate_available_keys(
+        available_keys, abci_app_transition_mapping, state_to_app
+    )
+
+    # the post-conditions of a final state of the chain are the keys
+    # which are available when entering the app it belongs to
+    db_post_conditions: Dict[AppState, Set[str]] = {}
+    for initial_state, keys in available_keys.items():
+        app = state_to_app[initial_state]
+        for final_state in app.final_states:
+            if final_state in abci_app_transition_mapping:
+                continue
+            db_post_conditions[final_state] = (
+                keys.intersection(db_post_conditions[final_state])
+                if final_state in db_post_conditions
+                else set(keys)
             )
+    return db_post_conditions, consistent
 
-    # Ensure all DB pre- and post-conditions are consistent
-    # Since we know which app is the "entry-point" we can
-    # simply work forward from there through all branches. When
-    # we loop back on an earlier node we stop.
-    initial_state_to_app: Dict[AppState, Type[AbciApp]] = {}
-    for value in abci_app_transition_mapping.values():
-        for app in abci_apps:
-            if value in app.initial_states or value == app.initial_round_cls:
-                initial_state_to_app[value] = app
-                break
+
+def _check_db_conditions_on_paths(
+    entry_app: Type[AbciApp],
+    abci_app_transition_mapping: AbciAppTransitionMapping,
+    initial_state_to_app: Dict[AppState, Type[AbciApp]],
+) -> None:
+    """
+    Check the DB pre- and post-conditions on every path through the chained apps.
+
+    Since we know which app is the "entry-point" we can simply work forward
+    from there through all branches. When we loop back on an earlier node we
+    stop. The number of paths grows exponentially with the number of apps,
+    so this is only used to report the first inconsistent path.
+
+    :param entry_app: the entry-point abci app.
+    :param abci_app_transition_mapping: the transition mapping of the chain.
+    :param initial_state_to_app: the abci app of each mapped initial state.
+    """
 
     def get_paths(
         initial_state: AppState,
         app: Type[AbciApp],
         previous_apps: Optional[List[Type[AbciApp]]] = None,
-    ) -> List[List[Tuple[AppState, Type[AbciApp], Optional[AppState]]]]:
+    ) -> List[AbciAppPath]:
         """Get paths."""
         previous_apps_: List[Type[AbciApp]] = (
-            deepcopy(previous_apps) if previous_apps is not None else []
+            list(previous_apps) if previous_apps is not None else []
         )
-        default: List[List[Tuple[AppState, Type[AbciApp], Optional[AppState]]]] = [
-            [(initial_state, app, None)]
-        ]
+        default: List[AbciAppPath] = [[(initial_state, app, None)]]
         if app.final_states == {}:
             return default  # pragma: no cover
-        paths: List[List[Tuple[AppState, Type[AbciApp], Optional[AppState]]]] = []
+        paths: List[AbciAppPath] = []
         for final_state in app.final_states:
             element: Tuple[AppState, Type[AbciApp], Optional[AppState]] = (
                 initial_state,
@@ -164,10 +195,7 @@ def chain(  # pylint: disable=too-many-locals,too-many-statements
                 paths.append([element] + path)
         return paths if paths else default
 
-    all_paths: List[
-        List[Tuple[AppState, Type[AbciApp], Optional[AppState]]]
-    ] = get_paths(abci_apps[0].initial_round_cls, abci_apps[0])
-    new_db_post_conditions: Dict[AppState, Set[str]] = {}
+    all_paths = get_paths(entry_app.initial_round_cls, entry_app)
     for path in all_paths:
         current_initial_state, current_app, current_final_state = path[0]
         accumulated_post_conditions: Set[str] = current_app.db_pre_conditions.get(
@@ -201,8 +229,88 @@ def chain(  # pylint: disable=too-many-locals,too-many-statements
             current_app = next_app
             current_final_state = next_final_state
 
-        if current_final_state is not None:
-            new_db_post_conditions[current_final_state] = accumulated_post_conditions
+
+def chain(  # pylint: disable=too-many-locals,too-many-statements
+    abci_apps: Tuple[Type[AbciApp], ...],
+    abci_app_transition_mapping: AbciAppTransitionMapping,
+) -> Type[AbciApp]:
+    """
+    Concatenate multiple AbciApp types.
+
+    The consistency checks assume that the first element in
+    abci_apps is the entry-point abci_app (i.e. the associated round of
+    the  initial_behaviour_cls of the AbstractRoundBehaviour in which
+    the chained AbciApp is used is one of the initial_states of the first element.)
+    """
+    enforce(
+        len(abci_apps) > 1,
+        f"there must be a minimum of two AbciApps to chain, found ({len(abci_apps)})",
+    )
+    enforce(
+        len(set(abci_apps)) == len(abci_apps),
+        "Found multiple occurrences of same Abci App",
+    )
+    non_abstract_abci_apps = [
+        abci_app.__name__ for abci_app in abci_apps if not abci_app.is_abstract()
+    ]
+    enforce(
+        len(non_abstract_abci_apps) == 0,
+        f"found non-abstract AbciApp during chaining: {non_abstract_abci_apps}",
+    )
+
+    # Get the apps rounds
+    rounds = tuple(app.get_all_rounds() for app in abci_apps)
+    round_ids = tuple(
+        {round_.auto_round_id() for round_ in app.get_all_rounds()} for app in abci_apps
+    )
+
+    # Ensure there are no common rounds
+    common_round_classes = check_set_uniqueness(rounds)
+    enforce(
+        not common_round_classes,
+        f"rounds in common between abci apps are not allowed ({common_round_classes})",
+    )
+
+    # Ensure there are no common round_ids
+    common_round_ids = check_set_uniqueness(round_ids)
+    enforce(
+        not common_round_ids,
+        f"round ids in common between abci apps are not allowed ({common_round_ids})",
+    )
+
+    # Ensure all states in app transition mapping (keys and values) are final states or initial states, respectively.
+    all_final_states = {
+        final_state for app in abci_apps for final_state in app.final_states
+    }
+    all_initial_states = {
+        initial_state for app in abci_apps for initial_state in app.initial_states
+    }.union({app.initial_round_cls for app in abci_apps})
+    for key, value in abci_app_transition_mapping.items():
+        if key not in all_final_states:
+            raise ValueError(
+                f"Found non-final state {key} specified in abci_app_transition_mapping."
+            )
+        if value not in all_initial_states:
+            raise ValueError(
+                f"Found non-initial state {value} specified in abci_app_transition_mapping."
+            )
+
+    # Ensure all DB pre- and post-conditions are consistent
+    initial_state_to_app: Dict[AppState, Type[AbciApp]] = {}
+    for value in abci_app_transition_mapping.values():
+        for app in abci_apps:
+            if value in app.initial_states or value == app.initial_round_cls:
+                initial_state_to_app[value] = app
+                break
+
+    new_db_post_conditions, consistent = _propagate_db_conditions(
+        abci_apps[0], abci_app_transition_mapping, initial_state_to_app
+    )
+    if not consistent:
+        # enumerate the paths to report the first inconsistent one
+        _check_db_conditions_on_paths(
+            abci_apps[0], abci_app_transition_mapping, initial_state_to_app
+        )
 
     # Warn about events duplicated in multiple apps
     app_to_events = {app: app.get_all_events() for app in abci_apps}
@@ -30,7 +30,7 @@ import sys
 import textwrap
 import uuid
 from abc import ABC, ABCMeta, abstractmethod
-from collections import Counter, deque
+from collections import Counter, OrderedDict, deque
 from copy import copy, deepcopy
 from dataclasses import asdict, astuple, dataclass, field, is_dataclass
 from enum import Enum
@@ -43,6 +43,7 @@ from typing import (
     Dict,
     FrozenSet,
     Generic,
+    Iterable,
     Iterator,
     List,
     Mapping,
@@ -73,6 +74,7 @@ from packages.valory.protocols.abci.custom_types import (
 )
 from packages.valory.skills.abstract_round_abci.utils import (
     consensus_threshold,
+    freeze,
     is_json_serializable,
 )
 
@@ -93,6 +95,7 @@ BLOCKS_STALL_TOLERANCE = 60
 SERIOUS_OFFENCE_ENUM_MIN = 1000
 NUMBER_OF_BLOCKS_TRACKED = 10_000
 NUMBER_OF_ROUNDS_TRACKED = 50
+NUMBER_OF_DELIVERED_TXS_TRACKED = 1_000
 
 DONE_EVENT_ATTRIBUTE = "done_event"
 NO_MAJORITY_EVENT_ATTRIBUTE = "no_majority_event"
@@ -289,6 +292,8 @@ class Transaction(ABC):
 class Block:  # pylint: disable=too-few-public-methods
     """Class to represent (a subset of) data of a Tendermint block."""
 
+    __slots__ = ("header", "_transactions")
+
     def __init__(
         self,
         header: Header,
@@ -314,11 +319,26 @@ class Blockchain:
     Class to represent a (naive) Tendermint blockchain.
 
     The consistency of the data in the blocks is guaranteed by Tendermint.
+
+    By default, all the blocks are kept in memory until the blockchain is reset.
+    If `max_blocks` is set, only the last `max_blocks` blocks are retained, in a ring buffer,
+    while the height and the length keep accounting for the evicted blocks.
+    Setting it to `1` retains only the last block, which is all that is needed for `last_block` and `height`.
     """
 
-    def __init__(self, height_offset: int = 0, is_init: bool = True) -> None:
+    def __init__(
+        self,
+        height_offset: int = 0,
+        is_init: bool = True,
+        max_blocks: Optional[int] = None,
+    ) -> None:
         """Initialize the blockchain."""
-        self._blocks: List[Block] = []
+        if max_blocks is not None and max_blocks < 1:
+            raise ValueError(
+                f"`max_blocks` must be a positive integer, got {max_blocks}"
+            )
+        self._blocks: Deque[Block] = deque(maxlen=max_blocks)
+        self._n_evicted = 0
         self._height_offset = height_offset
         self._is_init = is_init
 
@@ -327,6 +347,11 @@ class Blockchain:
         """Returns true if the blockchain is initialized."""
         return self._is_init
 
+    @property
+    def max_blocks(self) -> Optional[int]:
+        """Get the maximum number of retained blocks, `None` if unbounded."""
+        return self._blocks.maxlen
+
     def add_block(self, block: Block) -> None:
         """Add a block to the list."""
         expected_height = self.height + 1
@@ -340,6 +365,9 @@ class Blockchain:
             raise AddBlockError(
                 f"expected height {expected_height}, got {actual_height}"
             )
+        if len(self._blocks) == self._blocks.maxlen:
+            # the oldest block is going to be dropped by the ring buffer
+            self._n_evicted += 1
         self._blocks.append(block)
 
     @property
@@ -356,12 +384,12 @@ class Blockchain:
 
     @property
     def length(self) -> int:
-        """Get the blockchain length."""
-        return len(self._blocks)
+        """Get the blockchain length, including the blocks which are no longer retained."""
+        return len(self._blocks) + self._n_evicted
 
     @property
     def blocks(self) -> Tuple[Block, ...]:
-        """Get the blocks."""
+        """Get the retained blocks."""
         return tuple(self._blocks)
 
     @property
@@ -422,7 +450,7 @@ class BlockBuilder:
         )
 
 
-class AbciAppDB:
+class AbciAppDB:  # pylint: disable=too-many-instance-attributes
     """Class to represent all data replicated across agents.
 
     This class stores all the data in self._data. Every entry on this dict represents an optional "period" within your app execution.
@@ -497,6 +525,24 @@ class AbciAppDB:
     * the in-built `copy` module is used, which automatically detects if an item is immutable and skips copying it.
     For more information take a look at the `_deepcopy_atomic` method and its usage:
     https://github.com/python/cpython/blob/3.10/Lib/copy.py#L182-L183
+
+    If `immutable_values` is enabled, the values are instead frozen once, when they are inserted into the database,
+    using recursively immutable containers (see `freeze`), and they are returned by reference without any copying.
+    The frozen containers compare equal to, and are serialized the same way as, the original ones,
+    but any attempt to modify them raises a `TypeError`.
+
+    # Hashing
+    -----------------------------------
+    By default, the hash of the database is the sha256 of its full serialization, which is recomputed on every call.
+    If `incremental_hash` is enabled, a Merkle-style hash is used instead:
+
+        key digest = sha256(json history of the key)
+        period digest = sha256(sha256(key_0) || key digest_0 || ... ) for the sorted keys of the period
+        root = sha256(sha256(index_0) || period digest_0 || ... || sha256(slashing config)) for the sorted periods
+
+    The key and period digests are cached and only invalidated by the operations which modify them,
+    i.e., `update`, `create`, `cleanup`, `cleanup_current_histories` and `sync`.
+    The two modes produce different hashes, therefore all the agents of a service need to use the same one.
     """
 
     DB_DATA_KEY = "db_data"
@@ -517,6 +563,8 @@ class AbciAppDB:
         setup_data: Dict[str, List[Any]],
         cross_period_persisted_keys: Optional[FrozenSet[str]] = None,
         logger: Optional[logging.Logger] = None,
+        incremental_hash: bool = False,
+        immutable_values: bool = False,
     ) -> None:
         """Initialize the AbciApp database.
 
@@ -527,14 +575,21 @@ class AbciAppDB:
         :param setup_data: the setup data
         :param cross_period_persisted_keys: data keys that will be kept after a new period starts
         :param logger: the logger of the abci app
+        :param incremental_hash: whether to use the incremental Merkle-style hash instead of the full serialization one
+        :param immutable_values: whether to freeze the values on insert and return them without copying
         """
         self.logger = logger or _logger
         AbciAppDB._check_data(setup_data)
-        self._setup_data = deepcopy(setup_data)
+        self._immutable_values = immutable_values
+        self._setup_data = self._copy_histories(setup_data)
         self._data: Dict[int, Dict[str, List[Any]]] = {
             RESET_COUNT_START: self.setup_data  # the key represents the reset index
         }
         self._round_count = ROUND_COUNT_DEFAULT  # ensures first round is indexed at 0!
+        self._incremental_hash = incremental_hash
+        # cached digests used by the incremental hash, a missing entry means that it needs to be recomputed
+        self._key_digests: Dict[int, Dict[str, bytes]] = {}
+        self._period_digests: Dict[int, bytes] = {}
 
         self._cross_period_persisted_keys = self.default_cross_period_keys.union(
             cross_period_persisted_keys or frozenset()
@@ -581,7 +636,9 @@ class AbciAppDB:
         :return: the setup_data
         """
         # do not return data if no value has been set
-        return {k: v for k, v in deepcopy(self._setup_data).items() if len(v)}
+        return {
+            k: v for k, v in self._copy_histories(self._setup_data).items() if len(v)
+        }
 
     @staticmethod
     def _check_data(data: Any) -> None:
@@ -618,10 +675,36 @@ class AbciAppDB:
         """Keys in the database which are persistent across periods."""
         return self._cross_period_persisted_keys
 
+    @property
+    def incremental_hash(self) -> bool:
+        """Whether the incremental hash is used."""
+        return self._incremental_hash
+
+    @property
+    def immutable_values(self) -> bool:
+        """Whether the values are frozen on insert and returned without copying."""
+        return self._immutable_values
+
+    def _copy_value(self, value: Any) -> Any:
+        """Copy a value, or freeze it if the values are immutable."""
+        if self._immutable_values:
+            return freeze(value)
+        return deepcopy(value)
+
+    def _copy_histories(self, data: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Copy the given histories, freezing their values if the values are immutable."""
+        if self._immutable_values:
+            return {
+                key: [freeze(value) for value in history]
+                for key, history in data.items()
+            }
+        return deepcopy(data)
+
     def get(self, key: str, default: Any = VALUE_NOT_PROVIDED) -> Optional[Any]:
         """Given a key, get its last for the current reset index."""
         if key in self._data[self.reset_index]:
-            return deepcopy(self._data[self.reset_index][key][-1])
+            value = self._data[self.reset_index][key][-1]
+            return value if self._immutable_values else deepcopy(value)
         if default != VALUE_NOT_PROVIDED:
             return default
         raise ValueError(
@@ -632,6 +715,15 @@ class AbciAppDB:
         """Get a value from the data dictionary and raise if it is None."""
         return self.get(key)
 
+    def get_history(self, key: str) -> List[Any]:
+        """Given a key, get all its values for the current reset index, from the oldest to the latest."""
+        if key in self._data[self.reset_index]:
+            history = self._data[self.reset_index][key]
+            return list(history) if self._immutable_values else deepcopy(history)
+        raise ValueError(
+            f"'{key}' field is not set for this period [{self.reset_index}]."
+        )
+
     @staticmethod
     def validate(data: Any) -> None:
         """Validate if the given data are json serializable and therefore can be accepted into the database.
@@ -650,9 +742,11 @@ class AbciAppDB:
         self.validate(kwargs)
 
         # Append new data to the key history
-        data = self._data[self.reset_index]
-        for key, value in deepcopy(kwargs).items():
-            data.setdefault(key, []).append(value)
+        reset_index = self.reset_index
+        data = self._data[reset_index]
+        for key, value in kwargs.items():
+            data.setdefault(key, []).append(self._copy_value(value))
+        self._invalidate_digests(reset_index, kwargs.keys())
 
     def create(self, **kwargs: Any) -> None:
         """Add a new entry to the data.
@@ -679,14 +773,16 @@ class AbciAppDB:
     def _create_from_keys(self, **kwargs: Any) -> None:
         """Add a new entry to the data using the provided key-value pairs."""
         AbciAppDB._check_data(kwargs)
-        self._data[self.reset_index + 1] = deepcopy(kwargs)
+        reset_index = self.reset_index + 1
+        self._data[reset_index] = self._copy_histories(kwargs)
+        self._invalidate_digests(reset_index)
 
     def get_latest_from_reset_index(self, reset_index: int) -> Dict[str, Any]:
         """Get the latest key-value pairs from the data dictionary for the specified period."""
-        return {
-            key: values[-1]
-            for key, values in deepcopy(self._data.get(reset_index, {})).items()
-        }
+        data = self._data.get(reset_index, {})
+        if self._immutable_values:
+            return {key: values[-1] for key, values in data.items()}
+        return {key: values[-1] for key, values in deepcopy(data).items()}
 
     def get_latest(self) -> Dict[str, Any]:
         """Get the latest key-value pairs from the data dictionary for the current period."""
@@ -717,6 +813,16 @@ class AbciAppDB:
             key: self._data[key]
             for key in sorted(self._data.keys())[-cleanup_history_depth:]
         }
+        self._key_digests = {
+            index: digests
+            for index, digests in self._key_digests.items()
+            if index in self._data
+        }
+        self._period_digests = {
+            index: digest
+            for index, digest in self._period_digests.items()
+            if index in self._data
+        }
         if cleanup_history_depth_current:
             self.cleanup_current_histories(cleanup_history_depth_current)
 
@@ -725,10 +831,12 @@ class AbciAppDB:
         cleanup_history_depth_current = max(
             cleanup_history_depth_current, MIN_HISTORY_DEPTH
         )
-        self._data[self.reset_index] = {
+        reset_index = self.reset_index
+        self._data[reset_index] = {
             key: history[-cleanup_history_depth_current:]
-            for key, history in self._data[self.reset_index].items()
+            for key, history in self._data[reset_index].items()
         }
+        self._invalidate_digests(reset_index)
 
     def serialize(self) -> str:
         """Serialize the data of the database to a string."""
@@ -778,11 +886,67 @@ class AbciAppDB:
             ) from exc
 
         self._check_data(dict(tuple(db_data.values())[0]))
+        if self._immutable_values:
+            db_data = {
+                index: self._copy_histories(period_data)
+                for index, period_data in db_data.items()
+            }
         self._data = db_data
         self.slashing_config = slashing_config
+        self._key_digests = {}
+        self._period_digests = {}
+
+    def _invalidate_digests(
+        self, reset_index: int, keys: Optional[Iterable[str]] = None
+    ) -> None:
+        """Invalidate the cached digests of the given keys of a period, or of the whole period if no keys are given."""
+        self._period_digests.pop(reset_index, None)
+        if keys is None:
+            self._key_digests.pop(reset_index, None)
+            return
+        key_digests = self._key_digests.get(reset_index, {})
+        for key in keys:
+            key_digests.pop(key, None)
+
+    @staticmethod
+    def _digest(data: Any) -> bytes:
+        """Get the sha256 digest of the deterministic json serialization of the given data."""
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).digest()
+
+    def _period_digest(self, reset_index: int) -> bytes:
+        """Get the digest of a period, recomputing only the digests of the keys which have been invalidated."""
+        digest = self._period_digests.get(reset_index, None)
+        if digest is not None:
+            return digest
+
+        key_digests = self._key_digests.setdefault(reset_index, {})
+        sha256 = hashlib.sha256()
+        for key, history in sorted(self._data[reset_index].items()):
+            key_digest = key_digests.get(key, None)
+            if key_digest is None:
+                key_digest = key_digests[key] = self._digest(history)
+            sha256.update(self._digest(key))
+            sha256.update(key_digest)
+
+        digest = self._period_digests[reset_index] = sha256.digest()
+        return digest
+
+    def _merkle_hash(self) -> bytes:
+        """Create a Merkle-style hash of the data, reusing the digests of the unmodified periods and keys."""
+        sha256 = hashlib.sha256()
+        for reset_index in sorted(self._data):
+            sha256.update(self._digest(reset_index))
+            sha256.update(self._period_digest(reset_index))
+        sha256.update(self._digest(self.slashing_config))
+        return sha256.digest()
 
     def hash(self) -> bytes:
         """Create a hash of the data."""
+        if self._incremental_hash:
+            hash_ = self._merkle_hash()
+            self.logger.debug(f"root hash: {hash_.hex()}")
+            return hash_
+
         # Compute the sha256 hash of the serialized data
         sha256 = hashlib.sha256()
         data = self.serialize()
@@ -3247,9 +3411,15 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
         WAITING_FOR_DELIVER_TX = "waiting_for_deliver_tx"
         WAITING_FOR_COMMIT = "waiting_for_commit"
 
-    def __init__(self, context: SkillContext, abci_app_cls: Type[AbciApp]):
+    def __init__(
+        self,
+        context: SkillContext,
+        abci_app_cls: Type[AbciApp],
+        max_blocks: Optional[int] = None,
+    ):
         """Initialize the round."""
-        self._blockchain = Blockchain()
+        self._max_blocks = max_blocks
+        self._blockchain = Blockchain(max_blocks=max_blocks)
         self._syncing_up = True
         self._context = context
         self._block_construction_phase = (
@@ -3265,6 +3435,9 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
         self._last_round_transition_tm_height: Optional[int] = None
         self._tm_height: Optional[int] = None
         self._block_stall_deadline: Optional[datetime.datetime] = None
+        # whether the recently delivered transactions succeeded, by their Tendermint hash
+        self._delivered_txs: "OrderedDict[str, bool]" = OrderedDict()
+        self._n_delivered_txs = 0
         self._terminating_round_called: bool = False
         # a mapping of the validators' addresses to their agent addresses
         # we create a mapping to avoid calculating the agent address from the validator address every time we need it
@@ -3457,7 +3630,7 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
     def last_timestamp(self) -> datetime.datetime:
         """Get the last timestamp."""
         last_timestamp = (
-            self._blockchain.blocks[-1].timestamp
+            self._blockchain.last_block.timestamp
             if self._blockchain.length != 0
             else None
         )
@@ -3540,6 +3713,34 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
         """Set Tendermint's current height."""
         self._tm_height = _tm_height
 
+    @property
+    def n_delivered_txs(self) -> int:
+        """Get the number of transactions delivered since the round sequence was created."""
+        return self._n_delivered_txs
+
+    def add_delivered_tx(self, tx_hash: str, is_ok: bool) -> None:
+        """
+        Keep track of a delivered transaction.
+
+        Only the last `NUMBER_OF_DELIVERED_TXS_TRACKED` transactions are kept.
+
+        :param tx_hash: the Tendermint hash of the transaction, i.e., the uppercase hex of its sha256 digest
+        :param is_ok: whether the transaction was delivered successfully
+        """
+        self._delivered_txs[tx_hash] = is_ok
+        self._n_delivered_txs += 1
+        if len(self._delivered_txs) > NUMBER_OF_DELIVERED_TXS_TRACKED:
+            self._delivered_txs.popitem(last=False)
+
+    def get_delivered_tx(self, tx_hash: str) -> Optional[bool]:
+        """
+        Get whether a transaction was delivered successfully.
+
+        :param tx_hash: the Tendermint hash of the transaction
+        :return: whether the transaction was delivered successfully, `None` if it has not been delivered recently
+        """
+        return self._delivered_txs.get(tx_hash.upper())
+
     @property
     def block_stall_deadline_expired(self) -> bool:
         """Get if the deadline for not having received any begin block requests from the Tendermint node has expired."""
@@ -3556,7 +3757,7 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
     def init_chain(self, initial_height: int) -> None:
         """Init chain."""
         # reduce `initial_height` by 1 to get block count offset as per Tendermint protocol
-        self._blockchain = Blockchain(initial_height - 1)
+        self._blockchain = Blockchain(initial_height - 1, max_blocks=self._max_blocks)
 
     def _track_tm_offences(
         self, evidences: Evidences, last_commit_info: LastCommitInfo
@@ -3729,7 +3930,7 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
             self._block_construction_phase = (
                 RoundSequence._BlockConstructionState.WAITING_FOR_BEGIN_BLOCK
             )
-        self._blockchain = Blockchain(is_init=is_init)
+        self._blockchain = Blockchain(is_init=is_init, max_blocks=self._max_blocks)
 
     def _get_round_result(
         self,
@@ -3839,6 +4040,100 @@ class RoundSequence:  # pylint: disable=too-many-instance-attributes
             )
         self.abci_app.schedule_round(restart_from_round_cls)
 
+    def serialize_state(self) -> bytes:
+        """
+        Serialize the state which is required in order to bootstrap an agent at the current height.
+
+        This includes the database, the offence status and the current round, and is meant to be used for state-sync
+        snapshots, which should be taken right after a round transition, as the payloads of a round are not included.
+
+        :return: the serialized state.
+        """
+        db = self.abci_app.synchronized_data.db
+        last_round_transition_timestamp = (
+            self._last_round_transition_timestamp.isoformat()
+            if self._last_round_transition_timestamp is not None
+            else None
+        )
+        state = {
+            "height": self.height,
+            "tm_height": self._tm_height,
+            "round_count": db.round_count,
+            "current_round_id": self.current_round_id,
+            "last_round_transition_timestamp": last_round_transition_timestamp,
+            "last_round_transition_height": self._last_round_transition_height,
+            "last_round_transition_tm_height": self._last_round_transition_tm_height,
+            "slashing_enabled": self._slashing_enabled,
+            "offence_status": json.dumps(
+                self._offence_status, cls=OffenseStatusEncoder, sort_keys=True
+            ),
+            "db": db.serialize(),
+        }
+        return json.dumps(state, sort_keys=True).encode("utf-8")
+
+    def load_state(self, serialized_state: bytes) -> None:
+        """
+        Load a state which has been serialized using `serialize_state`, e.g., by a peer.
+
+        The blockchain continues from the height of the serialized state, and the round in which the state was
+        serialized is scheduled again.
+
+        :param serialized_state: the serialized state.
+        :raises ABCIAppInternalError: if the given state cannot be loaded.
+        """
+        try:
+            state = json.loads(serialized_state)
+            height = state["height"]
+            current_round_id = state["current_round_id"]
+            serialized_db_state = state["db"]
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError) as exc:
+            raise ABCIAppInternalError(
+                f"Could not load the serialized state: {exc}"
+            ) from exc
+
+        round_id_to_cls = {
+            cls.auto_round_id(): cls for cls in self.abci_app.transition_function
+        }
+        round_cls = round_id_to_cls.get(current_round_id, None)
+        if current_round_id is not None and round_cls is None:
+            raise ABCIAppInternalError(
+                f"Cannot load the serialized state. Found the unknown round id {current_round_id}, "
+                f"but the app's transition function has the following round ids: {set(round_id_to_cls.keys())}."
+            )
+
+        db = self.abci_app.synchronized_data.db
+        db.sync(serialized_db_state)
+        self._reset_to_default_params()
+        self._offence_status = json.loads(
+            state.get("offence_status", "{}"), cls=OffenseStatusDecoder
+        )
+        self._slashing_enabled = state.get("slashing_enabled", False)
+        self._blockchain = Blockchain(height_offset=height, max_blocks=self._max_blocks)
+        self._block_construction_phase = (
+            RoundSequence._BlockConstructionState.WAITING_FOR_BEGIN_BLOCK
+        )
+        self._tm_height = state.get("tm_height", None)
+        last_round_transition_timestamp = state.get(
+            "last_round_transition_timestamp", None
+        )
+        if last_round_transition_timestamp is not None:
+            self._last_round_transition_timestamp = datetime.datetime.fromisoformat(
+                last_round_transition_timestamp
+            )
+        self._last_round_transition_height = state.get(
+            "last_round_transition_height", 0
+        )
+        self._last_round_transition_tm_height = state.get(
+            "last_round_transition_tm_height", None
+        )
+        self._last_round_transition_root_hash = self.root_hash
+
+        self.abci_app.cleanup_timeouts()
+        if round_cls is not None:
+            # scheduling the round increments the round count
+            db.round_count = state.get("round_count", ROUND_COUNT_DEFAULT) - 1
+            self.abci_app.schedule_round(round_cls)
+
 
 @dataclass(frozen=True)
 class PendingOffencesPayload(BaseTxPayload):
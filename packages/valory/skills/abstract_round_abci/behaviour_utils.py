@@ -26,6 +26,7 @@ import json
 import pprint
 import re
 import sys
+import time
 from abc import ABC, ABCMeta, abstractmethod
 from enum import Enum
 from functools import partial
@@ -36,6 +37,8 @@ from typing import (
     Generator,
     List,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Type,
     Union,
@@ -63,6 +66,7 @@ from packages.valory.connections.ipfs.connection import PUBLIC_ID as IPFS_CONNEC
 from packages.valory.connections.p2p_libp2p_client.connection import (
     PUBLIC_ID as P2P_LIBP2P_CLIENT_PUBLIC_ID,
 )
+from packages.valory.contracts.multicall2.contract import Multicall2Contract
 from packages.valory.contracts.service_registry.contract import (  # noqa: F401  # pylint: disable=unused-import
     ServiceRegistryContract,
 )
@@ -138,6 +142,30 @@ class BaseBehaviourInternalError(Exception):
         super().__init__("internal error: " + message, *args)
 
 
+class _WakeUpCondition:  # pylint: disable=too-few-public-methods
+    """The wake-up conditions of a suspended execution, see `AsyncBehaviour.wait_for_wake_up`."""
+
+    __slots__ = ("deadline", "token", "token_value")
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        token: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Initialize the wake-up condition, recording the current value of the token."""
+        self.deadline = deadline
+        self.token = token
+        self.token_value = None if token is None else token()
+
+    def is_met(self) -> bool:
+        """Check whether the deadline has elapsed or the token has changed."""
+        if self.deadline is None and self.token is None:
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return True
+        return self.token is not None and self.token() != self.token_value
+
+
 class AsyncBehaviour(ABC):
     """
     MixIn behaviour class that support limited asynchronous programming.
@@ -166,6 +194,9 @@ class AsyncBehaviour(ABC):
         self.__message: Any = None
         self.__setup_called: bool = False
 
+        # the wake-up condition of a suspended execution, see `wait_for_wake_up`
+        self.__wake_up: Optional[_WakeUpCondition] = None
+
     @abstractmethod
     def async_act(self) -> Generator:
         """Do the act, supporting asynchronous execution."""
@@ -199,6 +230,11 @@ class AsyncBehaviour(ABC):
         """Check whether the behaviour has stopped."""
         return self.__stopped
 
+    @property
+    def is_suspended(self) -> bool:
+        """Check whether the execution is suspended until one of its wake-up conditions is met."""
+        return self.__wake_up is not None and not self.__wake_up.is_met()
+
     def __get_generator_act(self) -> Generator:
         """Get the _generator_act."""
         if self.__generator_act is None:
@@ -249,23 +285,44 @@ class AsyncBehaviour(ABC):
                 raise TimeoutException()
             yield
 
+    def wait_for_wake_up(
+        self,
+        deadline: Optional[float] = None,
+        token: Optional[Callable[[], Any]] = None,
+    ) -> Generator[None, None, None]:
+        """
+        Suspend the execution until a deadline elapses or a token changes.
+
+        While the execution is suspended, `act` does not resume the `async_act` generator,
+        so an idle behaviour costs a single check per tick instead of a run through its generators.
+        The events which change a token should call `wake_up`, so that the execution is resumed
+        as soon as they happen instead of on the next tick. Deadlines are only checked on the ticks.
+        If no wake-up condition is given, the execution is resumed on the next tick.
+
+        :param deadline: the `time.monotonic` time to wake up at
+        :param token: a callable whose return value wakes the execution up when it changes, e.g., the round height
+        :yield: None
+        """
+        self.__wake_up = _WakeUpCondition(deadline, token)
+        try:
+            yield
+        finally:
+            self.__wake_up = None
+
     def sleep(self, seconds: float) -> Any:
         """
         Delay execution for a given number of seconds.
 
         The argument may be a floating point number for subsecond precision.
         This is a local method that does not depend on the global clock, so the
-        usage of datetime.now() is acceptable here.
+        usage of the local monotonic clock is acceptable here.
 
         :param seconds: the seconds
         :yield: None
         """
-        deadline = datetime.datetime.now() + datetime.timedelta(0, seconds)
-
-        def _wait_until() -> bool:
-            return datetime.datetime.now() > deadline
-
-        yield from self.wait_for_condition(_wait_until)
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            yield from self.wait_for_wake_up(deadline=deadline)
 
     def wait_for_message(
         self,
@@ -275,7 +332,8 @@ class AsyncBehaviour(ABC):
         """
         Wait for message.
 
-        Care must be taken. This method does not handle concurrent requests.
+        Care must be taken. This method does not handle concurrent requests,
+        use `BaseBehaviour.send_requests` for those.
         Use directly after a request is being sent.
         This is a local method that does not depend on the global clock,
         so the usage of datetime.now() is acceptable here.
@@ -319,6 +377,18 @@ class AsyncBehaviour(ABC):
             self.__handle_waiting_for_message()
             return
         enforce(self.__state == self.AsyncState.RUNNING, "not in 'RUNNING' state")
+        if self.is_suspended:
+            return
+        self.__handle_tick()
+
+    def wake_up(self) -> None:
+        """Resume a suspended execution right away if one of its wake-up conditions is met, instead of on the next tick."""
+        if (
+            self.__state != self.AsyncState.RUNNING
+            or self.__wake_up is None
+            or not self.__wake_up.is_met()
+        ):
+            return
         self.__handle_tick()
 
     def stop(self) -> None:
@@ -667,9 +737,15 @@ class BaseBehaviour(
                 f"Should be in matching round ({round_id}) or last round ({self.round_sequence.last_round_id}), "
                 f"actual round {self.round_sequence.current_round_id}!"
             )
-        yield from self.wait_for_condition(
-            partial(self.check_round_height_has_changed, round_height), timeout=timeout
-        )
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # the execution is only resumed when the round sequence transitions to a new round, or on timeout
+        while not self.check_round_height_has_changed(round_height):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutException()
+            yield from self.wait_for_wake_up(
+                deadline=deadline,
+                token=lambda: self.round_sequence.current_round_height,
+            )
 
     def wait_from_last_timestamp(self, seconds: float) -> Any:
         """
@@ -687,11 +763,11 @@ class BaseBehaviour(
         deadline = self.round_sequence.abci_app.last_timestamp + datetime.timedelta(
             seconds=seconds
         )
-
-        def _wait_until() -> bool:
-            return datetime.datetime.now() > deadline
-
-        yield from self.wait_for_condition(_wait_until)
+        wake_up_at = (
+            time.monotonic() + (deadline - datetime.datetime.now()).total_seconds()
+        )
+        while datetime.datetime.now() <= deadline:
+            yield from self.wait_for_wake_up(deadline=wake_up_at)
 
     def is_done(self) -> bool:
         """Check whether the behaviour is done."""
@@ -818,6 +894,8 @@ class BaseBehaviour(
         _wait_until_transaction_delivered:
             AbstractRoundAbci skill -> (HttpMessage | REQUEST) -> Http client connection
             Http client connection -> (HttpMessage | RESPONSE) -> AbstractRoundAbci skill
+            or, if `use_tx_delivery_events` is set:
+            Tendermint node -> (AbciMessage | REQUEST_DELIVER_TX) -> AbstractRoundAbci skill
 
         :param: payload: the payload to send
         :param: resetting: flag indicating if we are resetting Tendermint nodes in this round.
@@ -1350,6 +1428,130 @@ class BaseBehaviour(
         response = yield from self.wait_for_message(timeout=timeout)
         return response
 
+    def send_requests(
+        self,
+        requests: Sequence[Tuple[Message, Dialogue]],
+        min_responses: Optional[int] = None,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Sequence[Optional[float]]] = None,
+    ) -> Generator[None, None, List[Optional[Message]]]:
+        """
+        Dispatch several requests at once and wait for their responses.
+
+        Unlike `wait_for_message`, which handles a single request at a time, all the requests are in-flight
+        concurrently, so the total waiting time is roughly the one of the slowest request instead of the sum.
+        The requests can be built with `_build_http_request_message`, `_build_ledger_api_request`,
+        `_build_contract_api_request` or `_build_ipfs_get_file_req`.
+
+        :param requests: the request messages and their dialogues.
+        :param min_responses: resume once this many responses have arrived. Defaults to all of them.
+        :param timeout: seconds to wait for the responses. Requests that do not get a response in time are given `None`.
+        :param timeouts: seconds to wait for the response of each request, `None` for no timeout of its own.
+            A request whose timeout elapses is given `None` and its response is dropped if it arrives later.
+        :yield: None
+        :return: the responses in the order of the requests, `None` for the ones that did not arrive.
+        """
+        n_requests = len(requests)
+        if min_responses is None:
+            min_responses = n_requests
+        if not 0 <= min_responses <= n_requests:
+            raise ValueError(
+                f"Cannot wait for {min_responses} responses out of {n_requests} requests."
+            )
+        if timeouts is not None and len(timeouts) != n_requests:
+            raise ValueError(f"Got {len(timeouts)} timeouts for {n_requests} requests.")
+
+        responses: List[Optional[Message]] = [None] * n_requests
+        received: Set[int] = set()
+        expired: Set[int] = set()
+        done = False
+
+        def _get_callback(index: int) -> Callable[[Message, BaseBehaviour], None]:
+            """Get the callback collecting the response of the request at the given index."""
+
+            def callback(message: Message, current_behaviour: BaseBehaviour) -> None:
+                """The callback request."""
+                if self.is_stopped or done or index in expired:
+                    self.context.logger.debug(
+                        "Dropping message as it is not awaited anymore: %s", message
+                    )
+                elif self != current_behaviour:
+                    self.handle_late_messages(self.behaviour_id, message)
+                else:
+                    responses[index] = message
+                    received.add(index)
+
+            return callback
+
+        self._put_requests(requests, _get_callback)
+
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        # the deadlines of the requests that are still awaited and have a timeout of their own
+        request_deadlines = {
+            index: start + request_timeout
+            for index, request_timeout in enumerate(timeouts or ())
+            if request_timeout is not None
+        }
+        try:
+            while len(received) < min_responses:
+                if deadline is not None and time.monotonic() > deadline:
+                    self.context.logger.warning(
+                        f"Received {len(received)} out of {n_requests} responses in {timeout}s."
+                    )
+                    break
+                wake_up_at = self._expire_requests(request_deadlines, received, expired)
+                if n_requests - len(expired) < min_responses:
+                    self.context.logger.warning(
+                        f"{len(expired)} out of {n_requests} requests timed out, "
+                        f"received {len(received)} responses out of the {min_responses} awaited."
+                    )
+                    break
+                if deadline is not None and (
+                    wake_up_at is None or deadline < wake_up_at
+                ):
+                    wake_up_at = deadline
+                # the execution is resumed when a response arrives, or on the first timeout
+                yield from self.wait_for_wake_up(
+                    deadline=wake_up_at, token=lambda: len(received)
+                )
+        finally:
+            done = True
+
+        return responses
+
+    def _put_requests(
+        self,
+        requests: Sequence[Tuple[Message, Dialogue]],
+        get_callback: Callable[[int], Callable[[Message, "BaseBehaviour"], None]],
+    ) -> None:
+        """Put the requests in the outbox, registering the callback of each one by its index."""
+        requests_model = cast(Requests, self.context.requests)
+        for index, (message, dialogue) in enumerate(requests):
+            request_nonce = self._get_request_nonce_from_dialogue(dialogue)
+            requests_model.request_id_to_callback[request_nonce] = get_callback(index)
+            self.context.outbox.put_message(message=message)
+
+    @staticmethod
+    def _expire_requests(
+        request_deadlines: Dict[int, float], received: Set[int], expired: Set[int]
+    ) -> Optional[float]:
+        """
+        Expire the awaited requests whose timeout has elapsed.
+
+        :param request_deadlines: the deadlines of the awaited requests by index, updated in place.
+        :param received: the indexes of the requests that got a response.
+        :param expired: the indexes of the expired requests, updated in place.
+        :return: the deadline of the next request to expire, if any.
+        """
+        now = time.monotonic()
+        for index, request_deadline in tuple(request_deadlines.items()):
+            if index in received or now > request_deadline:
+                if index not in received:
+                    expired.add(index)
+                del request_deadlines[index]
+        return min(request_deadlines.values(), default=None)
+
     def _build_http_request_message(
         self,
         method: str,
@@ -1438,6 +1640,20 @@ class BaseBehaviour(
             self.params.max_attempts if max_attempts is None else max_attempts
         )
 
+        if self.params.use_tx_delivery_events:
+            event_timeout = (
+                (deadline - datetime.datetime.now()).total_seconds()
+                if timeout is not None
+                else request_retry_delay * max_attempts
+            )
+            is_ok = yield from self._wait_for_tx_delivery_event(
+                tx_hash, timeout=event_timeout
+            )
+            if is_ok:
+                return True, None
+            # the transaction failed, or its delivery was not seen in time,
+            # so we fall back to polling to get the details from Tendermint
+
         response = None
         for _ in range(max_attempts):
             request_timeout = (
@@ -1464,6 +1680,32 @@ class BaseBehaviour(
 
         return False, response
 
+    def _wait_for_tx_delivery_event(
+        self, tx_hash: str, timeout: float
+    ) -> Generator[None, None, Optional[bool]]:
+        """
+        Wait until the local ABCI app delivers a transaction.
+
+        Every agent's ABCI app receives a `deliver_tx` request for each transaction included in a block,
+        so the delivery is pushed to the behaviour without any requests to the Tendermint RPC.
+
+        :param tx_hash: the transaction hash to wait for.
+        :param timeout: the seconds to wait for.
+        :yield: None
+        :return: whether the transaction was delivered successfully, `None` if it was not delivered in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            is_ok = self.round_sequence.get_delivered_tx(tx_hash)
+            if is_ok is not None:
+                return is_ok
+            if time.monotonic() > deadline:
+                return None
+            # the execution is resumed when a transaction is delivered, or on timeout
+            yield from self.wait_for_wake_up(
+                deadline=deadline, token=lambda: self.round_sequence.n_delivered_txs
+            )
+
     @classmethod
     def _check_http_return_code_200(cls, response: HttpMessage) -> bool:
         """Check the HTTP response has return code 200."""
@@ -1670,23 +1912,9 @@ class BaseBehaviour(
         :return: the contract api response
         :yields: the contract api response
         """
-        ledger_api_dialogues = cast(
-            LedgerApiDialogues, self.context.ledger_api_dialogues
+        ledger_api_msg, ledger_api_dialogue = self._build_ledger_api_request(
+            performative, ledger_callable, **kwargs
         )
-        kwargs = {
-            "performative": performative,
-            "counterparty": LEDGER_API_ADDRESS,
-            "ledger_id": self.context.default_ledger_id,
-            "callable": ledger_callable,
-            "kwargs": LedgerApiMessage.Kwargs(kwargs),
-            "args": tuple(),
-        }
-        ledger_api_msg, ledger_api_dialogue = ledger_api_dialogues.create(**kwargs)
-        ledger_api_dialogue = cast(
-            LedgerApiDialogue,
-            ledger_api_dialogue,
-        )
-        ledger_api_dialogue.terms = self._get_default_terms()
         request_nonce = self._get_request_nonce_from_dialogue(ledger_api_dialogue)
         cast(Requests, self.context.requests).request_id_to_callback[
             request_nonce
@@ -1721,6 +1949,122 @@ class BaseBehaviour(
         :return: the contract api response
         :yields: the contract api response
         """
+        contract_api_msg, contract_api_dialogue = self._build_contract_api_request(
+            performative,
+            contract_address,
+            contract_id,
+            contract_callable,
+            ledger_id,
+            **kwargs,
+        )
+        request_nonce = self._get_request_nonce_from_dialogue(contract_api_dialogue)
+        cast(Requests, self.context.requests).request_id_to_callback[
+            request_nonce
+        ] = self.get_callback_request()
+        self.context.outbox.put_message(message=contract_api_msg)
+        response = yield from self.wait_for_message()
+        return response
+
+    def get_batched_contract_state(
+        self,
+        multicall_address: str,
+        calls: Sequence[Dict[str, Any]],
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, Optional[List[Any]]]:
+        """
+        Perform several read-only contract calls with a single multicall round trip.
+
+        Each call is described by a dictionary with the `contract_id` of the targeted contract,
+        its `contract_address`, the `fn_name` to call and its `args`.
+        The calls are aggregated in a single `GET_STATE` request to the `Multicall2` contract,
+        and the results are returned in the order of the calls, with `None` for the ones which failed.
+
+        :param multicall_address: the address of the `Multicall2` contract.
+        :param calls: the descriptions of the read-only calls to batch.
+        :param ledger_id: the ledger id, if not specified, the default ledger id is used
+        :param kwargs: keyword argument for the contract api request, e.g., the `chain_id`
+        :return: the results of the calls, or `None` if the batch could not be performed
+        :yields: the contract api response
+        """
+        response = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=multicall_address,
+            contract_id=str(Multicall2Contract.contract_id),
+            contract_callable="get_aggregated_state",
+            ledger_id=ledger_id,
+            calls=list(calls),
+            **kwargs,
+        )
+        if response.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.error(
+                f"Could not perform the batched contract calls. Expected response performative "
+                f"{ContractApiMessage.Performative.STATE.value}, received {response}."  # type: ignore
+            )
+            return None
+
+        results = cast(Optional[List[Any]], response.state.body.get("results", None))
+        if results is None or len(results) != len(calls):
+            self.context.logger.error(
+                f"Unexpected results for {len(calls)} batched contract calls: {results}."
+            )
+            return None
+
+        return results
+
+    def _build_ledger_api_request(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Tuple[LedgerApiMessage, LedgerApiDialogue]:
+        """
+        Build a ledger api request.
+
+        :param performative: the message performative
+        :param ledger_callable: the callable to call on the ledger
+        :param kwargs: keyword argument for the ledger api request
+        :return: the ledger api message and the ledger api dialogue
+        """
+        ledger_api_dialogues = cast(
+            LedgerApiDialogues, self.context.ledger_api_dialogues
+        )
+        kwargs = {
+            "performative": performative,
+            "counterparty": LEDGER_API_ADDRESS,
+            "ledger_id": self.context.default_ledger_id,
+            "callable": ledger_callable,
+            "kwargs": LedgerApiMessage.Kwargs(kwargs),
+            "args": tuple(),
+        }
+        ledger_api_msg, ledger_api_dialogue = ledger_api_dialogues.create(**kwargs)
+        ledger_api_dialogue = cast(
+            LedgerApiDialogue,
+            ledger_api_dialogue,
+        )
+        ledger_api_dialogue.terms = self._get_default_terms()
+        return cast(LedgerApiMessage, ledger_api_msg), ledger_api_dialogue
+
+    def _build_contract_api_request(  # pylint: disable=too-many-arguments
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Tuple[ContractApiMessage, ContractApiDialogue]:
+        """
+        Build a contract api request.
+
+        :param performative: the message performative
+        :param contract_address: the contract address
+        :param contract_id: the contract id
+        :param contract_callable: the callable to call on the contract
+        :param ledger_id: the ledger id, if not specified, the default ledger id is used
+        :param kwargs: keyword argument for the contract api request
+        :return: the contract api message and the contract api dialogue
+        """
         contract_api_dialogues = cast(
             ContractApiDialogues, self.context.contract_api_dialogues
         )
@@ -1742,13 +2086,7 @@ class BaseBehaviour(
             contract_api_dialogue,
         )
         contract_api_dialogue.terms = self._get_default_terms()
-        request_nonce = self._get_request_nonce_from_dialogue(contract_api_dialogue)
-        cast(Requests, self.context.requests).request_id_to_callback[
-            request_nonce
-        ] = self.get_callback_request()
-        self.context.outbox.put_message(message=contract_api_msg)
-        response = yield from self.wait_for_message()
-        return response
+        return cast(ContractApiMessage, contract_api_msg), contract_api_dialogue
 
     @staticmethod
     def __parse_rpc_error(error: str) -> RPCResponseStatus:
@@ -2302,6 +2640,9 @@ class TmManager(BaseBehaviour):
                 # this was done to have consistency between
                 # the act here, and acts on normal AsyncBehaviours
                 return
+            if self.is_suspended:
+                # the generator is waiting for a deadline to elapse
+                return
             # this will run the active generator until
             # the first yield statement is encountered
             self._active_generator.send(None)
@@ -380,6 +380,32 @@ class AbstractRoundBehaviour(  # pylint: disable=too-many-instance-attributes
 
         self._background_act()
 
+    def wake_up(self) -> None:
+        """
+        Resume the behaviours whose wake-up conditions are met, without waiting for the next tick.
+
+        It is called on the events which the behaviours wait for, e.g., a delivered transaction or a new block.
+        If the round has changed, the behaviour of the new round is started straight away.
+        """
+        tm_manager = cast(TmManager, self.tm_manager)
+        if tm_manager.tm_communication_unhealthy or tm_manager.is_acting:
+            # the fix of tendermint is only applied on the ticks
+            return
+
+        current_round_height = self.context.state.round_sequence.current_round_height
+        if self._last_round_height != current_round_height:
+            self.act_wrapper()
+            return
+
+        if self.current_behaviour is not None:
+            self.current_behaviour.wake_up()
+            if self.current_behaviour.is_done():
+                self.current_behaviour.clean_up()
+                self.current_behaviour = None
+
+        for behaviour in self.background_behaviours:
+            behaviour.wake_up()
+
     def _process_current_round(self) -> None:
         """Process current ABCIApp round."""
         current_round_height = self.context.state.round_sequence.current_round_height
@@ -19,13 +19,17 @@
 
 """This module contains the handler for the 'abstract_round_abci' skill."""
 
+import hashlib
 import ipaddress
 import json
+import os
 from abc import ABC
 from calendar import timegm
+from collections import OrderedDict
 from dataclasses import asdict
 from enum import Enum
-from typing import Any, Callable, Dict, FrozenSet, List, Optional, cast
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, cast
 
 from aea.configurations.data_types import PublicId
 from aea.protocols.base import Message
@@ -34,7 +38,15 @@ from aea.skills.base import Handler
 
 from packages.open_aea.protocols.signing import SigningMessage
 from packages.valory.protocols.abci import AbciMessage
-from packages.valory.protocols.abci.custom_types import Events, ValidatorUpdates
+from packages.valory.protocols.abci.custom_types import (
+    Events,
+    ProofOps,
+    Result,
+    ResultType,
+    SnapShots,
+    Snapshot,
+    ValidatorUpdates,
+)
 from packages.valory.protocols.contract_api import ContractApiMessage
 from packages.valory.protocols.http import HttpMessage
 from packages.valory.protocols.ipfs import IpfsMessage
@@ -62,21 +74,401 @@ from packages.valory.skills.abstract_round_abci.base import (
 from packages.valory.skills.abstract_round_abci.behaviours import AbstractRoundBehaviour
 from packages.valory.skills.abstract_round_abci.dialogues import AbciDialogue
 from packages.valory.skills.abstract_round_abci.models import (
+    BenchmarkTool,
     Requests,
     SharedState,
     TendermintRecoveryParams,
 )
 
 
+DEFAULT_VERIFIED_TX_CACHE_SIZE = 10_000
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_INTERVAL = 0
+DEFAULT_SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SNAPSHOTS_KEPT = 2
+DEFAULT_STATE_CHECKPOINT_INTERVAL = 10
+DEFAULT_QUERY_CACHE_SIZE = 1_000
+QUERY_ROUND_PATH = "round"
+QUERY_DB_PATH = "db"
+QUERY_HISTORY_PATH = "history"
+
+
 def exception_to_info_msg(exception: Exception) -> str:
     """Transform an exception to an info string message."""
     return f"{exception.__class__.__name__}: {str(exception)}"
 
 
+class VerifiedTransactionCache:
+    """
+    A bounded LRU cache of decoded and verified transactions.
+
+    The entries are keyed by the digest of the transactions' bytes and store the decoded `Transaction`,
+    or the exception raised while decoding or verifying it, so that a transaction which is checked on mempool admission
+    and delivered later on, or rechecked, is only decoded and has its signature recovered once.
+    """
+
+    _cached_exceptions = (
+        SignatureNotValidError,
+        TransactionNotValidError,
+        TransactionTypeNotRecognizedError,
+    )
+
+    def __init__(self, max_size: int = DEFAULT_VERIFIED_TX_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        if max_size < 0:
+            raise ValueError(
+                f"The size of the verified transactions cache cannot be negative, got {max_size}."
+            )
+        self._max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[Optional[Transaction], Optional[Exception]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached transactions."""
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        """Get the maximum number of cached transactions."""
+        return self._max_size
+
+    def _decode_and_verify(
+        self, transaction_bytes: bytes, ledger_id: str
+    ) -> Tuple[Optional[Transaction], Optional[Exception]]:
+        """Decode and verify a transaction, returning the exception raised, if any, instead of raising it."""
+        try:
+            transaction = Transaction.decode(transaction_bytes)
+            transaction.verify(ledger_id)
+        except self._cached_exceptions as exception:
+            return None, exception
+        return transaction, None
+
+    def decode_and_verify(
+        self, transaction_bytes: bytes, ledger_id: str
+    ) -> Transaction:
+        """
+        Decode and verify a transaction, using the cached result if the transaction has been seen before.
+
+        :param transaction_bytes: the bytes of the transaction.
+        :param ledger_id: the ledger id to use in order to verify the signature.
+        :return: the decoded and verified transaction.
+        :raises: SignatureNotValidError, TransactionNotValidError or TransactionTypeNotRecognizedError,
+            if the transaction is not valid.
+        """
+        key = ledger_id, hashlib.sha256(transaction_bytes).digest()
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = self._decode_and_verify(transaction_bytes, ledger_id)
+            if self._max_size > 0:
+                self._entries[key] = entry
+                if len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+        transaction, exception = entry
+        if exception is not None:
+            # do not accumulate the tracebacks of the previous raises of the cached exception
+            raise exception.with_traceback(None)
+        return cast(Transaction, transaction)
+
+
+class SnapshotStore:
+    """
+    A bounded store of the chunked state-sync snapshots of the application, which also restores a peer's snapshot.
+
+    A snapshot's hash is the digest of the whole serialized state, and its metadata hold the digests of its chunks,
+    so that every chunk can be verified as soon as it is received from a peer.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_SNAPSHOT_CHUNK_SIZE,
+        max_snapshots: int = DEFAULT_SNAPSHOTS_KEPT,
+        interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> None:
+        """Initialize the store."""
+        if chunk_size < 1 or max_snapshots < 1:
+            raise ValueError(
+                "The size of the snapshots' chunks and the number of the snapshots kept must be positive, "
+                f"got {chunk_size} and {max_snapshots}."
+            )
+        self._chunk_size = chunk_size
+        self._max_snapshots = max_snapshots
+        # take a snapshot at least this many blocks after the last one, 0 disables the snapshots
+        self._interval = interval
+        self._snapshots: "OrderedDict[int, Tuple[Snapshot, Tuple[bytes, ...]]]" = (
+            OrderedDict()
+        )
+        self._restoring: Optional[Snapshot] = None
+        self._restoring_app_hash = b""
+        self._chunk_hashes: List[str] = []
+        self._received_chunks: Dict[int, bytes] = {}
+
+    @staticmethod
+    def _hash_chunk(chunk: bytes) -> str:
+        """Get the hex digest of a chunk."""
+        return hashlib.sha256(chunk).hexdigest()
+
+    @property
+    def snapshots(self) -> List[Snapshot]:
+        """Get the stored snapshots, from the oldest to the most recent."""
+        return [snapshot for snapshot, _ in self._snapshots.values()]
+
+    @property
+    def latest_height(self) -> int:
+        """Get the height of the most recent snapshot, 0 if there are no snapshots."""
+        return next(reversed(self._snapshots), 0)
+
+    def is_due(self, height: int) -> bool:
+        """Check whether a snapshot is due at the given height."""
+        return self._interval > 0 and height >= self.latest_height + self._interval
+
+    def add(self, height: int, state: bytes) -> Snapshot:
+        """
+        Chunk and store a snapshot of the given state, evicting the oldest snapshot if the store is full.
+
+        :param height: the height at which the state was serialized.
+        :param state: the serialized state.
+        :return: the stored snapshot.
+        """
+        chunks = tuple(
+            state[i : i + self._chunk_size]
+            for i in range(0, max(len(state), 1), self._chunk_size)
+        )
+        metadata = json.dumps(
+            {"chunk_hashes": [self._hash_chunk(chunk) for chunk in chunks]}
+        ).encode("utf-8")
+        snapshot = Snapshot(
+            height,
+            SNAPSHOT_FORMAT,
+            len(chunks),
+            hashlib.sha256(state).digest(),
+            metadata,
+        )
+        self._snapshots.pop(height, None)
+        self._snapshots[height] = snapshot, chunks
+        while len(self._snapshots) > self._max_snapshots:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    def load_chunk(self, height: int, format_: int, index: int) -> bytes:
+        """Get a chunk of a stored snapshot, or empty bytes if it does not exist."""
+        snapshot, chunks = self._snapshots.get(height, (None, ()))
+        if snapshot is None or snapshot.format_ != format_ or index >= len(chunks):
+            return b""
+        return chunks[index]
+
+    def clear(self) -> None:
+        """Remove all the stored snapshots, e.g., because the chain has been reset."""
+        self._snapshots.clear()
+
+    @property
+    def restoring_app_hash(self) -> bytes:
+        """Get the trusted app hash of the snapshot which is being restored."""
+        return self._restoring_app_hash
+
+    def offer(self, snapshot: Snapshot, app_hash: bytes) -> ResultType:
+        """
+        Start restoring a snapshot offered by a peer, if it can be restored.
+
+        :param snapshot: the offered snapshot.
+        :param app_hash: the trusted app hash at the snapshot's height.
+        :return: the result of the offer.
+        """
+        self._restoring = None
+        if snapshot.format_ != SNAPSHOT_FORMAT:
+            return ResultType.REJECT_FORMAT
+        try:
+            chunk_hashes = json.loads(snapshot.metadata)["chunk_hashes"]
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError):
+            return ResultType.REJECT
+        if snapshot.chunks < 1 or len(chunk_hashes) != snapshot.chunks:
+            return ResultType.REJECT
+
+        self._restoring = snapshot
+        self._restoring_app_hash = app_hash
+        self._chunk_hashes = chunk_hashes
+        self._received_chunks = {}
+        return ResultType.ACCEPT
+
+    def apply_chunk(self, index: int, chunk: bytes) -> bool:
+        """
+        Verify and keep a chunk of the snapshot which is being restored.
+
+        :param index: the index of the chunk.
+        :param chunk: the chunk.
+        :return: whether the chunk is valid.
+        """
+        if (
+            self._restoring is None
+            or not 0 <= index < len(self._chunk_hashes)
+            or self._hash_chunk(chunk) != self._chunk_hashes[index]
+        ):
+            return False
+        self._received_chunks[index] = chunk
+        return True
+
+    @property
+    def is_restoring(self) -> bool:
+        """Whether a snapshot is being restored."""
+        return self._restoring is not None
+
+    def restored_state(self) -> Optional[bytes]:
+        """
+        Get the restored state once all the chunks have been applied, ending the restoration.
+
+        :return: the restored state, or `None` if chunks are still missing.
+        :raises ValueError: if the assembled state does not match the snapshot's hash.
+        """
+        snapshot = self._restoring
+        if snapshot is None or len(self._received_chunks) < snapshot.chunks:
+            return None
+
+        state = b"".join(self._received_chunks[i] for i in range(snapshot.chunks))
+        self._restoring = None
+        self._received_chunks = {}
+        if hashlib.sha256(state).digest() != snapshot.hash_:
+            raise ValueError(
+                f"The restored state does not match the hash of the snapshot at height {snapshot.height}."
+            )
+        return state
+
+
+class StateCheckpoint:
+    """
+    A local checkpoint of the application's state, used in order to recover from a crash without resetting Tendermint.
+
+    The checkpoint is written to a temporary file, which is synced to the disk and then atomically renamed,
+    so that a crash while writing never corrupts the previous checkpoint.
+    The serialized state is prefixed with its digest, which is verified when the checkpoint is loaded.
+    """
+
+    def __init__(
+        self, path: str, interval: int = DEFAULT_STATE_CHECKPOINT_INTERVAL
+    ) -> None:
+        """Initialize the checkpoint."""
+        self._path = Path(path)
+        # write the checkpoint at least this many blocks after the last one
+        self._interval = interval
+        self.last_height = 0
+
+    @property
+    def path(self) -> Path:
+        """Get the path of the checkpoint."""
+        return self._path
+
+    def is_due(self, height: int) -> bool:
+        """Check whether the checkpoint is due at the given height."""
+        return height >= self.last_height + self._interval
+
+    def save(self, state: bytes, height: int) -> None:
+        """Write the given serialized state, at the given height, to the checkpoint."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(hashlib.sha256(state).hexdigest().encode("utf-8") + b"\n")
+            file.write(state)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self._path)
+        self.last_height = height
+
+    def load(self) -> Optional[bytes]:
+        """
+        Load the serialized state from the checkpoint.
+
+        :return: the serialized state, or `None` if there is no checkpoint.
+        :raises ValueError: if the checkpoint is corrupted.
+        """
+        if not self._path.is_file():
+            return None
+        digest, _, state = self._path.read_bytes().partition(b"\n")
+        if hashlib.sha256(state).hexdigest().encode("utf-8") != digest:
+            raise ValueError(f"The state checkpoint {self._path} is corrupted.")
+        return state
+
+    def remove(self) -> None:
+        """Remove the checkpoint, if it exists."""
+        self._path.unlink(missing_ok=True)
+        self.last_height = 0
+
+
 class ABCIRoundHandler(ABCIHandler):
     """ABCI handler."""
 
     SUPPORTED_PROTOCOL = AbciMessage.protocol_id
+    # the requests after which the behaviours may be woken up, see `AbstractRoundBehaviour.wake_up`
+    _wake_up_request_types = frozenset({"deliver_tx", "commit"})
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the handler."""
+        verified_tx_cache_size: int = kwargs.pop(
+            "verified_tx_cache_size", DEFAULT_VERIFIED_TX_CACHE_SIZE
+        )
+        # take a state-sync snapshot at the first round transition at least this many blocks after the last one,
+        # 0 disables the snapshots
+        snapshot_interval: int = kwargs.pop(
+            "snapshot_interval", DEFAULT_SNAPSHOT_INTERVAL
+        )
+        snapshot_chunk_size: int = kwargs.pop(
+            "snapshot_chunk_size", DEFAULT_SNAPSHOT_CHUNK_SIZE
+        )
+        snapshots_kept: int = kwargs.pop("snapshots_kept", DEFAULT_SNAPSHOTS_KEPT)
+        # checkpoint the state locally, in order to restore it when the agent restarts, if a path is given
+        state_checkpoint_path: Optional[str] = kwargs.pop("state_checkpoint_path", None)
+        # write the checkpoint at the first round transition at least this many blocks after the last one
+        state_checkpoint_interval: int = kwargs.pop(
+            "state_checkpoint_interval", DEFAULT_STATE_CHECKPOINT_INTERVAL
+        )
+        self._query_cache_size: int = kwargs.pop(
+            "query_cache_size", DEFAULT_QUERY_CACHE_SIZE
+        )
+        super().__init__(**kwargs)
+        self._verified_tx_cache = VerifiedTransactionCache(verified_tx_cache_size)
+        self._snapshot_store = SnapshotStore(
+            snapshot_chunk_size, snapshots_kept, snapshot_interval
+        )
+        self._state_checkpoint = (
+            StateCheckpoint(state_checkpoint_path, state_checkpoint_interval)
+            if state_checkpoint_path is not None
+            else None
+        )
+        self._is_checkpoint_restored = False
+        # the serialized responses to the queries, valid while the state does not change
+        self._query_cache: "OrderedDict[str, Tuple[int, str, bytes]]" = OrderedDict()
+        self._query_cache_state: Optional[Tuple[int, int]] = None
+
+    @property
+    def verified_tx_cache(self) -> VerifiedTransactionCache:
+        """Get the cache of the verified transactions, shared between `check_tx` and `deliver_tx`."""
+        return self._verified_tx_cache
+
+    @property
+    def snapshot_store(self) -> SnapshotStore:
+        """Get the store of the state-sync snapshots."""
+        return self._snapshot_store
+
+    def handle(self, message: Message) -> None:
+        """
+        Handle the message, measuring the time it takes to handle the ABCI request during the current round.
+
+        :param message: the message.
+        """
+        request_type = message.performative.value.replace("request_", "")
+        round_id = self.context.state.round_sequence.current_round_id
+        benchmark_tool = cast(BenchmarkTool, self.context.benchmark_tool)
+        with benchmark_tool.measure_abci(request_type, round_id):
+            super().handle(message)
+
+        if request_type in self._wake_up_request_types:
+            # the behaviours waiting for a delivered transaction or a new round are resumed right away
+            cast(AbstractRoundBehaviour, self.context.behaviours.main).wake_up()
 
     def info(self, message: AbciMessage, dialogue: AbciDialogue) -> AbciMessage:
         """
@@ -93,6 +485,8 @@ class ABCIRoundHandler(ABCIHandler):
         :param dialogue: the ABCI dialogue.
         :return: the response.
         """
+        # the handshake happens on startup, so this is when the state is restored from the local checkpoint
+        self._restore_checkpoint()
         # some arbitrary information
         info_data = ""
         # the application software semantic version
@@ -138,6 +532,10 @@ class ABCIRoundHandler(ABCIHandler):
         cast(SharedState, self.context.state).round_sequence.init_chain(
             message.initial_height
         )
+        # the heights of the existing snapshots and of the checkpoint refer to the previous chain
+        self._snapshot_store.clear()
+        if self._state_checkpoint is not None:
+            self._state_checkpoint.remove()
         reply = dialogue.reply(
             performative=AbciMessage.Performative.RESPONSE_INIT_CHAIN,
             target_message=message,
@@ -153,13 +551,93 @@ class ABCIRoundHandler(ABCIHandler):
         )
         return super().begin_block(message, dialogue)
 
+    def query(self, message: AbciMessage, dialogue: AbciDialogue) -> AbciMessage:
+        """
+        Handle the 'query' request, serving read-only access to the synchronized state.
+
+        The supported paths are:
+
+        - `/round`: the current round, period and heights.
+        - `/db/<key>`: the latest value of a key of the database for the current period.
+        - `/db/<key>/history`: all the values of a key of the database for the current period.
+
+        The values are JSON-encoded. The responses are cached until the state changes,
+        i.e., until a block is committed or a round is scheduled.
+
+        :param message: the ABCI request.
+        :param dialogue: the ABCI dialogue.
+        :return: the response.
+        """
+        round_sequence = cast(SharedState, self.context.state).round_sequence
+        state = (
+            round_sequence.height,
+            round_sequence.latest_synchronized_data.round_count,
+        )
+        if state != self._query_cache_state:
+            self._query_cache.clear()
+            self._query_cache_state = state
+
+        path = message.path
+        response = self._query_cache.get(path, None)
+        if response is not None:
+            self._query_cache.move_to_end(path)
+        else:
+            response = self._resolve_query(path)
+            if self._query_cache_size > 0:
+                self._query_cache[path] = response
+                if len(self._query_cache) > self._query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        code, info, value = response
+        reply = dialogue.reply(
+            performative=AbciMessage.Performative.RESPONSE_QUERY,
+            target_message=message,
+            code=code,
+            log="",
+            info=info,
+            index=0,
+            key=path.encode("utf-8"),
+            value=value,
+            proof_ops=ProofOps([]),
+            height=round_sequence.height,
+            codespace="",
+        )
+        return cast(AbciMessage, reply)
+
+    def _resolve_query(self, path: str) -> Tuple[int, str, bytes]:
+        """Resolve a query's path, returning the response's code, info and serialized value."""
+        round_sequence = cast(SharedState, self.context.state).round_sequence
+        synchronized_data = round_sequence.latest_synchronized_data
+        parts = path.strip("/").split("/")
+        try:
+            if parts == [QUERY_ROUND_PATH]:
+                value: Any = {
+                    "round_id": round_sequence.current_round_id,
+                    "last_round_id": round_sequence.last_round_id,
+                    "round_count": synchronized_data.round_count,
+                    "period_count": synchronized_data.period_count,
+                    "current_round_height": round_sequence.current_round_height,
+                    "height": round_sequence.height,
+                }
+            elif len(parts) == 2 and parts[0] == QUERY_DB_PATH:
+                value = synchronized_data.db.get_strict(parts[1])
+            elif parts[0] == QUERY_DB_PATH and parts[2:] == [QUERY_HISTORY_PATH]:
+                value = synchronized_data.db.get_history(parts[1])
+            else:
+                return ERROR_CODE, f"unknown query path {path!r}", b""
+        except ValueError as exception:
+            return ERROR_CODE, exception_to_info_msg(exception), b""
+
+        return OK_CODE, "", json.dumps(value, sort_keys=True).encode("utf-8")
+
     def check_tx(self, message: AbciMessage, dialogue: AbciDialogue) -> AbciMessage:
         """Handle the 'check_tx' request."""
         transaction_bytes = message.tx
         # check we can decode the transaction
         try:
-            transaction = Transaction.decode(transaction_bytes)
-            transaction.verify(self.context.default_ledger_id)
+            self._verified_tx_cache.decode_and_verify(
+                transaction_bytes, self.context.default_ledger_id
+            )
             cast(SharedState, self.context.state).round_sequence.check_is_finished()
         except (
             SignatureNotValidError,
@@ -226,10 +704,13 @@ class ABCIRoundHandler(ABCIHandler):
         """Handle the 'deliver_tx' request."""
         transaction_bytes = message.tx
         round_sequence = cast(SharedState, self.context.state).round_sequence
+        # the behaviours waiting for their transactions to be delivered are notified through the round sequence
+        tx_hash = hashlib.sha256(transaction_bytes).hexdigest().upper()
         payload_sender: Optional[str] = None
         try:
-            transaction = Transaction.decode(transaction_bytes)
-            transaction.verify(self.context.default_ledger_id)
+            transaction = self._verified_tx_cache.decode_and_verify(
+                transaction_bytes, self.context.default_ledger_id
+            )
             payload_sender = transaction.payload.sender
             round_sequence.check_is_finished()
             round_sequence.deliver_tx(transaction)
@@ -241,17 +722,20 @@ class ABCIRoundHandler(ABCIHandler):
             self._log_exception(exception)
             # the transaction is invalid, it's potentially an offence, so we add it to the list of pending offences
             self.settle_pending_offence(payload_sender, invalid=True)
+            round_sequence.add_delivered_tx(tx_hash, is_ok=False)
             return self._deliver_tx_failed(
                 message, dialogue, exception_to_info_msg(exception)
             )
         except LateArrivingTransaction as exception:  # pragma: nocover
             self.context.logger.debug(exception_to_info_msg(exception))
+            round_sequence.add_delivered_tx(tx_hash, is_ok=False)
             return self._deliver_tx_failed(
                 message, dialogue, exception_to_info_msg(exception)
             )
 
         # the invalid payloads' availability window needs to be populated with the negative values as well
         self.settle_pending_offence(payload_sender, invalid=False)
+        round_sequence.add_delivered_tx(tx_hash, is_ok=True)
 
         # return deliver_tx success
         reply = dialogue.reply(
@@ -295,6 +779,7 @@ class ABCIRoundHandler(ABCIHandler):
         except AddBlockError as exception:
             self._log_exception(exception)
             raise exception
+        self._persist_state()
         # The Merkle root hash of the application state.
         data = self.context.state.round_sequence.root_hash
         # Blocks below this height may be removed. Defaults to 0 (retain all).
@@ -308,6 +793,182 @@ class ABCIRoundHandler(ABCIHandler):
         )
         return cast(AbciMessage, reply)
 
+    def _persist_state(self) -> None:
+        """
+        Take a state-sync snapshot and write the local checkpoint, if they are due.
+
+        They are only due if their interval has passed and a round transition happened in the committed block,
+        as the payloads collected by an ongoing round are not part of the serialized state.
+        """
+        round_sequence = cast(SharedState, self.context.state).round_sequence
+        height = round_sequence.height
+        take_snapshot = self._snapshot_store.is_due(height)
+        write_checkpoint = self._state_checkpoint is not None and (
+            self._state_checkpoint.is_due(height)
+        )
+        if not take_snapshot and not write_checkpoint:
+            return
+        try:
+            last_round_transition_height = round_sequence.last_round_transition_height
+        except ValueError:
+            return
+        if last_round_transition_height != height:
+            return
+
+        state = round_sequence.serialize_state()
+        if take_snapshot:
+            snapshot = self._snapshot_store.add(height, state)
+            self.context.logger.info(
+                f"Took a snapshot at height {height} with {snapshot.chunks} chunk(s)."
+            )
+        if write_checkpoint:
+            cast(StateCheckpoint, self._state_checkpoint).save(state, height)
+            self.context.logger.debug(f"Checkpointed the state at height {height}.")
+
+    def _restore_checkpoint(self) -> None:
+        """Restore the state from the local checkpoint once, if there is one and no blocks have been processed yet."""
+        if self._state_checkpoint is None or self._is_checkpoint_restored:
+            return
+        self._is_checkpoint_restored = True
+        round_sequence = cast(SharedState, self.context.state).round_sequence
+        if round_sequence.height != 0:
+            return
+        try:
+            state = self._state_checkpoint.load()
+            if state is None:
+                return
+            round_sequence.load_state(state)
+        except (OSError, ValueError, ABCIAppInternalError) as exception:
+            self._log_exception(exception)
+            return
+        self._state_checkpoint.last_height = round_sequence.height
+        self.context.logger.info(
+            f"Restored the state from the local checkpoint at height {round_sequence.height}. "
+            "Tendermint will replay the blocks after it."
+        )
+
+    def list_snapshots(
+        self, message: AbciMessage, dialogue: AbciDialogue
+    ) -> AbciMessage:
+        """
+        Handle a message of REQUEST_LIST_SNAPSHOT performative.
+
+        :param message: the ABCI request.
+        :param dialogue: the ABCI dialogue.
+        :return: the response.
+        """
+        reply = dialogue.reply(
+            performative=AbciMessage.Performative.RESPONSE_LIST_SNAPSHOTS,
+            target_message=message,
+            snapshots=SnapShots(self._snapshot_store.snapshots),
+        )
+        return cast(AbciMessage, reply)
+
+    def offer_snapshot(
+        self, message: AbciMessage, dialogue: AbciDialogue
+    ) -> AbciMessage:
+        """
+        Handle a message of REQUEST_OFFER_SNAPSHOT performative.
+
+        As per Tendermint spec (https://github.com/tendermint/spec/blob/038f3e025a19fed9dc96e718b9834ab1b545f136/spec/abci/abci.md#offersnapshot):
+
+        - Offers a snapshot to the application, along with the trusted app hash at the snapshot's height.
+        - The application accepts it if it can restore it, and the chunks are then applied via `apply_snapshot_chunk`.
+
+        :param message: the ABCI request.
+        :param dialogue: the ABCI dialogue.
+        :return: the response.
+        """
+        result_type = self._snapshot_store.offer(message.snapshot, message.app_hash)
+        reply = dialogue.reply(
+            performative=AbciMessage.Performative.RESPONSE_OFFER_SNAPSHOT,
+            target_message=message,
+            result=Result(result_type),
+        )
+        return cast(AbciMessage, reply)
+
+    def load_snapshot_chunk(
+        self, message: AbciMessage, dialogue: AbciDialogue
+    ) -> AbciMessage:
+        """
+        Handle a message of REQUEST_LOAD_SNAPSHOT_CHUNK performative.
+
+        :param message: the ABCI request.
+        :param dialogue: the ABCI dialogue.
+        :return: the response.
+        """
+        chunk = self._snapshot_store.load_chunk(
+            message.height, message.format, message.chunk_index
+        )
+        reply = dialogue.reply(
+            performative=AbciMessage.Performative.RESPONSE_LOAD_SNAPSHOT_CHUNK,
+            target_message=message,
+            chunk=chunk,
+        )
+        return cast(AbciMessage, reply)
+
+    def apply_snapshot_chunk(
+        self, message: AbciMessage, dialogue: AbciDialogue
+    ) -> AbciMessage:
+        """
+        Handle a message of REQUEST_APPLY_SNAPSHOT_CHUNK performative.
+
+        As per Tendermint spec (https://github.com/tendermint/spec/blob/038f3e025a19fed9dc96e718b9834ab1b545f136/spec/abci/abci.md#applysnapshotchunk):
+
+        - Applies the chunks in order, and the state is restored once the final chunk has been applied.
+        - The result values are those of `ResponseApplySnapshotChunk.Result`, which share the `ResultType` enum
+          with the offer's results: 3 is `RETRY` and 5 is `REJECT_SNAPSHOT`.
+
+        :param message: the ABCI request.
+        :param dialogue: the ABCI dialogue.
+        :return: the response.
+        """
+        refetch_chunks: Tuple[int, ...] = tuple()
+        reject_senders: Tuple[str, ...] = tuple()
+        if not self._snapshot_store.is_restoring:
+            result_type = ResultType.ABORT
+        elif not self._snapshot_store.apply_chunk(message.index, message.chunk):
+            # retry the chunk, from a different peer
+            result_type = ResultType.REJECT
+            refetch_chunks = (message.index,)
+            reject_senders = (message.chunk_sender,)
+        else:
+            result_type = self._restore_snapshot()
+
+        reply = dialogue.reply(
+            performative=AbciMessage.Performative.RESPONSE_APPLY_SNAPSHOT_CHUNK,
+            target_message=message,
+            result=Result(result_type),
+            refetch_chunks=refetch_chunks,
+            reject_senders=reject_senders,
+        )
+        return cast(AbciMessage, reply)
+
+    def _restore_snapshot(self) -> ResultType:
+        """Load the restored state, if all the chunks have been applied, and check it against the trusted app hash."""
+        try:
+            state = self._snapshot_store.restored_state()
+            if state is None:
+                return ResultType.ACCEPT
+            round_sequence = cast(SharedState, self.context.state).round_sequence
+            round_sequence.load_state(state)
+        except (ValueError, ABCIAppInternalError) as exception:
+            self._log_exception(exception)
+            return ResultType.REJECT_SENDER
+
+        app_hash = self._snapshot_store.restoring_app_hash
+        if round_sequence.root_hash != app_hash:
+            self.context.logger.error(
+                f"The restored state's root hash {round_sequence.root_hash.hex()} "
+                f"does not match the trusted app hash {app_hash.hex()}."
+            )
+            return ResultType.REJECT_SENDER
+
+        self.context.logger.info(
+            f"Restored the state from a snapshot at height {round_sequence.height}."
+        )
+        return ResultType.ACCEPT
+
     @classmethod
     def _check_tx_failed(
         cls, message: AbciMessage, dialogue: AbciDialogue, info: str = ""
@@ -427,6 +1088,8 @@ class AbstractResponseHandler(Handler, ABC):
             AbstractRoundBehaviour, self.context.behaviours.main
         ).current_behaviour
         callback(message, current_behaviour)
+        # the behaviours waiting for the response are resumed right away
+        cast(AbstractRoundBehaviour, self.context.behaviours.main).wake_up()
 
     def _get_dialogues_attribute_name(self) -> str:
         """
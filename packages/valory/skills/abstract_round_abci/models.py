@@ -21,15 +21,18 @@
 
 import inspect
 import json
+import sys
+import tracemalloc
 from abc import ABC, ABCMeta
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from time import time
+from time import perf_counter_ns, thread_time_ns
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
     List,
     Optional,
@@ -69,6 +72,11 @@ NUMBER_OF_RETRIES: int = 5
 DEFAULT_BACKOFF_FACTOR: float = 2.0
 DEFAULT_TYPE_NAME: str = "str"
 DEFAULT_CHAIN = "ethereum"
+BENCHMARK_SAMPLES_FILE = "samples.jsonl"
+# the max number of samples kept for each block until they are saved, the oldest ones are dropped first
+BENCHMARK_MAX_SAMPLES = 10_000
+# `tracemalloc.reset_peak` is only available from Python 3.9
+TRACE_PEAK_ALLOCATIONS = sys.version_info >= (3, 9)
 
 
 class FrozenMixin:  # pylint: disable=too-few-public-methods
@@ -103,10 +111,14 @@ class TypeCheckMixin:  # pylint: disable=too-few-public-methods
             check_type(attr, value, type_)
 
     @classmethod
-    def _ensure(cls, key: str, kwargs: Dict, type_: Any) -> Any:
+    def _ensure(
+        cls, key: str, kwargs: Dict, type_: Any, default: Any = VALUE_NOT_PROVIDED
+    ) -> Any:
         """Get and ensure the configuration field is not None (if no default is provided) and of correct type."""
         enforce("skill_context" in kwargs, "Only use on models!")
         skill_id = kwargs["skill_context"].skill_id
+        if key not in kwargs and default is not VALUE_NOT_PROVIDED:
+            return default
         enforce(
             key in kwargs,
             f"'{key}' of type '{type_}' required, but it is not set in `models.params.args` of `skill.yaml` of `{skill_id}`",
@@ -321,6 +333,22 @@ class BaseParams(
         self.setup_params: Dict[str, Any] = self._ensure("setup", kwargs, dict)
         # TODO add to all configs
         self.default_chain_id: str = kwargs.get("default_chain_id", DEFAULT_CHAIN)
+        # the incremental hash is not compatible with the default one, all the agents of a service need to use the same
+        self.use_incremental_db_hash: bool = kwargs.get(
+            "use_incremental_db_hash", False
+        )
+        # the values of the db become read-only for the behaviours, which need to copy them before modifying them
+        self.use_immutable_db_values: bool = kwargs.get(
+            "use_immutable_db_values", False
+        )
+        # learn about the delivery of the agent's transactions from the local ABCI app instead of polling `/tx`
+        self.use_tx_delivery_events: bool = kwargs.get("use_tx_delivery_events", False)
+        # the address of a `Multicall2` contract, used to batch the read-only contract calls, if set
+        self.multicall_address: Optional[str] = kwargs.get("multicall_address", None)
+        # the number of blocks to keep in memory, all the blocks since the last reset are kept if not set
+        self.blockchain_max_blocks: Optional[int] = self._ensure(
+            "blockchain_max_blocks", kwargs, Optional[int], default=None
+        )
 
         # we sanitize for null values as these are just kept for schema definitions
         skill_id = kwargs["skill_context"].skill_id
@@ -497,14 +525,21 @@ class SharedState(Model, ABC, metaclass=_MetaSharedState):  # type: ignore
 
     def setup(self) -> None:
         """Set up the model."""
-        self._round_sequence = RoundSequence(self.context, self.abci_app_cls)
-        setup_params = cast(BaseParams, self.context.params).setup_params
+        params = cast(BaseParams, self.context.params)
+        self._round_sequence = RoundSequence(
+            self.context,
+            self.abci_app_cls,
+            max_blocks=params.blockchain_max_blocks,
+        )
+        setup_params = params.setup_params
         self.round_sequence.setup(
             BaseSynchronizedData(
                 AbciAppDB(
                     setup_data=AbciAppDB.data_to_lists(setup_params),
                     cross_period_persisted_keys=self.abci_app_cls.cross_period_persisted_keys,
                     logger=self.context.logger,
+                    incremental_hash=params.use_incremental_db_hash,
+                    immutable_values=params.use_immutable_db_values,
                 )
             ),
             self.context.logger,
@@ -759,33 +794,149 @@ class BenchmarkBlockTypes(Enum):
     TOTAL = "total"
 
 
+@dataclass
+class _BlockCounters:
+    """The counters of a block's ongoing measurement, in nanoseconds and bytes."""
+
+    start_ns: int = 0
+    start_cpu_ns: int = 0
+    start_allocated: int = 0
+    peak_allocated: int = 0
+    paused_cpu_ns: int = 0
+    paused_allocated: int = 0
+    pause_cpu_ns: int = 0
+    pause_allocated: int = 0
+
+
 class BenchmarkBlock:
     """
     Benchmark
 
     This class represents logic to measure the code block using a
     context manager.
+
+    Every time the block is measured, a sample is kept with the wall-clock and the CPU time in nanoseconds,
+    and, if `trace_allocations` is set, the net and the peak bytes allocated while running the block,
+    as reported by `tracemalloc`. The peak is only reported on Python 3.9 or later, which can reset it.
+    Only the latest `max_samples` are kept, so that the samples stay bounded between two saves.
+    The `total_time` is the sum of the wall-clock times of all the samples, in seconds.
+
+    The blocks which share the `open_blocks` are measured together. An `exclusive` block,
+    e.g., the handling of an ABCI request while a behaviour's block is suspended on a `yield`,
+    pauses the open blocks, so that its CPU time and allocations are not attributed to them as well.
     """
 
     start: float
     total_time: float
     block_type: str
+    samples: Deque[Dict[str, int]]
 
-    def __init__(self, block_type: str) -> None:
+    def __init__(
+        self,
+        block_type: str,
+        trace_allocations: bool = False,
+        open_blocks: Optional[List["BenchmarkBlock"]] = None,
+        exclusive: bool = False,
+        max_samples: int = BENCHMARK_MAX_SAMPLES,
+    ) -> None:
         """Benchmark for single round."""
         self.block_type = block_type
+        self.trace_allocations = trace_allocations
+        self.open_blocks = open_blocks if open_blocks is not None else []
+        self.exclusive = exclusive
         self.start = 0
         self.total_time = 0
+        self.samples = deque(maxlen=max_samples)
+        self._counters = _BlockCounters()
+
+    @property
+    def _is_tracing(self) -> bool:
+        """Whether the allocations of the block are traced."""
+        return self.trace_allocations and tracemalloc.is_tracing()
+
+    def _update_peak(self) -> None:
+        """Update the peak bytes allocated by the block since the last reset of the peak."""
+        _, peak = tracemalloc.get_traced_memory()
+        self._counters.peak_allocated = max(
+            self._counters.peak_allocated,
+            peak - self._counters.start_allocated - self._counters.paused_allocated,
+        )
+
+    def _reset_peak(self) -> None:
+        """Reset the peak, after updating the peaks of the open blocks which rely on it."""
+        if not TRACE_PEAK_ALLOCATIONS:
+            return
+        for block in self.open_blocks:
+            block._update_peak()  # pylint: disable=protected-access
+        tracemalloc.reset_peak()  # pylint: disable=no-member
+
+    def _pause(self) -> None:
+        """Pause the measurement of the block."""
+        self._counters.pause_cpu_ns = thread_time_ns()
+        if self._is_tracing:
+            if TRACE_PEAK_ALLOCATIONS:
+                self._update_peak()
+            self._counters.pause_allocated, _ = tracemalloc.get_traced_memory()
+
+    def _resume(self) -> None:
+        """Resume the measurement of the block, leaving out what happened while it was paused."""
+        self._counters.paused_cpu_ns += thread_time_ns() - self._counters.pause_cpu_ns
+        if self._is_tracing:
+            allocated, _ = tracemalloc.get_traced_memory()
+            self._counters.paused_allocated += (
+                allocated - self._counters.pause_allocated
+            )
 
     def __enter__(
         self,
     ) -> None:
         """Enter context."""
-        self.start = time()
+        if self.exclusive:
+            for block in self.open_blocks:
+                block._pause()  # pylint: disable=protected-access
+        self._counters.paused_cpu_ns = 0
+        self._counters.paused_allocated = 0
+        self._counters.peak_allocated = 0
+        if self._is_tracing:
+            if not self.exclusive:
+                self._reset_peak()
+            elif TRACE_PEAK_ALLOCATIONS:
+                tracemalloc.reset_peak()  # pylint: disable=no-member
+            self._counters.start_allocated, _ = tracemalloc.get_traced_memory()
+        if not self.exclusive:
+            self.open_blocks.append(self)
+        self._counters.start_cpu_ns = thread_time_ns()
+        self._counters.start_ns = perf_counter_ns()
+        self.start = self._counters.start_ns / 1e9
 
     def __exit__(self, *args: List, **kwargs: Dict) -> None:
         """Exit context"""
-        self.total_time = time() - self.start
+        wall_ns = perf_counter_ns() - self._counters.start_ns
+        cpu_ns = (
+            thread_time_ns()
+            - self._counters.start_cpu_ns
+            - self._counters.paused_cpu_ns
+        )
+        sample = {"wall_ns": wall_ns, "cpu_ns": cpu_ns}
+        if self._is_tracing:
+            allocated, _ = tracemalloc.get_traced_memory()
+            sample["alloc_bytes"] = (
+                allocated
+                - self._counters.start_allocated
+                - self._counters.paused_allocated
+            )
+            if TRACE_PEAK_ALLOCATIONS:
+                self._update_peak()
+                sample["peak_bytes"] = self._counters.peak_allocated
+        if self in self.open_blocks:
+            self.open_blocks.remove(self)
+        if self.exclusive:
+            for block in self.open_blocks:
+                block._resume()  # pylint: disable=protected-access
+            if self._is_tracing and TRACE_PEAK_ALLOCATIONS:
+                tracemalloc.reset_peak()  # pylint: disable=no-member
+        self.samples.append(sample)
+        self.total_time += wall_ns / 1e9
 
 
 class BenchmarkBehaviour:
@@ -799,9 +950,15 @@ class BenchmarkBehaviour:
 
     def __init__(
         self,
+        trace_allocations: bool = False,
+        open_blocks: Optional[List[BenchmarkBlock]] = None,
+        max_samples: int = BENCHMARK_MAX_SAMPLES,
     ) -> None:
         """Initialize Benchmark behaviour object."""
         self.local_data = {}
+        self.trace_allocations = trace_allocations
+        self.open_blocks = open_blocks if open_blocks is not None else []
+        self.max_samples = max_samples
 
     def _measure(self, block_type: str) -> BenchmarkBlock:
         """
@@ -812,7 +969,12 @@ class BenchmarkBehaviour:
         """
 
         if block_type not in self.local_data:
-            self.local_data[block_type] = BenchmarkBlock(block_type)
+            self.local_data[block_type] = BenchmarkBlock(
+                block_type,
+                self.trace_allocations,
+                self.open_blocks,
+                max_samples=self.max_samples,
+            )
 
         return self.local_data[block_type]
 
@@ -834,25 +996,63 @@ class BenchmarkTool(Model, TypeCheckMixin, FrozenMixin):
     BenchmarkTool
 
     Tool to benchmark ABCI apps.
+
+    Besides the per-period JSON files, `save` appends the samples of the period,
+    including the timings of the ABCI requests handled during each round, to the `samples.jsonl` stream of the agent.
+    At most `max_samples` samples are kept for each block between two saves.
     """
 
     benchmark_data: Dict[str, BenchmarkBehaviour]
+    abci_data: Dict[Tuple[Optional[str], str], BenchmarkBlock]
     log_dir: Path
+    trace_allocations: bool
+    max_samples: int
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Benchmark tool for rounds behaviours."""
         self.benchmark_data = {}
+        self.abci_data = {}
+        self.open_blocks: List[BenchmarkBlock] = []
         log_dir_ = self._ensure("log_dir", kwargs, str)
         self.log_dir = Path(log_dir_)
+        self.trace_allocations = kwargs.pop("trace_allocations", False)
+        self.max_samples = kwargs.pop("max_samples", BENCHMARK_MAX_SAMPLES)
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
         super().__init__(*args, **kwargs)
         self._frozen = True
 
     def measure(self, behaviour: str) -> BenchmarkBehaviour:
         """Measure time to complete round."""
         if behaviour not in self.benchmark_data:
-            self.benchmark_data[behaviour] = BenchmarkBehaviour()
+            self.benchmark_data[behaviour] = BenchmarkBehaviour(
+                self.trace_allocations, self.open_blocks, self.max_samples
+            )
         return self.benchmark_data[behaviour]
 
+    def measure_abci(
+        self, request_type: str, round_id: Optional[str]
+    ) -> BenchmarkBlock:
+        """
+        Measure the handling of an ABCI request.
+
+        The request is measured apart from the behaviours' blocks which are open while it is handled.
+
+        :param request_type: the type of the request, e.g., `deliver_tx` or `commit`.
+        :param round_id: the id of the round during which the request is handled.
+        :return: the BenchmarkBlock keeping the samples of the request type for the round.
+        """
+        key = (round_id, request_type)
+        if key not in self.abci_data:
+            self.abci_data[key] = BenchmarkBlock(
+                request_type,
+                self.trace_allocations,
+                self.open_blocks,
+                exclusive=True,
+                max_samples=self.max_samples,
+            )
+        return self.abci_data[key]
+
     @property
     def data(
         self,
@@ -867,6 +1067,32 @@ class BenchmarkTool(Model, TypeCheckMixin, FrozenMixin):
 
         return behavioural_data
 
+    def samples(self, period: int = 0) -> List[Dict[str, Any]]:
+        """
+        Returns all the samples, one record per sample.
+
+        :param period: the period the samples belong to.
+        :return: the behaviours' samples, followed by the ABCI requests' ones.
+        """
+        records: List[Dict[str, Any]] = []
+        for behaviour, tool in self.benchmark_data.items():
+            for block_type, block in tool.local_data.items():
+                records.extend(
+                    {
+                        "period": period,
+                        "behaviour": behaviour,
+                        "block": block_type,
+                        **sample,
+                    }
+                    for sample in block.samples
+                )
+        for (round_id, request_type), block in self.abci_data.items():
+            records.extend(
+                {"period": period, "round": round_id, "abci": request_type, **sample}
+                for sample in block.samples
+            )
+        return records
+
     def save(self, period: int = 0, reset: bool = True) -> None:
         """Save logs to a file."""
 
@@ -878,6 +1104,13 @@ class BenchmarkTool(Model, TypeCheckMixin, FrozenMixin):
 
             with open(str(filepath), "w+", encoding="utf-8") as outfile:
                 json.dump(self.data, outfile)
+
+            with open(
+                str(agent_dir / BENCHMARK_SAMPLES_FILE), "a", encoding="utf-8"
+            ) as samples_file:
+                samples_file.writelines(
+                    json.dumps(record) + "\n" for record in self.samples(period)
+                )
             self.context.logger.debug(f"Saving benchmarking data for period: {period}")
 
         except PermissionError as e:  # pragma: nocover
@@ -891,3 +1124,4 @@ class BenchmarkTool(Model, TypeCheckMixin, FrozenMixin):
     ) -> None:
         """Reset benchmark data"""
         self.benchmark_data.clear()
+        self.abci_data.clear()
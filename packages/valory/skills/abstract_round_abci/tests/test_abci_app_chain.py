@@ -22,6 +22,7 @@
 # pylint: skip-file
 
 import logging
+from time import perf_counter
 from typing import Dict, Set, Tuple, Type
 from unittest.mock import MagicMock
 
@@ -31,6 +32,7 @@ from aea.exceptions import AEAEnforceError
 
 from packages.valory.skills.abstract_round_abci.abci_app_chain import (
     AbciAppTransitionMapping,
+    _check_db_conditions_on_paths,
     chain,
 )
 from packages.valory.skills.abstract_round_abci.base import (
@@ -60,6 +62,61 @@ def make_round_class(name: str, bases: Tuple = (AbstractRound,)) -> Type[Abstrac
     return new_round_cls
 
 
+def make_wide_chain(
+    n_apps: int, n_final_states: int, missing_key: bool = False
+) -> Tuple[Tuple[Type[AbciApp], ...], AbciAppTransitionMapping]:
+    """
+    Make a chain of apps, where every final state of an app leads to the next app.
+
+    Every final state of the `i`th app sets the key `i` and a key of its own,
+    the `i`th app requires the key `i - 1`. The number of paths through the
+    chain is `n_final_states ** (n_apps - 1)`.
+
+    :param n_apps: the number of apps in the chain.
+    :param n_final_states: the number of final states of every app.
+    :param missing_key: whether the last app requires a key which is never set.
+    :return: the apps and the transition mapping of the chain.
+    """
+    apps = []
+    mapping: AbciAppTransitionMapping = {}
+    for i in range(n_apps):
+        initial_round = make_round_class(f"round_{i}")
+        final_rounds = [
+            make_round_class(f"round_{i}_{j}", (DegenerateRound,))
+            for j in range(n_final_states)
+        ]
+        pre_conditions = set() if i == 0 else {str(i - 1)}
+        if missing_key and i == n_apps - 1:
+            pre_conditions.add("missing")
+
+        app = type(
+            f"AbciApp{i}",
+            (AbciApp,),
+            {
+                "initial_round_cls": initial_round,
+                "transition_function": {
+                    initial_round: {
+                        f"event_{i}_{j}": final_round
+                        for j, final_round in enumerate(final_rounds)
+                    },
+                    **{final_round: {} for final_round in final_rounds},
+                },
+                "final_states": set(final_rounds),
+                "event_to_timeout": {},
+                "db_pre_conditions": {initial_round: pre_conditions},
+                "db_post_conditions": {
+                    final_round: {str(i), f"{i}_{j}"}
+                    for j, final_round in enumerate(final_rounds)
+                },
+            },
+        )
+        if apps:
+            for final_round in apps[-1].final_states:
+                mapping[final_round] = initial_round
+        apps.append(app)
+    return tuple(apps), mapping
+
+
 class TestAbciAppChaining:
     """Test chaning of AbciApps."""
 
@@ -506,3 +563,76 @@ class TestAbciAppChaining:
         expected = "No pre-conditions have been set for .*! You need to explicitly specify them as empty if there are no pre-conditions for this FSM."
         with pytest.raises(ValueError, match=expected):
             chain((self.app1_class, AbciApp2), abci_app_transition_mapping)
+
+    def test_db_post_conditions_of_wide_chain(self) -> None:
+        """Test the post-conditions of the chain only contain the keys set on every path."""
+
+        apps, mapping = make_wide_chain(n_apps=4, n_final_states=3)
+        composed_app = chain(apps, mapping)
+        assert composed_app.db_post_conditions == {
+            final_state: {"0", "1", "2"} for final_state in apps[-1].final_states
+        }
+
+    def test_precondition_missing_on_wide_chain_raises(self) -> None:
+        """Test the error is the one of the first inconsistent path."""
+
+        apps, mapping = make_wide_chain(n_apps=4, n_final_states=3, missing_key=True)
+        initial_state_to_app = {app.initial_round_cls: app for app in apps[1:]}
+        with pytest.raises(ValueError) as expected:
+            _check_db_conditions_on_paths(apps[0], mapping, initial_state_to_app)
+        with pytest.raises(ValueError) as actual:
+            chain(apps, mapping)
+        assert str(actual.value) == str(expected.value)
+        assert "Pre conditions '{'missing'}' of app" in str(actual.value)
+
+    def test_precondition_missing_on_unchecked_path(self) -> None:
+        """Test an app which is only re-entered after a loop is not checked on that path."""
+
+        round_3d = make_round_class("round_3d")
+
+        class AbciApp3(AbciApp):
+            initial_round_cls = self.round_3a
+            initial_states = {self.round_3a, round_3d}
+            transition_function = {
+                self.round_3a: {self.event_3c: self.round_3c},
+                round_3d: {self.event_3c: self.round_3c},
+                self.round_3c: {},
+            }
+            final_states = {self.round_3c}
+            event_to_timeout: Dict[str, float] = {}
+            db_pre_conditions: Dict[AppState, Set[str]] = {
+                self.round_3a: set(),
+                round_3d: {self.key_3},
+            }
+            db_post_conditions: Dict[AppState, Set[str]] = {self.round_3c: set()}
+
+        # app 1 -> app 3 -> app 2 -> app 3 again, the paths stop at the loop
+        abci_app_transition_mapping: AbciAppTransitionMapping = {
+            self.round_1c: self.round_3a,
+            self.round_3c: self.round_2a,
+            self.round_2c: round_3d,
+        }
+        composed_app = chain(
+            (self.app1_class, AbciApp3, self.app2_class), abci_app_transition_mapping
+        )
+        assert composed_app.db_post_conditions == {}
+
+    @pytest.mark.benchmark
+    def test_chain_benchmark(self) -> None:
+        """Benchmark the fixed-point check of the DB conditions against the enumeration of the paths."""
+        n_apps, n_final_states = 9, 3
+        apps, mapping = make_wide_chain(n_apps=n_apps, n_final_states=n_final_states)
+        initial_state_to_app = {app.initial_round_cls: app for app in apps[1:]}
+
+        start = perf_counter()
+        _check_db_conditions_on_paths(apps[0], mapping, initial_state_to_app)
+        paths_duration = perf_counter() - start
+
+        start = perf_counter()
+        chain(apps, mapping)
+        chain_duration = perf_counter() - start
+
+        logging.info(
+            f"Checking the DB conditions of a chain of {n_apps} apps with {n_final_states} final states each "
+            f"took {paths_duration:.4f}s by enumerating the paths and the whole chain took {chain_duration:.4f}s."
+        )
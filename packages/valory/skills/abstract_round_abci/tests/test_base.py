@@ -25,6 +25,7 @@ import json
 import logging
 import re
 import shutil
+import tracemalloc
 from abc import ABC
 from calendar import timegm
 from collections import deque
@@ -33,7 +34,8 @@ from copy import copy, deepcopy
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from time import sleep
+from time import perf_counter, sleep
+from types import SimpleNamespace
 from typing import (
     Any,
     Callable,
@@ -81,6 +83,7 @@ from packages.valory.protocols.abci.custom_types import (
     Evidence,
     EvidenceType,
     Evidences,
+    Header,
     LastCommitInfo,
     Timestamp,
     Validator,
@@ -426,6 +429,71 @@ class TestBlockchain:
         """Test 'blocks' property getter."""
         assert self.blockchain.blocks == tuple()
 
+    def test_invalid_max_blocks(self) -> None:
+        """Test that the number of retained blocks must be positive."""
+        with pytest.raises(
+            ValueError, match="`max_blocks` must be a positive integer, got 0"
+        ):
+            Blockchain(max_blocks=0)
+
+    @pytest.mark.parametrize("height_offset", (0, 5))
+    def test_bounded_retention(self, height_offset: int) -> None:
+        """Test that only the last blocks are retained while the height keeps growing."""
+        max_blocks, n_blocks = 3, 10
+        blockchain = Blockchain(height_offset=height_offset, max_blocks=max_blocks)
+        assert blockchain.max_blocks == max_blocks
+        for height in range(height_offset + 1, height_offset + n_blocks + 1):
+            blockchain.add_block(Block(MagicMock(height=height), []))
+
+        assert blockchain.length == n_blocks
+        assert blockchain.height == n_blocks + height_offset
+        assert len(blockchain.blocks) == max_blocks
+        assert [block.header.height for block in blockchain.blocks] == list(
+            range(height_offset + n_blocks - max_blocks + 1, blockchain.height + 1)
+        )
+        assert blockchain.last_block.header.height == blockchain.height
+        # the next block is still validated against the full height
+        with pytest.raises(AddBlockError):
+            blockchain.add_block(Block(MagicMock(height=height_offset + 1), []))
+
+    @pytest.mark.benchmark
+    def test_bounded_retention_soak(self) -> None:
+        """Soak test showing that the memory stays flat when the retention is bounded."""
+        n_blocks, checkpoint = 20_000, 5_000
+
+        def _add_blocks(blockchain: Blockchain) -> Tuple[int, int]:
+            """Add the blocks and return the traced memory at the checkpoint and at the end."""
+            tracemalloc.start()
+            at_checkpoint = 0
+            for height in range(1, n_blocks + 1):
+                # a plain object, since mocks keep references to their calls
+                header = cast(
+                    Header,
+                    SimpleNamespace(height=height, timestamp=datetime.datetime.now()),
+                )
+                transactions = [
+                    Transaction(PayloadA(f"sender_{height}_{i}"), "0x" + "0" * 130)
+                    for i in range(2)
+                ]
+                blockchain.add_block(Block(header, transactions))
+                if height == checkpoint:
+                    at_checkpoint = tracemalloc.get_traced_memory()[0]
+            at_end = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return at_checkpoint, at_end
+
+        unbounded_checkpoint, unbounded_end = _add_blocks(Blockchain())
+        bounded_checkpoint, bounded_end = _add_blocks(Blockchain(max_blocks=100))
+
+        logging.info(
+            f"Memory after {checkpoint} and {n_blocks} blocks: "
+            f"{unbounded_checkpoint / 1024:.1f}KiB and {unbounded_end / 1024:.1f}KiB when unbounded, "
+            f"{bounded_checkpoint / 1024:.1f}KiB and {bounded_end / 1024:.1f}KiB when retaining 100 blocks."
+        )
+        assert unbounded_end > 3 * unbounded_checkpoint
+        assert bounded_end < 1.1 * bounded_checkpoint
+        assert bounded_end < unbounded_end / 10
+
 
 class TestBlockBuilder:
     """Test block builder."""
@@ -675,6 +743,17 @@ class TestAbciAppDB:
             f"by updating the item(s) retrieved via the `{mutable_getters}` method(s)!"
         )
 
+    def test_get_history(self) -> None:
+        """Test getting the history of a key."""
+        self.db.update(key=["first"])
+        self.db.update(key=["second"])
+        history = self.db.get_history("key")
+        assert history == [["first"], ["second"]]
+        history[-1].append("new_value_attempt")
+        assert self.db.get("key") == ["second"]
+        with pytest.raises(ValueError, match="'inexistent' field is not set"):
+            self.db.get_history("inexistent")
+
     def test_increment_round_count(self) -> None:
         """Test increment_round_count."""
         assert self.db.round_count == -1
@@ -1017,6 +1096,184 @@ class TestAbciAppDB:
         )
         assert self.db.hash() == expected_hash
 
+    @staticmethod
+    def _cross_period_setup_data() -> Dict[str, List[Any]]:
+        """Get setup data which contain all the default cross period keys."""
+        return AbciAppDB.data_to_lists(
+            dict.fromkeys(AbciAppDB.default_cross_period_keys, "value")
+        )
+
+    @staticmethod
+    def _hashes_after_operations(db: AbciAppDB) -> List[bytes]:
+        """Apply a sequence of operations on the given db and get the hash after each one of them."""
+        operations = (
+            lambda: db.update(participants=("a", "b", "c"), other={"nested": [1, 2]}),
+            lambda: db.update(other={"nested": [3]}),
+            db.create,
+            lambda: db.update(other=1),
+            lambda: db.update(other=2),
+            lambda: db.cleanup_current_histories(1),
+            lambda: setattr(db, "slashing_config", "slashing_config"),
+            lambda: db.cleanup(1),
+            lambda: db.sync(db.serialize()),
+        )
+        hashes = [db.hash()]
+        for operation in operations:
+            operation()
+            hashes.append(db.hash())
+            # a new db synced with the same data must produce the same hash with a cold cache
+            fresh_db = AbciAppDB(setup_data={}, incremental_hash=db.incremental_hash)
+            fresh_db.sync(db.serialize())
+            assert fresh_db.hash() == hashes[-1]
+        return hashes
+
+    def test_incremental_hash(self) -> None:
+        """Test the incremental hash, which should always match a hash computed from scratch."""
+        db = AbciAppDB(
+            setup_data=self._cross_period_setup_data(), incremental_hash=True
+        )
+        assert db.incremental_hash
+        assert not self.db.incremental_hash
+
+        hashes = self._hashes_after_operations(db)
+        # only the sync leaves the data unchanged
+        assert len(set(hashes)) == len(hashes) - 1
+        assert hashes[-1] == hashes[-2]
+
+        # the incremental hash is not compatible with the default one
+        full_hash_db = AbciAppDB(setup_data=self._cross_period_setup_data())
+        assert not set(hashes) & set(self._hashes_after_operations(full_hash_db))
+
+    def test_incremental_hash_order_independent(self) -> None:
+        """Test that the incremental hash does not depend on the insertion order of the keys."""
+        db_a = AbciAppDB(setup_data=dict(a=[1], b=[2]), incremental_hash=True)
+        db_b = AbciAppDB(setup_data=dict(b=[2], a=[1]), incremental_hash=True)
+        assert db_a.hash() == db_b.hash()
+        # the value of a key should not be confused with the name of another
+        db_c = AbciAppDB(setup_data=dict(a=[2], b=[1]), incremental_hash=True)
+        assert db_a.hash() != db_c.hash()
+
+    @pytest.mark.benchmark
+    def test_hash_benchmark(self) -> None:
+        """Benchmark the incremental hash against the full serialization one, on a large history."""
+        n_periods, n_keys, history_depth, n_rounds = 10, 20, 50, 100
+
+        def populate(db: AbciAppDB) -> None:
+            """Populate the db."""
+            for period in range(n_periods):
+                if period:
+                    db.create()
+                for _ in range(history_depth):
+                    db.update(
+                        **{f"key_{i}": {"value": [period] * 10} for i in range(n_keys)}
+                    )
+
+        # the full serialization hash logs the whole db on debug level, we do not want to measure this
+        logger = logging.getLogger("test_hash_benchmark")
+        logger.setLevel(logging.INFO)
+        durations = {}
+        for incremental_hash in (False, True):
+            db = AbciAppDB(
+                setup_data=self._cross_period_setup_data(),
+                logger=logger,
+                incremental_hash=incremental_hash,
+            )
+            populate(db)
+            db.hash()
+            start = perf_counter()
+            for round_ in range(n_rounds):
+                db.update(key_0=round_)
+                db.hash()
+            durations[incremental_hash] = perf_counter() - start
+
+        logging.info(
+            f"Hashing a db of {n_periods} periods, {n_keys} keys and {history_depth} history depth {n_rounds} times "
+            f"took {durations[False]:.4f}s with the full serialization and {durations[True]:.4f}s incrementally."
+        )
+
+    def test_immutable_values(self) -> None:
+        """Test the db with immutable values."""
+        value = {"nested": [1, 2]}
+        setup_data = self._cross_period_setup_data()
+        setup_data.update(value=[value], participants=[["a", "b"]])
+        db = AbciAppDB(setup_data=setup_data, immutable_values=True)
+        mutable_db = AbciAppDB(setup_data=deepcopy(setup_data))
+        assert db.immutable_values
+        assert not mutable_db.immutable_values
+
+        # the values are frozen on insert and the inputs are not affected
+        value["nested"].append(3)
+        assert db.get("value") == {"nested": [1, 2]}
+        db.update(other=value)
+        value["nested"].append(4)
+        assert db.get("other") == {"nested": [1, 2, 3]}
+
+        # the values are returned by reference, but they cannot be modified
+        assert db.get("other") is db.get("other")
+        assert db.get_latest()["other"] is db.get("other")
+        with pytest.raises(TypeError, match="object is immutable"):
+            db.get("other")["nested"].append(5)
+        with pytest.raises(TypeError, match="object is immutable"):
+            db.get_latest()["other"]["new"] = 5
+        assert db.get("other") == {"nested": [1, 2, 3]}
+
+        # the behaviour of the db is not affected otherwise
+        mutable_db.update(other={"nested": [1, 2, 3]})
+        for db_ in (db, mutable_db):
+            db_.create()
+            db_.sync(db_.serialize())
+        assert db.serialize() == mutable_db.serialize()
+        assert db.hash() == mutable_db.hash()
+        with pytest.raises(TypeError, match="object is immutable"):
+            db.get("participants").append("c")
+
+    @pytest.mark.benchmark
+    def test_immutable_values_benchmark(self) -> None:
+        """Benchmark the reads of the db with immutable values against the ones of the default db."""
+        n_agents, n_reads = 4, 1_000
+        agents = [f"0x{i:040x}" for i in range(n_agents)]
+        # a shape similar to the ones of the synchronized data of price estimation services
+        setup_data = self._cross_period_setup_data()
+        setup_data.update(
+            AbciAppDB.data_to_lists(
+                {
+                    "participant_to_observations": {
+                        agent: {
+                            "sender": agent,
+                            "round_count": 1,
+                            "observations": [
+                                {"price": float(i), "timestamp": i} for i in range(50)
+                            ],
+                        }
+                        for agent in agents
+                    },
+                    "most_voted_tx_hash": "0x" + "0" * 64,
+                    "history": [list(range(100)) for _ in range(10)],
+                }
+            )
+        )
+
+        durations, peaks = {}, {}
+        for immutable_values in (False, True):
+            db = AbciAppDB(setup_data=setup_data, immutable_values=immutable_values)
+            tracemalloc.start()
+            start = perf_counter()
+            reads = [
+                (db.get("participant_to_observations"), db.get("history"))
+                for _ in range(n_reads)
+            ]
+            durations[immutable_values] = perf_counter() - start
+            peaks[immutable_values] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del reads
+
+        logging.info(
+            f"{n_reads} reads took {durations[False]:.4f}s with a peak memory of {peaks[False] / 1024:.1f}KiB "
+            f"using the default db and {durations[True]:.4f}s with a peak memory of {peaks[True] / 1024:.1f}KiB "
+            "using the db with immutable values."
+        )
+        assert peaks[True] < peaks[False]
+
 
 class TestBaseSynchronizedData:
     """Test 'BaseSynchronizedData' class."""
@@ -2386,6 +2643,24 @@ class TestRoundSequence:
         self.round_sequence.setup(MagicMock(), logging.getLogger())
         self.round_sequence.tm_height = 1
 
+    def test_delivered_txs(self) -> None:
+        """Test keeping track of the delivered transactions."""
+        assert self.round_sequence.n_delivered_txs == 0
+        assert self.round_sequence.get_delivered_tx("ABCD") is None
+
+        self.round_sequence.add_delivered_tx("ABCD", is_ok=True)
+        self.round_sequence.add_delivered_tx("EF01", is_ok=False)
+        assert self.round_sequence.n_delivered_txs == 2
+        assert self.round_sequence.get_delivered_tx("abcd") is True
+        assert self.round_sequence.get_delivered_tx("EF01") is False
+
+        with mock.patch.object(abci_base, "NUMBER_OF_DELIVERED_TXS_TRACKED", 2):
+            self.round_sequence.add_delivered_tx("2345", is_ok=True)
+        # the oldest transaction is not tracked anymore, the counter keeps increasing
+        assert self.round_sequence.get_delivered_tx("ABCD") is None
+        assert self.round_sequence.get_delivered_tx("2345") is True
+        assert self.round_sequence.n_delivered_txs == 3
+
     @pytest.mark.parametrize(
         "property_name, set_twice_exc, config_exc",
         (
@@ -3181,6 +3456,63 @@ class TestRoundSequence:
                         serialized_db_state,
                     )
 
+    @staticmethod
+    def _real_round_sequence() -> RoundSequence:
+        """Get a round sequence which uses a real database."""
+        round_sequence = RoundSequence(context=MagicMock(), abci_app_cls=AbciAppTest)
+        db = AbciAppDB(setup_data={"participants": [["a", "b"]]})
+        round_sequence.setup(BaseSynchronizedData(db), logging.getLogger())
+        return round_sequence
+
+    def test_serialize_and_load_state(self) -> None:
+        """Test that a serialized state can be loaded by a different round sequence."""
+        source = self._real_round_sequence()
+        source.latest_synchronized_data.db.update(dummy="value")
+        source.abci_app.schedule_round(ConcreteRoundB)
+        source.init_chain(11)
+        source.tm_height = 10
+        source._last_round_transition_height = 10
+        source._last_round_transition_timestamp = datetime.datetime(2023, 1, 1)
+        source._offence_status = {"a": OffenceStatus()}
+        state = source.serialize_state()
+
+        target = self._real_round_sequence()
+        target.load_state(state)
+        assert target.height == source.height == 10
+        assert target.tm_height == 10
+        assert target.current_round_id == ConcreteRoundB.auto_round_id()
+        assert target.root_hash == source.root_hash
+        assert target.last_round_transition_root_hash == source.root_hash
+        assert (
+            target.latest_synchronized_data.round_count
+            == source.latest_synchronized_data.round_count
+        )
+        assert target.last_round_transition_timestamp == datetime.datetime(2023, 1, 1)
+        assert target.offence_status == {"a": OffenceStatus()}
+        assert target.serialize_state() == state
+
+        # the blockchain continues from the loaded height
+        target.blockchain.add_block(Block(MagicMock(height=11), []))
+        assert target.height == 11
+
+    @pytest.mark.parametrize(
+        "state, match",
+        (
+            (b"not json", "Could not load the serialized state"),
+            (b"{}", "Could not load the serialized state"),
+            (
+                json.dumps(
+                    {"height": 1, "current_round_id": "unknown", "db": ""}
+                ).encode(),
+                "Found the unknown round id unknown",
+            ),
+        ),
+    )
+    def test_load_state_negative(self, state: bytes, match: str) -> None:
+        """Test loading an invalid state."""
+        with pytest.raises(ABCIAppInternalError, match=match):
+            self._real_round_sequence().load_state(state)
+
     def test_reset_to_default_params(self) -> None:
         """Tests _reset_to_default_params."""
         # we set some values to the parameters, to make sure that they are not "empty"
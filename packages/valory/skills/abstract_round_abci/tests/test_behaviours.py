@@ -47,6 +47,7 @@ from packages.valory.skills.abstract_round_abci.base import (
     RoundSequence,
 )
 from packages.valory.skills.abstract_round_abci.behaviour_utils import (
+    AsyncBehaviour,
     BaseBehaviour,
     DegenerateBehaviour,
     TmManager,
@@ -634,6 +635,79 @@ class TestAbstractRoundBehaviour:
             assert isinstance(self.behaviour.current_behaviour, BehaviourB)
             clean_up_mock.assert_called_once()
 
+    def test_wake_up_with_round_change(self) -> None:
+        """Test that the 'wake_up' method starts the behaviour of the next round straight away."""
+        self.round_sequence_mock.current_round = RoundA(MagicMock(), MagicMock())
+        self.round_sequence_mock.current_round_height = 0
+        self.behaviour.setup()
+        self.behaviour.act()
+        assert isinstance(self.behaviour.current_behaviour, BehaviourA)
+
+        self.round_sequence_mock.current_round = RoundB(MagicMock(), MagicMock())
+        self.round_sequence_mock.current_round_height = 1
+        self.behaviour.wake_up()
+        assert isinstance(self.behaviour.current_behaviour, BehaviourB)
+        # the behaviour of the next round has been started without waiting for a tick
+        assert (
+            self.behaviour.current_behaviour.state == AsyncBehaviour.AsyncState.RUNNING
+        )
+
+    def test_wake_up_no_round_change(self) -> None:
+        """Test that the 'wake_up' method wakes the current and the background behaviours up."""
+        self.round_sequence_mock.current_round = RoundA(MagicMock(), MagicMock())
+        self.round_sequence_mock.current_round_height = 0
+        self.behaviour.context.params.use_termination = True
+        self.behaviour.setup()
+        self.behaviour.act()
+        current_behaviour = self.behaviour.current_behaviour
+        assert current_behaviour is not None
+
+        with mock.patch.object(
+            current_behaviour, "wake_up"
+        ) as wake_up_mock, mock.patch.object(
+            current_behaviour, "clean_up"
+        ) as clean_up_mock, mock.patch.object(
+            ConcreteBackgroundBehaviour, "wake_up"
+        ) as background_wake_up_mock:
+            self.behaviour.wake_up()
+            wake_up_mock.assert_called_once()
+            background_wake_up_mock.assert_called_once()
+            assert self.behaviour.current_behaviour is current_behaviour
+
+            # check that a behaviour which is done after waking up is cleaned up
+            current_behaviour.set_done()
+            self.behaviour.wake_up()
+            assert self.behaviour.current_behaviour is None
+            clean_up_mock.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("mock_tm_communication_unhealthy", "mock_is_acting"),
+        [(True, False), (False, True)],
+    )
+    def test_wake_up_while_fixing_tm(
+        self, mock_tm_communication_unhealthy: bool, mock_is_acting: bool
+    ) -> None:
+        """Test that the 'wake_up' method does nothing while tendermint is unhealthy or being fixed."""
+        self.behaviour.tm_manager = self.behaviour.instantiate_behaviour_cls(TmManager)  # type: ignore
+        with mock.patch.object(
+            TmManager,
+            "tm_communication_unhealthy",
+            new_callable=mock.PropertyMock,
+            return_value=mock_tm_communication_unhealthy,
+        ), mock.patch.object(
+            TmManager,
+            "is_acting",
+            new_callable=mock.PropertyMock,
+            return_value=mock_is_acting,
+        ), mock.patch.object(
+            TmManager, "try_fix"
+        ) as mock_try_fix, mock.patch.object(
+            self.behaviour, "act"
+        ) as mock_act:
+            self.behaviour.wake_up()
+            mock_try_fix.assert_not_called()
+            mock_act.assert_not_called()
+
     @mock.patch.object(
         AbstractRoundBehaviour,
         "_process_current_round",
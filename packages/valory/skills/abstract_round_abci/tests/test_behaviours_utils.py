@@ -26,6 +26,7 @@ import time
 from abc import ABC
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from pathlib import Path
 from typing import (
     Any,
@@ -49,6 +50,7 @@ from _pytest.logging import LogCaptureFixture
 # pylint: skip-file
 from aea.common import JSONLike
 from aea.protocols.base import Message
+from aea.protocols.dialogue.base import Dialogue
 from aea.test_tools.utils import as_context
 from aea_test_autonomy.helpers.base import try_send
 from hypothesis import given, settings
@@ -58,6 +60,7 @@ from packages.open_aea.protocols.signing import SigningMessage
 from packages.valory.connections.http_client.connection import HttpDialogues
 from packages.valory.connections.ipfs.connection import IpfsDialogues
 from packages.valory.connections.ipfs.connection import PUBLIC_ID as IPFS_CONNECTION_ID
+from packages.valory.protocols.contract_api import ContractApiMessage
 from packages.valory.protocols.http import HttpMessage
 from packages.valory.protocols.ipfs import IpfsMessage
 from packages.valory.protocols.ipfs.dialogues import IpfsDialogue
@@ -77,6 +80,7 @@ from packages.valory.skills.abstract_round_abci.base import (
     DegenerateRound,
     LEDGER_API_ADDRESS,
     OK_CODE,
+    RoundSequence,
     Transaction,
 )
 from packages.valory.skills.abstract_round_abci.behaviour_utils import (
@@ -371,6 +375,175 @@ def test_async_behaviour_sleep() -> None:
     ).total_seconds() > timedelta
 
 
+def test_async_behaviour_wait_for_wake_up() -> None:
+    """Test that a suspended behaviour is only resumed when a wake-up condition is met."""
+
+    token = 0
+
+    class MyAsyncBehaviour(AsyncBehaviourTest):
+        counter = 0
+
+        def async_act(self) -> Generator:
+            self.counter += 1
+            yield from self.wait_for_wake_up(token=lambda: token)
+            self.counter += 1
+            yield from self.wait_for_wake_up(deadline=time.monotonic() + 0.05)
+            self.counter += 1
+
+    behaviour = MyAsyncBehaviour()
+    behaviour.act()
+    assert behaviour.counter == 1
+    assert behaviour.is_suspended
+
+    # the generator is not resumed while the token does not change
+    behaviour.act()
+    assert behaviour.counter == 1
+
+    token += 1
+    assert not behaviour.is_suspended
+    behaviour.act()
+    assert behaviour.counter == 2
+    assert behaviour.is_suspended
+
+    # the generator is not resumed before the deadline
+    behaviour.act()
+    assert behaviour.counter == 2
+
+    time.sleep(0.1)
+    assert not behaviour.is_suspended
+    behaviour.act()
+    assert behaviour.counter == 3
+    assert behaviour.state == AsyncBehaviour.AsyncState.READY
+    assert not behaviour.is_suspended
+
+
+def test_async_behaviour_wake_up() -> None:
+    """Test that a suspended behaviour is resumed right away when it is woken up and its wake-up condition is met."""
+
+    token = 0
+
+    class MyAsyncBehaviour(AsyncBehaviourTest):
+        counter = 0
+
+        def async_act(self) -> Generator:
+            self.counter += 1
+            yield from self.wait_for_wake_up(token=lambda: token)
+            self.counter += 1
+            yield
+
+    behaviour = MyAsyncBehaviour()
+    # the behaviour has not started yet
+    behaviour.wake_up()
+    assert behaviour.counter == 0
+
+    behaviour.act()
+    assert behaviour.counter == 1
+    # the wake-up condition is not met
+    behaviour.wake_up()
+    assert behaviour.counter == 1
+
+    token += 1
+    behaviour.wake_up()
+    assert behaviour.counter == 2
+    assert behaviour.state == AsyncBehaviour.AsyncState.RUNNING
+
+    # the behaviour does not wait for a wake-up condition, it is resumed on the next tick
+    behaviour.wake_up()
+    assert behaviour.state == AsyncBehaviour.AsyncState.RUNNING
+    behaviour.act()
+    assert behaviour.state == AsyncBehaviour.AsyncState.READY
+
+
+def test_async_behaviour_stop_while_suspended() -> None:
+    """Test that the wake-up conditions are cleared when a suspended behaviour is stopped."""
+
+    class MyAsyncBehaviour(AsyncBehaviourTest):
+        def async_act(self) -> Generator:
+            yield from self.sleep(100)
+
+    behaviour = MyAsyncBehaviour()
+    behaviour.act()
+    assert behaviour.is_suspended
+    behaviour.stop()
+    assert not behaviour.is_suspended
+    assert behaviour.state == AsyncBehaviour.AsyncState.READY
+
+
+@pytest.mark.benchmark
+def test_async_behaviour_wake_ups_benchmark() -> None:
+    """Benchmark the idle cost of a waiting behaviour and the latency of its wake-up on a round transition."""
+
+    n_ticks = 20_000
+    round_height = 0
+
+    def _round_height_has_changed(height: int) -> bool:
+        return round_height != height
+
+    class PollingBehaviour(AsyncBehaviourTest):
+        """Waits for the round to end by re-checking the condition on every tick."""
+
+        resumed_at: Optional[float] = None
+
+        def async_act(self) -> Generator:
+            # behaviours usually wait a few generators deep, e.g., when sending a transaction
+            yield from self._send_transaction()
+            self.resumed_at = time.perf_counter()
+
+        def _send_transaction(self) -> Generator:
+            yield from self._wait_until_round_end()
+
+        def _wait_until_round_end(self) -> Generator:
+            height = round_height
+            yield from self.wait_for_condition(
+                partial(_round_height_has_changed, height), timeout=3600
+            )
+
+    class EventDrivenBehaviour(AsyncBehaviourTest):
+        """Waits for the round to end by registering its wake-up conditions."""
+
+        resumed_at: Optional[float] = None
+
+        def async_act(self) -> Generator:
+            yield from self._send_transaction()
+            self.resumed_at = time.perf_counter()
+
+        def _send_transaction(self) -> Generator:
+            yield from self._wait_until_round_end()
+
+        def _wait_until_round_end(self) -> Generator:
+            height = round_height
+            deadline = time.monotonic() + 3600
+            while not _round_height_has_changed(height):
+                yield from self.wait_for_wake_up(
+                    deadline=deadline, token=lambda: round_height
+                )
+
+    idle_cpu, latencies = {}, {}
+    for behaviour_cls in (PollingBehaviour, EventDrivenBehaviour):
+        behaviour = behaviour_cls()
+        behaviour.act()
+        start = time.thread_time()
+        for _ in range(n_ticks):
+            behaviour.act()
+        idle_cpu[behaviour_cls] = time.thread_time() - start
+
+        round_height += 1
+        transitioned_at = time.perf_counter()
+        # the round transition wakes the behaviours up, a polling behaviour is only resumed on the next tick
+        behaviour.wake_up()
+        if behaviour.resumed_at is None:
+            behaviour.act()
+        assert behaviour.resumed_at is not None
+        latencies[behaviour_cls] = behaviour.resumed_at - transitioned_at
+        assert behaviour.state == AsyncBehaviour.AsyncState.READY
+
+    logging.info(
+        f"Idle CPU time over {n_ticks} ticks: {idle_cpu[PollingBehaviour]:.4f}s when polling, "
+        f"{idle_cpu[EventDrivenBehaviour]:.4f}s with wake-ups. Transition to behaviour latency: "
+        f"a tick interval + {latencies[PollingBehaviour] * 1e6:.1f}us when polling, {latencies[EventDrivenBehaviour] * 1e6:.1f}us with wake-ups."
+    )
+
+
 def test_async_behaviour_without_yield() -> None:
     """Test AsyncBehaviour, async_act without yield/yield from."""
 
@@ -510,6 +683,7 @@ class TestBaseBehaviour:
             request_retry_delay=_DEFAULT_REQUEST_RETRY_DELAY,
             tx_timeout=_DEFAULT_TX_TIMEOUT,
             max_attempts=_DEFAULT_TX_MAX_ATTEMPTS,
+            use_tx_delivery_events=False,
         )
         self.context_mock.shared_state = {}
         self.context_state_synchronized_data_mock = MagicMock()
@@ -1444,6 +1618,63 @@ class TestBaseBehaviour:
             # trigger generator function
             try_send(gen, obj=None)
 
+    def _setup_tx_delivery_events(self) -> RoundSequence:
+        """Use a round sequence as the stand-in source of the delivery events."""
+        self.behaviour.params.use_tx_delivery_events = True  # type: ignore
+        round_sequence = RoundSequence(context=MagicMock(), abci_app_cls=MagicMock())
+        self.behaviour.context.state.round_sequence = round_sequence
+        return round_sequence
+
+    def test_wait_until_transaction_delivered_event(self) -> None:
+        """Test '_wait_until_transaction_delivered' learns about the delivery without polling."""
+        round_sequence = self._setup_tx_delivery_events()
+        with mock.patch.object(self.behaviour, "_get_tx_info") as get_tx_info:
+            gen = self.behaviour._wait_until_transaction_delivered("abcd", timeout=5)
+            next(gen)
+            assert self.behaviour.is_suspended
+
+            # other transactions wake the behaviour up, but it keeps waiting
+            round_sequence.add_delivered_tx("EF01", is_ok=True)
+            assert not self.behaviour.is_suspended
+            next(gen)
+            assert self.behaviour.is_suspended
+
+            round_sequence.add_delivered_tx("ABCD", is_ok=True)
+            with pytest.raises(StopIteration) as e:
+                next(gen)
+        assert e.value.value == (True, None)
+        get_tx_info.assert_not_called()
+
+    def test_wait_until_transaction_delivered_event_failed(self) -> None:
+        """Test '_wait_until_transaction_delivered' polls for the details of a failed transaction."""
+        round_sequence = self._setup_tx_delivery_events()
+        round_sequence.add_delivered_tx("ABCD", is_ok=False)
+        response = MagicMock(
+            status_code=200,
+            body='{"result": {"tx_result": {"code": 1, "info": "TransactionNotValidError"}}}',
+        )
+        with mock.patch.object(
+            self.behaviour,
+            "_get_tx_info",
+            side_effect=mock_yield_and_return(response),
+        ) as get_tx_info:
+            gen = self.behaviour._wait_until_transaction_delivered("abcd", timeout=5)
+            next(gen)
+            with pytest.raises(StopIteration) as e:
+                next(gen)
+        assert e.value.value == (False, response)
+        get_tx_info.assert_called_once()
+
+    def test_wait_until_transaction_delivered_event_timeout(self) -> None:
+        """Test '_wait_until_transaction_delivered' when the delivery event does not arrive in time."""
+        self._setup_tx_delivery_events()
+        gen = self.behaviour._wait_until_transaction_delivered("abcd", timeout=0.01)
+        next(gen)
+        time.sleep(0.02)
+        # the fallback polling does not have any time left either
+        with pytest.raises(TimeoutException):
+            next(gen)
+
     @mock.patch.object(behaviour_utils, "Terms")
     def test_get_default_terms(self, *_: Any) -> None:
         """Test '_get_default_terms'."""
@@ -1682,6 +1913,153 @@ class TestBaseBehaviour:
             try_send(gen)
             assert "Error when requesting transaction receipt" in caplog.text
 
+    def _build_requests(self, n_requests: int) -> List[Tuple[Message, Dialogue]]:
+        """Build http requests for the fan-out tests."""
+        return [
+            self.behaviour._build_http_request_message("GET", f"http://url_{i}")
+            for i in range(n_requests)
+        ]
+
+    def test_send_requests(self) -> None:
+        """Test 'send_requests' resumes when all the responses have arrived."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(3)
+        gen = self.behaviour.send_requests(requests)
+        next(gen)
+
+        callbacks = self.behaviour.context.requests.request_id_to_callback
+        assert len(callbacks) == 3
+        responses = [MagicMock() for _ in requests]
+        # the responses arrive out of order, all the requests are in-flight at the same time
+        for response, (_, dialogue) in reversed(tuple(zip(responses, requests))):
+            assert self.behaviour.is_suspended
+            nonce = self.behaviour._get_request_nonce_from_dialogue(dialogue)
+            callbacks.pop(nonce)(response, self.behaviour)
+            assert not self.behaviour.is_suspended
+            if response is not responses[0]:
+                next(gen)
+
+        with pytest.raises(StopIteration) as e:
+            next(gen)
+        assert e.value.value == responses
+
+    def test_send_requests_min_responses(self) -> None:
+        """Test 'send_requests' resumes on the first responses, dropping the ones arriving later."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(3)
+        gen = self.behaviour.send_requests(requests, min_responses=1)
+        next(gen)
+
+        callbacks = self.behaviour.context.requests.request_id_to_callback
+        first, *others = [
+            callbacks.pop(self.behaviour._get_request_nonce_from_dialogue(dialogue))
+            for _, dialogue in requests
+        ]
+        response = MagicMock()
+        first(response, self.behaviour)
+        with pytest.raises(StopIteration) as e:
+            next(gen)
+        assert e.value.value == [response, None, None]
+
+        with mock.patch.object(self.behaviour, "handle_late_messages") as late:
+            for callback in others:
+                callback(MagicMock(), self.behaviour)
+        late.assert_not_called()
+
+    def test_send_requests_timeout(self) -> None:
+        """Test 'send_requests' returns `None` for the requests that time out."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(2)
+        gen = self.behaviour.send_requests(requests, timeout=0.01)
+        next(gen)
+
+        callbacks = self.behaviour.context.requests.request_id_to_callback
+        _, dialogue = requests[0]
+        response = MagicMock()
+        callbacks.pop(self.behaviour._get_request_nonce_from_dialogue(dialogue))(
+            response, self.behaviour
+        )
+        next(gen)
+        time.sleep(0.02)
+        with pytest.raises(StopIteration) as e:
+            next(gen)
+        assert e.value.value == [response, None]
+
+    def test_send_requests_per_request_timeouts(self) -> None:
+        """Test 'send_requests' gives up on the requests whose own timeout elapses."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(3)
+        gen = self.behaviour.send_requests(
+            requests, min_responses=2, timeouts=(None, 0.01, 0.01)
+        )
+        next(gen)
+
+        callbacks = self.behaviour.context.requests.request_id_to_callback
+        first, second, third = [
+            callbacks.pop(self.behaviour._get_request_nonce_from_dialogue(dialogue))
+            for _, dialogue in requests
+        ]
+        third_response = MagicMock()
+        third(third_response, self.behaviour)
+        next(gen)
+        time.sleep(0.02)
+        next(gen)
+        # the second request has expired, its response is not awaited anymore
+        second(MagicMock(), self.behaviour)
+        assert self.behaviour.is_suspended
+        first_response = MagicMock()
+        first(first_response, self.behaviour)
+        with pytest.raises(StopIteration) as e:
+            next(gen)
+        assert e.value.value == [first_response, None, third_response]
+
+    def test_send_requests_all_expired(self) -> None:
+        """Test 'send_requests' returns once too many requests have expired to get the awaited responses."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(2)
+        gen = self.behaviour.send_requests(
+            requests, min_responses=2, timeouts=(0.01, None)
+        )
+        next(gen)
+        time.sleep(0.02)
+        with pytest.raises(StopIteration) as e:
+            next(gen)
+        assert e.value.value == [None, None]
+
+    def test_send_requests_invalid_timeouts(self) -> None:
+        """Test 'send_requests' with a number of timeouts not matching the requests."""
+        gen = self.behaviour.send_requests(self._build_requests(2), timeouts=(1.0,))
+        with pytest.raises(ValueError, match="Got 1 timeouts for 2 requests."):
+            next(gen)
+
+    def test_send_requests_late_message(self) -> None:
+        """Test that responses arriving in another behaviour are handled as late messages."""
+        self.behaviour._AsyncBehaviour__stopped = False  # type: ignore
+        requests = self._build_requests(1)
+        gen = self.behaviour.send_requests(requests)
+        next(gen)
+
+        callbacks = self.behaviour.context.requests.request_id_to_callback
+        _, dialogue = requests[0]
+        with mock.patch.object(self.behaviour, "handle_late_messages") as late:
+            callbacks.pop(self.behaviour._get_request_nonce_from_dialogue(dialogue))(
+                MagicMock(), MagicMock()
+            )
+        late.assert_called_once()
+        assert self.behaviour.is_suspended
+
+    @pytest.mark.parametrize("min_responses", (-1, 3))
+    def test_send_requests_invalid_min_responses(self, min_responses: int) -> None:
+        """Test 'send_requests' with an invalid number of responses to wait for."""
+        gen = self.behaviour.send_requests(
+            self._build_requests(2), min_responses=min_responses
+        )
+        with pytest.raises(
+            ValueError,
+            match=f"Cannot wait for {min_responses} responses out of 2 requests.",
+        ):
+            next(gen)
+
     @pytest.mark.parametrize("contract_address", [None, "contract_address"])
     def test_get_contract_api_response(self, contract_address: Optional[str]) -> None:
         """Test 'get_contract_api_response'."""
@@ -1702,6 +2080,58 @@ class TestBaseBehaviour:
             # wait for message
             try_send(gen, obj=MagicMock())
 
+    @pytest.mark.parametrize(
+        "performative, results, expected",
+        (
+            (ContractApiMessage.Performative.STATE, [1, None], [1, None]),
+            (ContractApiMessage.Performative.STATE, [1], None),
+            (ContractApiMessage.Performative.ERROR, [1, None], None),
+        ),
+    )
+    def test_get_batched_contract_state(
+        self,
+        performative: ContractApiMessage.Performative,
+        results: List[Any],
+        expected: Optional[List[Any]],
+    ) -> None:
+        """Test 'get_batched_contract_state'."""
+        response = MagicMock(performative=performative)
+        response.state.body = {"block_number": 1, "results": results}
+
+        def dummy_contract_api_response(
+            *_: Any, **__: Any
+        ) -> Generator[None, None, MagicMock]:
+            """Dummy `get_contract_api_response` method."""
+            yield
+            return response
+
+        calls = [
+            {
+                "contract_id": "contract_id",
+                "contract_address": "contract_address",
+                "fn_name": fn_name,
+                "args": [],
+            }
+            for fn_name in ("first", "second")
+        ]
+        with mock.patch.object(
+            BaseBehaviour,
+            "get_contract_api_response",
+            side_effect=dummy_contract_api_response,
+        ) as contract_api_mock:
+            gen = self.behaviour.get_batched_contract_state("multicall_address", calls)
+            next(gen)
+            with pytest.raises(StopIteration) as e:
+                next(gen)
+
+        assert e.value.value == expected
+        contract_api_mock.assert_called_once()
+        assert contract_api_mock.call_args.kwargs["calls"] == calls
+        assert (
+            contract_api_mock.call_args.kwargs["contract_callable"]
+            == "get_aggregated_state"
+        )
+
     @mock.patch.object(
         BaseBehaviour, "_build_http_request_message", return_value=(None, None)
     )
@@ -21,10 +21,12 @@
 
 # pylint: skip-file
 
+import hashlib
 import json
 import logging
 from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, cast
 from unittest import mock
 from unittest.mock import MagicMock
@@ -42,17 +44,24 @@ from packages.valory.protocols.abci.custom_types import (
     Evidences,
     Header,
     LastCommitInfo,
+    Result,
+    ResultType,
+    Snapshot,
     Timestamp,
     ValidatorUpdates,
 )
 from packages.valory.protocols.http import HttpMessage
 from packages.valory.protocols.tendermint import TendermintMessage
+from packages.valory.skills.abstract_abci.handlers import ABCIHandler
 from packages.valory.skills.abstract_round_abci import handlers
 from packages.valory.skills.abstract_round_abci.base import (
     ABCIAppInternalError,
+    AbciAppDB,
     AddBlockError,
+    BaseSynchronizedData,
     ERROR_CODE,
     OK_CODE,
+    RoundSequence,
     SignatureNotValidError,
     TransactionNotValidError,
 )
@@ -65,11 +74,22 @@ from packages.valory.skills.abstract_round_abci.dialogues import (
 from packages.valory.skills.abstract_round_abci.handlers import (
     ABCIRoundHandler,
     AbstractResponseHandler,
+    SNAPSHOT_FORMAT,
+    SnapshotStore,
+    StateCheckpoint,
     TendermintHandler,
     Transaction,
+    VerifiedTransactionCache,
     exception_to_info_msg,
 )
-from packages.valory.skills.abstract_round_abci.models import TendermintRecoveryParams
+from packages.valory.skills.abstract_round_abci.models import (
+    BenchmarkTool,
+    TendermintRecoveryParams,
+)
+from packages.valory.skills.abstract_round_abci.test_tools.abci_app import (
+    AbciAppTest,
+    ConcreteRoundB,
+)
 from packages.valory.skills.abstract_round_abci.test_tools.rounds import DummyRound
 
 
@@ -81,6 +101,190 @@ def test_exception_to_info_msg() -> None:
     assert expected_string == actual_string
 
 
+class TestVerifiedTransactionCache:
+    """Test 'VerifiedTransactionCache'."""
+
+    def test_init_negative(self) -> None:
+        """Test the initialization with a negative size."""
+        with pytest.raises(
+            ValueError,
+            match="The size of the verified transactions cache cannot be negative, got -1.",
+        ):
+            VerifiedTransactionCache(-1)
+
+    @mock.patch.object(handlers, "Transaction")
+    def test_decode_and_verify(self, transaction_mock: MagicMock) -> None:
+        """Test that the transactions are only decoded and verified once, and that the least recently used are evicted."""
+        cache = VerifiedTransactionCache(max_size=2)
+        assert cache.max_size == 2
+
+        first = cache.decode_and_verify(b"first", "ethereum")
+        assert cache.decode_and_verify(b"first", "ethereum") is first
+        cache.decode_and_verify(b"second", "ethereum")
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+        assert transaction_mock.decode.call_count == 2
+        assert first.verify.call_count == transaction_mock.decode.call_count
+
+        # the first transaction is the least recently used after the second is read, and the third evicts it
+        cache.decode_and_verify(b"first", "ethereum")
+        cache.decode_and_verify(b"second", "ethereum")
+        cache.decode_and_verify(b"third", "ethereum")
+        cache.decode_and_verify(b"second", "ethereum")
+        assert (cache.hits, cache.misses, len(cache)) == (4, 3, 2)
+        cache.decode_and_verify(b"first", "ethereum")
+        assert (cache.hits, cache.misses, len(cache)) == (4, 4, 2)
+        assert transaction_mock.decode.call_count == 4
+
+    @mock.patch.object(handlers, "Transaction")
+    def test_decode_and_verify_disabled(self, transaction_mock: MagicMock) -> None:
+        """Test that nothing is cached when the size of the cache is 0."""
+        cache = VerifiedTransactionCache(max_size=0)
+        for _ in range(2):
+            cache.decode_and_verify(b"tx", "ethereum")
+        assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
+        assert transaction_mock.decode.call_count == 2
+
+    @pytest.mark.parametrize(
+        "exception_cls", (SignatureNotValidError, TransactionNotValidError)
+    )
+    def test_decode_and_verify_negative(self, exception_cls: type) -> None:
+        """Test that the verification failures are cached too."""
+        cache = VerifiedTransactionCache()
+        with mock.patch.object(
+            Transaction, "decode", side_effect=exception_cls("invalid")
+        ) as decode_mock:
+            for _ in range(2):
+                with pytest.raises(exception_cls, match="invalid"):
+                    cache.decode_and_verify(b"tx", "ethereum")
+        decode_mock.assert_called_once()
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+
+class TestSnapshotStore:
+    """Test 'SnapshotStore'."""
+
+    @pytest.mark.parametrize("chunk_size, max_snapshots", ((0, 1), (1, 0)))
+    def test_init_negative(self, chunk_size: int, max_snapshots: int) -> None:
+        """Test the initialization with invalid sizes."""
+        with pytest.raises(ValueError, match="must be positive"):
+            SnapshotStore(chunk_size, max_snapshots)
+
+    def test_add_and_load_chunk(self) -> None:
+        """Test chunking the snapshots and evicting the oldest ones."""
+        store = SnapshotStore(chunk_size=4, max_snapshots=2)
+        assert store.latest_height == 0
+
+        snapshot = store.add(1, b"0123456789")
+        assert snapshot.chunks == 3
+        assert snapshot.format_ == SNAPSHOT_FORMAT
+        assert snapshot.hash_ == hashlib.sha256(b"0123456789").digest()
+        chunk_hashes = json.loads(snapshot.metadata)["chunk_hashes"]
+        assert chunk_hashes[-1] == hashlib.sha256(b"89").hexdigest()
+        assert [store.load_chunk(1, SNAPSHOT_FORMAT, i) for i in range(4)] == [
+            b"0123",
+            b"4567",
+            b"89",
+            b"",
+        ]
+        assert store.load_chunk(1, SNAPSHOT_FORMAT + 1, 0) == b""
+
+        assert store.add(2, b"").chunks == 1
+        store.add(3, b"state")
+        assert [snapshot.height for snapshot in store.snapshots] == [2, 3]
+        assert store.latest_height == 3
+        assert store.load_chunk(1, SNAPSHOT_FORMAT, 0) == b""
+
+        store.clear()
+        assert store.snapshots == []
+
+    @pytest.mark.parametrize(
+        "interval, height, expected", ((0, 10, False), (5, 4, False), (5, 5, True))
+    )
+    def test_is_due(self, interval: int, height: int, expected: bool) -> None:
+        """Test whether a snapshot is due."""
+        assert SnapshotStore(interval=interval).is_due(height) == expected
+
+    @pytest.mark.parametrize(
+        "format_, chunks, metadata, expected",
+        (
+            (SNAPSHOT_FORMAT + 1, 1, b"", ResultType.REJECT_FORMAT),
+            (SNAPSHOT_FORMAT, 1, b"invalid", ResultType.REJECT),
+            (SNAPSHOT_FORMAT, 2, b'{"chunk_hashes": ["a"]}', ResultType.REJECT),
+            (SNAPSHOT_FORMAT, 1, b'{"chunk_hashes": ["a"]}', ResultType.ACCEPT),
+        ),
+    )
+    def test_offer(
+        self, format_: int, chunks: int, metadata: bytes, expected: ResultType
+    ) -> None:
+        """Test offering snapshots."""
+        store = SnapshotStore()
+        snapshot = Snapshot(1, format_, chunks, b"", metadata)
+        assert store.offer(snapshot, b"app_hash") == expected
+        assert store.is_restoring == (expected == ResultType.ACCEPT)
+
+    def test_restore(self) -> None:
+        """Test restoring a snapshot chunk by chunk."""
+        source = SnapshotStore(chunk_size=2)
+        snapshot = source.add(1, b"state")
+        target = SnapshotStore()
+        assert not target.apply_chunk(0, b"st")
+
+        assert target.offer(snapshot, b"app_hash") == ResultType.ACCEPT
+        assert target.restoring_app_hash == b"app_hash"
+        assert not target.apply_chunk(0, b"corrupted")
+        assert not target.apply_chunk(snapshot.chunks, b"st")
+        for i in reversed(range(snapshot.chunks)):
+            assert target.restored_state() is None
+            assert target.apply_chunk(i, source.load_chunk(1, SNAPSHOT_FORMAT, i))
+        assert target.restored_state() == b"state"
+        assert not target.is_restoring
+
+    def test_restore_hash_mismatch(self) -> None:
+        """Test restoring a snapshot whose chunks do not match its hash."""
+        source = SnapshotStore(chunk_size=2)
+        snapshot = source.add(1, b"state")
+        snapshot.hash_ = b"wrong"
+        target = SnapshotStore()
+        target.offer(snapshot, b"app_hash")
+        for i in range(snapshot.chunks):
+            target.apply_chunk(i, source.load_chunk(1, SNAPSHOT_FORMAT, i))
+        with pytest.raises(ValueError, match="does not match the hash"):
+            target.restored_state()
+
+
+class TestStateCheckpoint:
+    """Test 'StateCheckpoint'."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test writing, loading and removing the checkpoint."""
+        checkpoint = StateCheckpoint(str(tmp_path / "state" / "checkpoint"), 5)
+        assert checkpoint.load() is None
+        assert checkpoint.is_due(5)
+
+        checkpoint.save(b"first\nstate", 5)
+        checkpoint.save(b"second\nstate", 6)
+        assert checkpoint.load() == b"second\nstate"
+        assert checkpoint.last_height == 6
+        assert not checkpoint.is_due(10)
+        assert checkpoint.is_due(11)
+        assert [path.name for path in checkpoint.path.parent.iterdir()] == [
+            "checkpoint"
+        ]
+
+        checkpoint.remove()
+        checkpoint.remove()
+        assert checkpoint.load() is None
+        assert checkpoint.last_height == 0
+
+    def test_load_corrupted(self, tmp_path: Path) -> None:
+        """Test loading a corrupted checkpoint."""
+        checkpoint = StateCheckpoint(str(tmp_path / "checkpoint"))
+        checkpoint.save(b"state", 1)
+        checkpoint.path.write_bytes(checkpoint.path.read_bytes()[:-1])
+        with pytest.raises(ValueError, match="is corrupted"):
+            checkpoint.load()
+
+
 class TestABCIRoundHandler:
     """Test 'ABCIRoundHandler'."""
 
@@ -195,11 +399,16 @@ class TestABCIRoundHandler:
         )
         with mock.patch.object(
             self.context.state.round_sequence, "add_pending_offence"
-        ) as mock_add_pending_offence:
+        ) as mock_add_pending_offence, mock.patch.object(
+            self.context.state.round_sequence, "add_delivered_tx"
+        ) as mock_add_delivered_tx:
             response = self.handler.deliver_tx(
                 cast(AbciMessage, message), cast(AbciDialogue, dialogue)
             )
             mock_add_pending_offence.assert_called_once()
+            mock_add_delivered_tx.assert_called_once_with(
+                hashlib.sha256(b"").hexdigest().upper(), is_ok=True
+            )
 
         assert response.performative == AbciMessage.Performative.RESPONSE_DELIVER_TX
         assert response.code == OK_CODE
@@ -250,6 +459,80 @@ class TestABCIRoundHandler:
         assert response.performative == AbciMessage.Performative.RESPONSE_DELIVER_TX
         assert response.code == ERROR_CODE
 
+    @mock.patch.object(handlers, "Transaction")
+    def test_check_and_deliver_tx_cached(self, transaction_mock: MagicMock) -> None:
+        """Test that a transaction which is checked and then delivered is only decoded and verified once."""
+        performatives_kwargs = (
+            (
+                AbciMessage.Performative.REQUEST_CHECK_TX,
+                dict(type=CheckTxType(CheckTxTypeEnum.NEW)),
+                self.handler.check_tx,
+            ),
+            (
+                AbciMessage.Performative.REQUEST_CHECK_TX,
+                dict(type=CheckTxType(CheckTxTypeEnum.RECHECK)),
+                self.handler.check_tx,
+            ),
+            (AbciMessage.Performative.REQUEST_DELIVER_TX, {}, self.handler.deliver_tx),
+        )
+        for performative, kwargs, handler_method in performatives_kwargs:
+            message, dialogue = self.dialogues.create(
+                counterparty="", performative=performative, tx=b"tx", **kwargs
+            )
+            response = handler_method(
+                cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+            )
+            assert response.code == OK_CODE
+
+        transaction_mock.decode.assert_called_once_with(b"tx")
+        cache = self.handler.verified_tx_cache
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert cache.max_size == handlers.DEFAULT_VERIFIED_TX_CACHE_SIZE
+
+    def test_verified_tx_cache_size(self) -> None:
+        """Test configuring the size of the verified transactions cache."""
+        handler = ABCIRoundHandler(
+            name="", skill_context=self.context, verified_tx_cache_size=5
+        )
+        assert handler.verified_tx_cache.max_size == 5
+
+    def test_handle_measured(self, tmp_path: Path) -> None:
+        """Test that handling an ABCI request is measured for the current round."""
+        self.context.benchmark_tool = BenchmarkTool(
+            name="", skill_context=self.context, log_dir=str(tmp_path)
+        )
+        self.context.state.round_sequence.current_round_id = "round_a"
+        message, _ = self.dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_INFO,
+            version="",
+            block_version=0,
+            p2p_version=0,
+        )
+        for _ in range(2):
+            self.handler.handle(message)
+        self.context.outbox.put_message.assert_called()
+        block = self.context.benchmark_tool.abci_data[("round_a", "info")]
+        assert len(block.samples) == 2
+
+    @pytest.mark.parametrize(
+        ("performative", "wakes_up"),
+        (
+            (AbciMessage.Performative.REQUEST_INFO, False),
+            (AbciMessage.Performative.REQUEST_CHECK_TX, False),
+            (AbciMessage.Performative.REQUEST_DELIVER_TX, True),
+            (AbciMessage.Performative.REQUEST_COMMIT, True),
+        ),
+    )
+    def test_handle_wakes_up_behaviours(
+        self, performative: AbciMessage.Performative, wakes_up: bool
+    ) -> None:
+        """Test that the behaviours are woken up after the requests which they may wait for."""
+        with mock.patch.object(ABCIHandler, "handle"):
+            self.handler.handle(MagicMock(performative=performative))
+        wake_up_mock = self.context.behaviours.main.wake_up
+        assert wake_up_mock.called is wakes_up
+
     @pytest.mark.parametrize("request_height", tuple(range(3)))
     def test_end_block(self, request_height: int) -> None:
         """Test the 'end_block' handler method."""
@@ -277,6 +560,300 @@ class TestABCIRoundHandler:
         )
         assert response.performative == AbciMessage.Performative.RESPONSE_COMMIT
 
+    @staticmethod
+    def _snapshot_handler(**kwargs: Any) -> ABCIRoundHandler:
+        """Get a handler whose round sequence uses a real database."""
+        context = MagicMock(skill_id=PublicId.from_str("dummy/skill:0.1.0"))
+        round_sequence = RoundSequence(context=context, abci_app_cls=AbciAppTest)
+        db = AbciAppDB(setup_data={"participants": [["a", "b"]]})
+        round_sequence.setup(BaseSynchronizedData(db), logging.getLogger())
+        context.state.round_sequence = round_sequence
+        return ABCIRoundHandler(name="", skill_context=context, **kwargs)
+
+    def test_snapshots_bootstrap(self) -> None:
+        """Test that an agent bootstraps from the snapshot of a peer, driving the handlers directly."""
+        peer = self._snapshot_handler(snapshot_interval=5, snapshot_chunk_size=64)
+        peer_round_sequence = peer.context.state.round_sequence
+        peer_round_sequence.latest_synchronized_data.db.update(value="x" * 200)
+        peer_round_sequence.abci_app.schedule_round(ConcreteRoundB)
+        peer_round_sequence.init_chain(6)
+        peer_round_sequence.tm_height = 5
+        peer_dialogues = AbciDialogues(name="", skill_context=peer.context)
+
+        def commit() -> None:
+            """Commit a block on the peer."""
+            message, dialogue = peer_dialogues.create(
+                counterparty="", performative=AbciMessage.Performative.REQUEST_COMMIT
+            )
+            with mock.patch.object(peer_round_sequence, "commit"):
+                peer.commit(cast(AbciMessage, message), cast(AbciDialogue, dialogue))
+
+        # no round transition has happened yet
+        commit()
+        assert peer.snapshot_store.snapshots == []
+        peer_round_sequence._last_round_transition_height = 5
+        commit()
+        # the interval has not passed since the last snapshot
+        commit()
+        assert [snapshot.height for snapshot in peer.snapshot_store.snapshots] == [5]
+
+        message, dialogue = peer_dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_LIST_SNAPSHOTS,
+        )
+        response = peer.list_snapshots(
+            cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+        )
+        assert response.performative == AbciMessage.Performative.RESPONSE_LIST_SNAPSHOTS
+        (snapshot,) = response.snapshots.snapshots
+        assert snapshot.chunks > 1
+
+        agent = self._snapshot_handler()
+        agent_round_sequence = agent.context.state.round_sequence
+        message, dialogue = self.dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_OFFER_SNAPSHOT,
+            snapshot=snapshot,
+            app_hash=peer_round_sequence.root_hash,
+        )
+        response = agent.offer_snapshot(
+            cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+        )
+        assert response.result == Result(ResultType.ACCEPT)
+
+        for index in range(snapshot.chunks):
+            message, dialogue = peer_dialogues.create(
+                counterparty="",
+                performative=AbciMessage.Performative.REQUEST_LOAD_SNAPSHOT_CHUNK,
+                height=snapshot.height,
+                format=snapshot.format_,
+                chunk_index=index,
+            )
+            chunk = peer.load_snapshot_chunk(
+                cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+            ).chunk
+            message, dialogue = self.dialogues.create(
+                counterparty="",
+                performative=AbciMessage.Performative.REQUEST_APPLY_SNAPSHOT_CHUNK,
+                index=index,
+                chunk=chunk,
+                chunk_sender="peer",
+            )
+            response = agent.apply_snapshot_chunk(
+                cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+            )
+            assert response.result == Result(ResultType.ACCEPT)
+            assert response.refetch_chunks == tuple()
+
+        assert agent_round_sequence.height == peer_round_sequence.height
+        assert agent_round_sequence.root_hash == peer_round_sequence.root_hash
+        assert agent_round_sequence.current_round_id == ConcreteRoundB.auto_round_id()
+
+        # the snapshots refer to the previous chain after a reset
+        message, dialogue = peer_dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_INIT_CHAIN,
+            time=Timestamp(0, 0),
+            chain_id="test_chain_id",
+            consensus_params=ConsensusParams(*(mock.MagicMock() for _ in range(4))),
+            validators=ValidatorUpdates(mock.MagicMock()),
+            app_state_bytes=b"",
+            initial_height=1,
+        )
+        peer.init_chain(cast(AbciMessage, message), cast(AbciDialogue, dialogue))
+        assert peer.snapshot_store.snapshots == []
+
+    def test_state_checkpoint_restore(self, tmp_path: Path) -> None:
+        """Test that a restarted agent restores its state from the local checkpoint, and reports it on `info`."""
+        path = str(tmp_path / "checkpoint")
+        handler = self._snapshot_handler(
+            state_checkpoint_path=path, state_checkpoint_interval=5
+        )
+        round_sequence = handler.context.state.round_sequence
+        round_sequence.latest_synchronized_data.db.update(value="x")
+        round_sequence.abci_app.schedule_round(ConcreteRoundB)
+        round_sequence.init_chain(11)
+        round_sequence.tm_height = 10
+        dialogues = AbciDialogues(name="", skill_context=handler.context)
+
+        def commit() -> None:
+            """Commit a block."""
+            message, dialogue = dialogues.create(
+                counterparty="", performative=AbciMessage.Performative.REQUEST_COMMIT
+            )
+            with mock.patch.object(round_sequence, "commit"):
+                handler.commit(cast(AbciMessage, message), cast(AbciDialogue, dialogue))
+
+        # no round transition has happened in the committed block
+        commit()
+        assert not Path(path).exists()
+        round_sequence._last_round_transition_height = 10
+        commit()
+        assert Path(path).exists()
+
+        restarted = self._snapshot_handler(state_checkpoint_path=path)
+        for _ in range(2):
+            message, dialogue = self.dialogues.create(
+                counterparty="",
+                performative=AbciMessage.Performative.REQUEST_INFO,
+                version="",
+                block_version=0,
+                p2p_version=0,
+            )
+            response = restarted.info(
+                cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+            )
+            assert response.last_block_height == 10
+            assert response.last_block_app_hash == round_sequence.root_hash
+        restarted_round_sequence = restarted.context.state.round_sequence
+        assert restarted_round_sequence.current_round_id == (
+            ConcreteRoundB.auto_round_id()
+        )
+
+        # a corrupted checkpoint is ignored
+        Path(path).write_bytes(b"corrupted")
+        restarted = self._snapshot_handler(state_checkpoint_path=path)
+        message, dialogue = self.dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_INFO,
+            version="",
+            block_version=0,
+            p2p_version=0,
+        )
+        response = restarted.info(
+            cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+        )
+        assert response.last_block_height == 0
+
+        # the checkpoint refers to the previous chain after a reset
+        message, dialogue = dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_INIT_CHAIN,
+            time=Timestamp(0, 0),
+            chain_id="test_chain_id",
+            consensus_params=ConsensusParams(*(mock.MagicMock() for _ in range(4))),
+            validators=ValidatorUpdates(mock.MagicMock()),
+            app_state_bytes=b"",
+            initial_height=1,
+        )
+        handler.init_chain(cast(AbciMessage, message), cast(AbciDialogue, dialogue))
+        assert not Path(path).exists()
+
+    def _query(self, handler: ABCIRoundHandler, path: str) -> AbciMessage:
+        """Send a query to the handler."""
+        message, dialogue = self.dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_QUERY,
+            query_data=b"",
+            path=path,
+            height=0,
+            prove=False,
+        )
+        return handler.query(cast(AbciMessage, message), cast(AbciDialogue, dialogue))
+
+    def test_query(self) -> None:
+        """Test serving the synchronized state via queries."""
+        handler = self._snapshot_handler(query_cache_size=2)
+        round_sequence = handler.context.state.round_sequence
+        round_sequence.latest_synchronized_data.db.update(key=1)
+        round_sequence.latest_synchronized_data.db.update(key=2)
+
+        response = self._query(handler, "/round")
+        assert response.performative == AbciMessage.Performative.RESPONSE_QUERY
+        assert response.code == OK_CODE
+        assert response.key == b"/round"
+        assert json.loads(response.value) == {
+            "round_id": "concrete_round_a",
+            "last_round_id": None,
+            "round_count": 0,
+            "period_count": 0,
+            "current_round_height": 0,
+            "height": 0,
+        }
+        assert json.loads(self._query(handler, "/db/key").value) == 2
+        assert json.loads(self._query(handler, "/db/key/history").value) == [1, 2]
+
+        for path in ("/unknown", "/db/key/unknown", "/db"):
+            response = self._query(handler, path)
+            assert response.code == ERROR_CODE
+            assert response.info == f"unknown query path {path!r}"
+        response = self._query(handler, "/db/inexistent")
+        assert response.code == ERROR_CODE
+        assert "'inexistent' field is not set" in response.info
+
+    def test_query_cached(self) -> None:
+        """Test that the responses to the queries are cached until the state changes."""
+        handler = self._snapshot_handler(query_cache_size=2)
+        round_sequence = handler.context.state.round_sequence
+        db = round_sequence.latest_synchronized_data.db
+        db.update(key=1)
+
+        with mock.patch.object(
+            handler, "_resolve_query", wraps=handler._resolve_query
+        ) as resolve_mock:
+            for _ in range(2):
+                self._query(handler, "/db/key")
+                self._query(handler, "/round")
+            assert resolve_mock.call_count == 2
+
+            # the least recently used response is evicted
+            self._query(handler, "/db/key/history")
+            self._query(handler, "/db/key")
+            assert resolve_mock.call_count == 4
+
+            # the cached responses are dropped when a block is committed
+            db.update(key=2)
+            assert json.loads(self._query(handler, "/db/key").value) == 1
+            round_sequence.init_chain(2)
+            assert json.loads(self._query(handler, "/db/key").value) == 2
+            assert resolve_mock.call_count == 5
+
+    def _apply_snapshot_chunk(
+        self, handler: ABCIRoundHandler, index: int, chunk: bytes
+    ) -> AbciMessage:
+        """Apply a snapshot chunk."""
+        message, dialogue = self.dialogues.create(
+            counterparty="",
+            performative=AbciMessage.Performative.REQUEST_APPLY_SNAPSHOT_CHUNK,
+            index=index,
+            chunk=chunk,
+            chunk_sender="peer",
+        )
+        return handler.apply_snapshot_chunk(
+            cast(AbciMessage, message), cast(AbciDialogue, dialogue)
+        )
+
+    def test_apply_snapshot_chunk_negative(self) -> None:
+        """Test applying invalid snapshot chunks."""
+        # no snapshot has been offered
+        response = self._apply_snapshot_chunk(self.handler, 0, b"chunk")
+        assert response.result == Result(ResultType.ABORT)
+
+        source = SnapshotStore(chunk_size=2)
+        snapshot = source.add(1, b"state")
+        self.handler.snapshot_store.offer(snapshot, b"app_hash")
+        response = self._apply_snapshot_chunk(self.handler, 0, b"corrupted")
+        assert response.result == Result(ResultType.REJECT)
+        assert response.refetch_chunks == (0,)
+        assert response.reject_senders == ("peer",)
+
+        # the state cannot be loaded
+        self.context.state.round_sequence.load_state.side_effect = ABCIAppInternalError(
+            "invalid"
+        )
+        for index in range(snapshot.chunks):
+            chunk = source.load_chunk(1, SNAPSHOT_FORMAT, index)
+            response = self._apply_snapshot_chunk(self.handler, index, chunk)
+        assert response.result == Result(ResultType.REJECT_SENDER)
+
+        # the state is loaded, but it does not match the trusted app hash
+        self.context.state.round_sequence.load_state.side_effect = None
+        self.handler.snapshot_store.offer(snapshot, b"app_hash")
+        for index in range(snapshot.chunks):
+            chunk = source.load_chunk(1, SNAPSHOT_FORMAT, index)
+            response = self._apply_snapshot_chunk(self.handler, index, chunk)
+        assert response.result == Result(ResultType.REJECT_SENDER)
+
     def test_commit_negative(self) -> None:
         """Test the 'commit' handler method, negative case."""
         self.context.state.round_sequence.commit.side_effect = AddBlockError()
@@ -322,6 +899,7 @@ class TestAbstractResponseHandler:
             mock_message = MagicMock(performative=HttpMessage.Performative.RESPONSE)
             self.handler.handle(mock_message)
         callback.assert_called()
+        self.context.behaviours.main.wake_up.assert_called_once()
 
     @mock.patch.object(
         AbstractResponseHandler, "_recover_protocol_dialogues", return_value=None
@@ -25,12 +25,13 @@ import builtins
 import json
 import logging
 import re
+import tracemalloc
 from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from time import sleep
+from time import sleep, thread_time
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, cast
 from unittest import mock
 from unittest.mock import MagicMock
@@ -48,6 +49,7 @@ from packages.valory.skills.abstract_round_abci.base import (
 )
 from packages.valory.skills.abstract_round_abci.models import (
     ApiSpecs,
+    BENCHMARK_SAMPLES_FILE,
     BaseParams,
     BenchmarkTool,
     DEFAULT_BACKOFF_FACTOR,
@@ -64,6 +66,7 @@ from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
 from packages.valory.skills.abstract_round_abci.models import (
+    TRACE_PEAK_ALLOCATIONS,
     TendermintRecoveryParams,
     _MetaSharedState,
     check_type,
@@ -385,14 +388,26 @@ class TestSharedState:
         SharedState(name="", skill_context=MagicMock())
 
     @staticmethod
-    def dummy_state_setup(shared_state: SharedState) -> None:
+    def dummy_state_setup(
+        shared_state: SharedState, max_blocks: Optional[int] = None
+    ) -> None:
         """Setup a shared state instance with dummy params."""
+        shared_state.context.params.blockchain_max_blocks = max_blocks
         shared_state.context.params.setup_params = {
             "test": [],
             "all_participants": list(range(4)),
         }
         shared_state.setup()
 
+    @pytest.mark.parametrize("max_blocks", (None, 1))
+    def test_setup_blockchain_max_blocks(self, max_blocks: Optional[int]) -> None:
+        """Test the block retention limit is passed to the round sequence."""
+        shared_state = SharedState(
+            abci_app_cls=AbciAppTest, name="", skill_context=MagicMock()
+        )
+        self.dummy_state_setup(shared_state, max_blocks)
+        assert shared_state.round_sequence.blockchain.max_blocks == max_blocks
+
     @pytest.mark.parametrize(
         "acn_configured_agents, validator_to_agent, raises",
         (
@@ -521,6 +536,7 @@ class TestSharedState:
         """Test `get_validator_address` method."""
         shared_state = SharedState(name="", skill_context=MagicMock())
         with mock.patch.object(shared_state.context, "params") as mock_params:
+            mock_params.blockchain_max_blocks = None
             mock_params.setup_params = {
                 "all_participants": ["0x0"],
             }
@@ -552,6 +568,7 @@ class TestSharedState:
     def test_synchronized_data_positive(self, *_: Any) -> None:
         """Test 'synchronized_data' property getter, negative case (not available)."""
         shared_state = SharedState(name="", skill_context=MagicMock())
+        shared_state.context.params.blockchain_max_blocks = None
         shared_state.context.params.setup_params = {
             "test": [],
             "all_participants": [["0x0"]],
@@ -564,6 +581,7 @@ class TestSharedState:
         """Test 'synchronized_data' AbciAppDB."""
         shared_state = SharedState(name="", skill_context=MagicMock())
         with mock.patch.object(shared_state.context, "params") as mock_params:
+            mock_params.blockchain_max_blocks = None
             mock_params.setup_params = {
                 "safe_contract_address": "0xsafe",
                 "oracle_contract_address": "0xoracle",
@@ -598,6 +616,7 @@ class TestSharedState:
         shared_state = SharedState(
             abci_app_cls=AbciAppTest, name="", skill_context=MagicMock()
         )
+        shared_state.context.params.blockchain_max_blocks = None
         shared_state.context.params.setup_params = {
             "test": [],
             "all_participants": ["0x0"],
@@ -672,6 +691,127 @@ class TestBenchmarkTool:
             behaviour_data = json.loads(benchmark_file.read_text())
             self._check_behaviour_data(behaviour_data, agent_name)
 
+    @pytest.mark.parametrize("trace_allocations", (False, True))
+    def test_samples(self, trace_allocations: bool) -> None:
+        """Test that every sample is kept and appended to the samples stream."""
+        agent_name = "agent"
+        skill_context = MagicMock(agent_address=agent_name)
+        expected_keys = {"wall_ns", "cpu_ns"}
+        if trace_allocations:
+            expected_keys.add("alloc_bytes")
+        if trace_allocations and TRACE_PEAK_ALLOCATIONS:
+            expected_keys.add("peak_bytes")
+
+        with TemporaryDirectory() as temp_dir:
+            benchmark = BenchmarkTool(
+                name=agent_name,
+                skill_context=skill_context,
+                log_dir=temp_dir,
+                trace_allocations=trace_allocations,
+            )
+            samples_file = Path(temp_dir, agent_name, BENCHMARK_SAMPLES_FILE)
+
+            for period in range(2):
+                for _ in range(3):
+                    with benchmark.measure("behaviour").local():
+                        _ = [0] * 1000
+                with benchmark.measure_abci("deliver_tx", "round_a"):
+                    pass
+                with benchmark.measure_abci("commit", "round_a"):
+                    pass
+
+                block = benchmark.measure("behaviour").local()
+                assert len(block.samples) == 3
+                assert all(set(sample) == expected_keys for sample in block.samples)
+                assert block.total_time == pytest.approx(
+                    sum(sample["wall_ns"] for sample in block.samples) / 1e9
+                )
+                if trace_allocations and TRACE_PEAK_ALLOCATIONS:
+                    assert all(sample["peak_bytes"] >= 8000 for sample in block.samples)
+
+                benchmark.save(period)
+                assert benchmark.abci_data == {}
+
+            records = [
+                json.loads(line) for line in samples_file.read_text().splitlines()
+            ]
+            assert len(records) == 10
+            assert [record["period"] for record in records] == [0] * 5 + [1] * 5
+            assert [record.get("abci") for record in records[:5]] == [None] * 3 + [
+                "deliver_tx",
+                "commit",
+            ]
+            assert records[3]["round"] == "round_a"
+
+        if trace_allocations:
+            tracemalloc.stop()
+
+    def test_max_samples(self) -> None:  # pylint: disable=no-self-use
+        """Test that only the latest `max_samples` samples of each block are kept."""
+        benchmark = BenchmarkTool(
+            name="agent",
+            skill_context=MagicMock(agent_address="agent"),
+            log_dir="/tmp",  # nosec
+            max_samples=2,
+        )
+        for _ in range(5):
+            with benchmark.measure("behaviour").local():
+                pass
+            with benchmark.measure_abci("deliver_tx", "round_a"):
+                pass
+
+        for block in (
+            benchmark.measure("behaviour").local(),
+            benchmark.measure_abci("deliver_tx", "round_a"),
+        ):
+            assert len(block.samples) == 2
+            # the total time still accounts for the dropped samples
+            assert (
+                block.total_time
+                >= sum(sample["wall_ns"] for sample in block.samples) / 1e9
+            )
+        assert len(benchmark.samples()) == 4
+
+    @pytest.mark.parametrize("trace_allocations", (False, True))
+    def test_abci_block_within_behaviour_block(self, trace_allocations: bool) -> None:
+        """Test that an ABCI request handled while a behaviour's block is open is not attributed to it."""
+        benchmark = BenchmarkTool(
+            name="agent",
+            skill_context=MagicMock(agent_address="agent"),
+            log_dir="",
+            trace_allocations=trace_allocations,
+        )
+        allocations = []
+
+        def busy(duration: float) -> None:
+            """Keep the CPU busy, allocating 1MB."""
+            allocations.append(bytearray(1024 * 1024))
+            end = thread_time() + duration
+            while thread_time() < end:
+                pass
+
+        with benchmark.measure("behaviour").local():
+            busy(0.01)
+            with benchmark.measure_abci("deliver_tx", "round_a"):
+                busy(0.1)
+                allocations.pop()
+            busy(0.01)
+        local_sample = benchmark.measure("behaviour").local().samples[0]
+        abci_sample = benchmark.measure_abci("deliver_tx", "round_a").samples[0]
+
+        assert benchmark.open_blocks == []
+        assert abci_sample["cpu_ns"] >= 0.1 * 1e9
+        assert local_sample["cpu_ns"] < abci_sample["cpu_ns"]
+        assert local_sample["wall_ns"] > abci_sample["wall_ns"]
+        if trace_allocations:
+            assert local_sample["alloc_bytes"] >= 2 * 1024 * 1024
+            assert abci_sample["alloc_bytes"] < 1024 * 1024
+        if trace_allocations and TRACE_PEAK_ALLOCATIONS:
+            assert 2 * 1024 * 1024 <= local_sample["peak_bytes"] < 3 * 1024 * 1024
+            assert abci_sample["peak_bytes"] >= 1024 * 1024
+        if trace_allocations:
+            tracemalloc.stop()
+
 
 def test_requests_model_initialization() -> None:
     """Test initialization of the 'Requests(Model)' class."""
@@ -704,6 +844,22 @@ def test_base_params_model_initialization() -> None:
     BaseParams(**kwargs)
 
 
+@pytest.mark.parametrize("max_blocks", (None, 10))
+def test_base_params_blockchain_max_blocks(max_blocks: Optional[int]) -> None:
+    """Test the optional `blockchain_max_blocks` param of the 'BaseParams(Model)' class."""
+    kwargs = BASE_DUMMY_PARAMS.copy()
+    assert BaseParams(**kwargs).blockchain_max_blocks is None
+
+    kwargs["blockchain_max_blocks"] = max_blocks
+    assert BaseParams(**kwargs).blockchain_max_blocks == max_blocks
+
+    kwargs["blockchain_max_blocks"] = "10"
+    with pytest.raises(
+        AEAEnforceError, match="'blockchain_max_blocks' must be a typing.Optional"
+    ):
+        BaseParams(**kwargs)
+
+
 @pytest.mark.parametrize(
     "setup, error_text",
     (
@@ -19,7 +19,10 @@
 
 """Test the utils.py module of the skill."""
 
+import json
+import pickle  # nosec
 from collections import defaultdict
+from copy import copy, deepcopy
 from string import printable
 from typing import Any, Dict, List, Tuple, Type
 from unittest import mock
@@ -31,12 +34,15 @@ from hypothesis import strategies as st
 from packages.valory.skills.abstract_round_abci.tests.conftest import profile_name
 from packages.valory.skills.abstract_round_abci.utils import (
     DEFAULT_TENDERMINT_P2P_PORT,
+    FrozenDict,
+    FrozenList,
     KeyType,
     MAX_UINT64,
     ValueType,
     VerifyDrand,
     consensus_threshold,
     filter_negative,
+    freeze,
     get_data_from_nested_dict,
     get_value_with_type,
     inverse,
@@ -305,3 +311,51 @@ def test_inverse(
 ) -> None:
     """Test `inverse`."""
     assert inverse(dict_) == expected
+
+
+@given(
+    st.recursive(
+        st.none() | st.booleans() | st.integers() | st.text(printable),
+        lambda children: st.lists(children)
+        | st.tuples(children, children)
+        | st.dictionaries(st.text(printable), children),
+    )
+)
+def test_freeze(obj: Any) -> None:
+    """Test `freeze`."""
+    frozen = freeze(obj)
+    assert frozen == obj
+    assert json.dumps(frozen, sort_keys=True) == json.dumps(obj, sort_keys=True)
+    assert pickle.loads(pickle.dumps(frozen)) == frozen  # nosec
+    # frozen objects are neither copied nor frozen again
+    assert copy(frozen) is frozen
+    assert deepcopy(frozen) is frozen
+    assert freeze(frozen) is frozen
+
+
+@pytest.mark.parametrize(
+    "frozen, modification",
+    (
+        (FrozenList([1, 2]), lambda frozen: frozen.append(3)),
+        (FrozenList([1, 2]), lambda frozen: frozen.extend([3])),
+        (FrozenList([1, 2]), lambda frozen: frozen.__setitem__(0, 3)),
+        (FrozenList([1, 2]), lambda frozen: frozen.__delitem__(0)),
+        (FrozenList([1, 2]), lambda frozen: frozen.__iadd__([3])),
+        (FrozenList([1, 2]), lambda frozen: frozen.pop()),
+        (FrozenList([1, 2]), lambda frozen: frozen.sort()),
+        (FrozenDict(a=1), lambda frozen: frozen.__setitem__("b", 2)),
+        (FrozenDict(a=1), lambda frozen: frozen.__delitem__("a")),
+        (FrozenDict(a=1), lambda frozen: frozen.update(b=2)),
+        (FrozenDict(a=1), lambda frozen: frozen.setdefault("b", 2)),
+        (FrozenDict(a=1), lambda frozen: frozen.pop("a")),
+        (FrozenDict(a=1), lambda frozen: frozen.clear()),
+        (freeze({"a": [1]}), lambda frozen: frozen["a"].append(2)),
+        (freeze([{"a": 1}]), lambda frozen: frozen[0].update(b=2)),
+    ),
+)
+def test_frozen_containers_immutable(frozen: Any, modification: Any) -> None:
+    """Test that the frozen containers cannot be modified."""
+    expected = deepcopy(frozen)
+    with pytest.raises(TypeError, match="object is immutable"):
+        modification(frozen)
+    assert frozen == expected
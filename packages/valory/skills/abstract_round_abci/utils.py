@@ -22,6 +22,7 @@
 import builtins
 import collections
 import dataclasses
+import operator
 import sys
 import types
 import typing
@@ -502,3 +503,71 @@ def inverse(dict_: Dict[KeyType, ValueType]) -> Dict[ValueType, List[KeyType]]:
     for key, value in dict_.items():
         inverse_[value].append(key)
     return inverse_
+
+
+class _ImmutableMixin:  # pylint: disable=too-few-public-methods
+    """Mixin for containers which cannot be modified after their creation."""
+
+    def _immutable(self, *_args: Any, **_kwargs: Any) -> None:
+        """Raise an error on any attempt to modify the container."""
+        raise TypeError(f"'{self.__class__.__name__}' object is immutable")
+
+    def __copy__(self) -> Any:
+        """Immutable objects do not need to be copied."""
+        return self
+
+    def __deepcopy__(self, _memo: Dict[int, Any]) -> Any:
+        """Immutable objects, which only contain immutable items, do not need to be copied."""
+        return self
+
+
+# typed as `Any`, since the blocked methods of the containers have overloaded signatures
+_immutable: Any = _ImmutableMixin._immutable  # pylint: disable=protected-access
+
+
+class FrozenList(_ImmutableMixin, list):
+    """A json serializable list which cannot be modified after its creation."""
+
+    __setitem__ = __delitem__ = _immutable
+    __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = _immutable
+    clear = sort = reverse = _immutable
+
+    def __reduce__(self) -> Tuple[Type["FrozenList"], Tuple[List[Any]]]:
+        """Support pickling without calling the blocked `append` and `extend` methods."""
+        return self.__class__, (list(self),)
+
+
+class FrozenDict(_ImmutableMixin, dict):
+    """A json serializable dictionary which cannot be modified after its creation."""
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> Tuple[Type["FrozenDict"], Tuple[Dict[Any, Any]]]:
+        """Support pickling without calling the blocked `__setitem__` method."""
+        return self.__class__, (dict(self),)
+
+
+def freeze(obj: Any) -> Any:
+    """
+    Recursively convert the json serializable containers of an object to immutable ones.
+
+    Lists and dictionaries are converted to `FrozenList` and `FrozenDict` respectively,
+    so that they keep comparing equal to, and being serialized the same way as, the original objects.
+    Already frozen containers, and tuples which only contain immutable items, are returned without copying them.
+
+    :param obj: the object to freeze.
+    :return: the frozen object.
+    """
+    if isinstance(obj, (FrozenList, FrozenDict)):
+        return obj
+    if isinstance(obj, list):
+        return FrozenList(freeze(item) for item in obj)
+    if isinstance(obj, tuple):
+        frozen = tuple(freeze(item) for item in obj)
+        # avoid copying tuples which only contain immutable items
+        return obj if all(map(operator.is_, frozen, obj)) else frozen
+    if isinstance(obj, dict):
+        return FrozenDict((key, freeze(value)) for key, value in obj.items())
+    return obj
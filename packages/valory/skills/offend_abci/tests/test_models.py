@@ -42,6 +42,7 @@ class TestModels:
     def test_setup() -> None:
         """Test `SharedState`'s `setup`."""
         shared_state = SharedState(name="", skill_context=MagicMock())
+        shared_state.context.params.blockchain_max_blocks = None
         shared_state.context.params.setup_params = {"test": []}
         shared_state.setup()
         assert (
@@ -423,11 +423,15 @@ class StatusResetBehaviour(SlashingBaseBehaviour):
         """
         Retrieve a mapping of the given agent instances to their operators.
 
-        Please keep in mind that this method performs a call for each agent instance.
+        Please keep in mind that, unless a multicall address is configured, this method performs a call for each agent instance.
+        If a multicall address is configured, all the calls are batched in a single contract api request.
 
         :param agent_instances: the agent instances to be mapped.
         :return: a mapping of the given agent instances to their operators.
         """
+        if self.params.multicall_address is not None:
+            return (yield from self._get_batched_instances_mapping(agent_instances))
+
         # Ideally, `mapOperatorAndServiceIdAgentInstances` should be used instead of `mapAgentInstanceOperators`,
         # so that we have operators mapped to lists of agent instances for the given service id
         response_msg = yield from self.get_contract_api_response(
@@ -448,6 +452,39 @@ class StatusResetBehaviour(SlashingBaseBehaviour):
 
         return response_msg.raw_transaction.body
 
+    def _get_batched_instances_mapping(
+        self,
+        agent_instances: FrozenSet[str],
+    ) -> Generator[None, None, Optional[Dict[str, str]]]:
+        """
+        Retrieve a mapping of the given agent instances to their operators, batching the calls through the multicall contract.
+
+        :param agent_instances: the agent instances to be mapped.
+        :return: a mapping of the given agent instances to their operators.
+        """
+        agents = sorted(agent_instances)
+        calls = [
+            dict(
+                contract_id=str(ServiceRegistryContract.contract_id),
+                contract_address=self.params.service_registry_address,
+                fn_name="mapAgentInstanceOperators",
+                args=[agent],
+            )
+            for agent in agents
+        ]
+        operators = yield from self.get_batched_contract_state(
+            cast(str, self.params.multicall_address),
+            calls,
+            chain_id=self.params.default_chain_id,
+        )
+        if operators is None or None in operators:
+            self.context.logger.error(
+                f"Couldn't get operators mapping through the multicall contract: {operators}."
+            )
+            return None
+
+        return dict(zip(agents, operators))
+
     def async_act(self) -> Generator:
         """
         Performs the slash result check and the status reset logic.
@@ -26,7 +26,7 @@ from copy import deepcopy
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, Union, cast
+from typing import Any, Dict, Generator, List, Optional, Type, Union, cast
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -504,3 +504,55 @@ class TestStatusResetBehaviour(BaseSlashingTest):
         )
         self.complete()
         sleep_mock.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "operators, expected",
+        (
+            (
+                ["operator_0", "operator_1"],
+                {"instance_0": "operator_0", "instance_1": "operator_1"},
+            ),
+            (["operator_0", None], None),
+            (None, None),
+        ),
+    )
+    def test_get_batched_instances_mapping(
+        self, operators: Optional[List[Optional[str]]], expected: Optional[Dict]
+    ) -> None:
+        """Test that the instances mapping is batched through the multicall contract if its address is configured."""
+        self.fast_forward(
+            data=dict(
+                final_tx_hash="final_tx_hash",
+                all_participants=["a"],
+                participants=["a"],
+                consensus_threshold=1,
+            )
+        )
+
+        def dummy_batched_contract_state(
+            *_: Any, **__: Any
+        ) -> Generator[None, None, Optional[List[Optional[str]]]]:
+            """Dummy `get_batched_contract_state` method."""
+            yield
+            return operators
+
+        behaviour = cast(StatusResetBehaviour, self.current_behaviour)
+        with mock.patch.dict(
+            behaviour.params.__dict__, multicall_address="multicall_address"
+        ), mock.patch.object(
+            behaviour,
+            "get_batched_contract_state",
+            side_effect=dummy_batched_contract_state,
+        ) as batched_mock:
+            gen = behaviour._get_instances_mapping(
+                frozenset(("instance_1", "instance_0"))
+            )
+            next(gen)
+            with pytest.raises(StopIteration) as e:
+                next(gen)
+
+        assert e.value.value == expected
+        multicall_address, calls = batched_mock.call_args[0]
+        assert multicall_address == "multicall_address"
+        assert [call["args"] for call in calls] == [["instance_0"], ["instance_1"]]
+        assert {call["fn_name"] for call in calls} == {"mapAgentInstanceOperators"}
@@ -19,7 +19,18 @@
 
 """This module contains the termination behaviour classes."""
 import sys
-from typing import Callable, Dict, Generator, List, Optional, Set, Type, cast
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from aea.protocols.base import Message
 from hexbytes import HexBytes
@@ -34,6 +45,7 @@ from packages.valory.contracts.multisend.contract import (
 )
 from packages.valory.contracts.service_registry.contract import ServiceRegistryContract
 from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
 from packages.valory.skills.abstract_round_abci.behaviour_utils import (
     AsyncBehaviour,
     BaseBehaviour,
@@ -72,6 +84,14 @@ class BackgroundBehaviour(BaseBehaviour):
 
     matching_round = BackgroundRound
     _service_owner_address: Optional[str] = None
+    # the latest events seen so far, and the last block scanned for each of them,
+    # so that every iteration only scans the blocks produced since the previous one,
+    # they are only valid for the safe contract and the service owner they have been scanned for
+    _scanned_for: Optional[Tuple[str, Optional[str]]] = None
+    _latest_termination_signal: Dict = _NO_EVENT_FOUND
+    _latest_removed_owner_event: Dict = _NO_EVENT_FOUND
+    _termination_signal_cursor: Optional[int] = None
+    _removed_owner_cursor: Optional[int] = None
 
     def async_act(self) -> Generator:
         """
@@ -149,8 +169,16 @@ class BackgroundBehaviour(BaseBehaviour):
         """
         if self._service_owner_address is None:
             self._service_owner_address = yield from self._get_service_owner()
+        self._reset_scans_on_change()
+
+        latest_block = yield from self._get_latest_block_number()
+        if latest_block is None:
+            # something went wrong, we stop executing the rest of the logic
+            return None
 
-        termination_signal = yield from self._get_latest_termination_signal()
+        termination_signal = yield from self._get_latest_termination_signal(
+            latest_block
+        )
         if termination_signal is None:
             # something went wrong, we stop executing the rest of the logic
             return None
@@ -158,7 +186,9 @@ class BackgroundBehaviour(BaseBehaviour):
             # no termination signal has ever been sent to safe
             return False
 
-        service_owner_removal = yield from self._get_latest_removed_owner_event()
+        service_owner_removal = yield from self._get_latest_removed_owner_event(
+            latest_block
+        )
         if service_owner_removal is None:
             # something went wrong, we stop executing the rest of the logic
             return None
@@ -184,15 +214,74 @@ class BackgroundBehaviour(BaseBehaviour):
         # otherwise it's a signal that has already been handled previously
         return termination_signal_occurrence > service_owner_removal_occurrence
 
-    def _get_latest_removed_owner_event(self) -> Generator[None, None, Optional[Dict]]:
+    def _get_latest_block_number(self) -> Generator[None, None, Optional[int]]:
+        """Get the number of the latest block, up to which the events are scanned in this iteration."""
+        response = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="get_block",
+            block_identifier="latest",
+            chain_id=self.params.default_chain_id,
+        )
+        if (
+            response.performative != LedgerApiMessage.Performative.STATE
+            or "number" not in response.state.body
+        ):
+            self.context.logger.error(
+                f"Couldn't get the latest block. "
+                f"Expected response performative {LedgerApiMessage.Performative.STATE.value}, "  # type: ignore
+                f"received {response.performative.value}."
+            )
+            return None
+
+        return int(cast(Union[int, str], response.state.body["number"]))
+
+    def _reset_scans_on_change(self) -> None:
+        """Reset the scanned events if the safe contract or the service owner has changed since they were scanned."""
+        scanned_for = (
+            self.synchronized_data.safe_contract_address,
+            self._service_owner_address,
+        )
+        if scanned_for == self._scanned_for:
+            return
+        self._scanned_for = scanned_for
+        self._latest_termination_signal = _NO_EVENT_FOUND
+        self._latest_removed_owner_event = _NO_EVENT_FOUND
+        self._termination_signal_cursor = None
+        self._removed_owner_cursor = None
+
+    def _next_block(self, cursor: Optional[int]) -> int:
+        """Get the first block to scan, given the last scanned one."""
+        if cursor is None:
+            return self.params.termination_from_block
+        return cursor + 1
+
+    @staticmethod
+    def _latest_event(latest_event: Dict, events: List[Dict]) -> Dict:
+        """Get the latest event, out of the latest one seen so far and the new ones."""
+        for event in events:
+            if latest_event == _NO_EVENT_FOUND or int(event["block_number"]) > int(
+                latest_event["block_number"]
+            ):
+                latest_event = event
+        return latest_event
+
+    def _get_latest_removed_owner_event(
+        self, to_block: int
+    ) -> Generator[None, None, Optional[Dict]]:
         """Returns the latest event in which the service owner was removed from the set of owners of the safe."""
+        from_block = self._next_block(self._removed_owner_cursor)
+        if from_block > to_block:
+            # no new blocks since the previous iteration
+            return self._latest_removed_owner_event
+
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
             contract_id=str(GnosisSafeContract.contract_id),
             contract_callable="get_removed_owner_events",
             contract_address=self.synchronized_data.safe_contract_address,
             removed_owner=self._service_owner_address,
-            from_block=self.params.termination_from_block,
+            from_block=from_block,
+            to_block=to_block,
             chain_id=self.params.default_chain_id,
         )
         if response.performative != ContractApiMessage.Performative.STATE:
@@ -204,22 +293,24 @@ class BackgroundBehaviour(BaseBehaviour):
             return None
 
         removed_owner_events = cast(List[Dict], response.state.body.get("data"))
-        if len(removed_owner_events) == 0:
-            return _NO_EVENT_FOUND
-
-        latest_removed_owner_event = removed_owner_events[0]
-        for removed_owner_event in removed_owner_events[1:]:
-            if int(removed_owner_event["block_number"]) > int(
-                latest_removed_owner_event["block_number"]
-            ):
-                latest_removed_owner_event = removed_owner_event
-
-        return latest_removed_owner_event
+        self._latest_removed_owner_event = self._latest_event(
+            self._latest_removed_owner_event, removed_owner_events
+        )
+        self._removed_owner_cursor = to_block
+        return self._latest_removed_owner_event
 
-    def _get_latest_termination_signal(self) -> Generator[None, None, Optional[Dict]]:
+    def _get_latest_termination_signal(
+        self, to_block: int
+    ) -> Generator[None, None, Optional[Dict]]:
         """Get the latest termination signal sent by the service owner."""
+        from_block = self._next_block(self._termination_signal_cursor)
+        if from_block > to_block:
+            # no new blocks since the previous iteration
+            return self._latest_termination_signal
+
         self.context.logger.info(
-            f"Retrieving termination events on chain '{self.params.default_chain_id}' from block {self.params.termination_from_block}"
+            f"Retrieving termination events on chain '{self.params.default_chain_id}' "
+            f"from block {from_block} to block {to_block}"
         )
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
@@ -227,7 +318,8 @@ class BackgroundBehaviour(BaseBehaviour):
             contract_callable="get_zero_transfer_events",
             contract_address=self.synchronized_data.safe_contract_address,
             sender_address=self._service_owner_address,
-            from_block=self.params.termination_from_block,
+            from_block=from_block,
+            to_block=to_block,
             chain_id=self.params.default_chain_id,
         )
         if response.performative != ContractApiMessage.Performative.STATE:
@@ -239,17 +331,11 @@ class BackgroundBehaviour(BaseBehaviour):
             return None
 
         zero_transfer_events = cast(List[Dict], response.state.body.get("data"))
-        if len(zero_transfer_events) == 0:
-            return _NO_EVENT_FOUND
-
-        latest_zero_transfer_event = zero_transfer_events[0]
-        for zero_transfer_event in zero_transfer_events[1:]:
-            if int(zero_transfer_event["block_number"]) > int(
-                latest_zero_transfer_event["block_number"]
-            ):
-                latest_zero_transfer_event = zero_transfer_event
-
-        return latest_zero_transfer_event
+        self._latest_termination_signal = self._latest_event(
+            self._latest_termination_signal, zero_transfer_events
+        )
+        self._termination_signal_cursor = to_block
+        return self._latest_termination_signal
 
     def _get_service_owner(self) -> Generator[None, None, Optional[str]]:
         """Method that returns the service owner."""
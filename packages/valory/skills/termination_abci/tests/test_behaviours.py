@@ -19,11 +19,13 @@
 
 """This package contains round behaviours of Background Behaviours."""
 
+# pylint: disable=protected-access
+
 import logging
 import platform
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Type, cast
 from unittest import mock
 
 import pytest
@@ -33,6 +35,8 @@ from packages.valory.contracts.multisend.contract import MultiSendContract
 from packages.valory.contracts.service_registry.contract import ServiceRegistryContract
 from packages.valory.protocols.contract_api import ContractApiMessage
 from packages.valory.protocols.contract_api.custom_types import RawTransaction, State
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.protocols.ledger_api.custom_types import State as LedgerState
 from packages.valory.skills.abstract_round_abci.base import AbciAppDB
 from packages.valory.skills.abstract_round_abci.behaviour_utils import AsyncBehaviour
 from packages.valory.skills.abstract_round_abci.behaviours import BaseBehaviour
@@ -138,6 +142,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
         {"block_number": 11},
     ]
     _NUM_SERVICE_OWNER_REMOVED_EVENTS = len(_SERVICE_OWNER_REMOVED_EVENTS)
+    _LATEST_BLOCK = 30
     _SAFE_OWNERS = ["0x1", "0x2", "0x3", "0x4"]
     _NUM_SAFE_OWNERS = len(_SAFE_OWNERS)
     _SAFE_THRESHOLD = 1
@@ -162,6 +167,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
         f"Couldn't get the service owner for service with id={SERVICE_ID}. "
         f"{_STATE_ERR_LOG}"
     )
+    _LATEST_BLOCK_ERR_LOG = "Couldn't get the latest block. "
     _ZERO_TRANSFER_EVENTS_ERR_LOG = (
         f"Couldn't get the latest Zero Transfer (`SafeReceived`) event. "
         f"{_STATE_ERR_LOG}"
@@ -208,6 +214,32 @@ class TestBackgroundBehaviour(BaseTerminationTest):
             ),
         )
 
+    def _mock_get_latest_block_request(
+        self,
+        error: bool = False,
+        block_number: int = _LATEST_BLOCK,
+    ) -> None:
+        """Mock a ledger `get_block` request for the latest block."""
+        if not error:
+            response_kwargs = dict(
+                performative=LedgerApiMessage.Performative.STATE,
+                state=LedgerState(ledger_id="ethereum", body=dict(number=block_number)),
+            )
+        else:
+            response_kwargs = dict(
+                performative=LedgerApiMessage.Performative.ERROR,
+                code=1,
+                message="error",
+                data=b"",
+            )
+        self.mock_ledger_api_request(
+            request_kwargs=dict(
+                performative=LedgerApiMessage.Performative.GET_STATE,
+                callable="get_block",
+            ),
+            response_kwargs=response_kwargs,
+        )
+
     def _mock_get_zero_transfer_events_request(
         self,
         error: bool = False,
@@ -420,9 +452,20 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 expected_log_level=logging.ERROR,
             ),
             BehaviourTestCase(
-                name="agent fails to get zero transfer event",
+                name="agent fails to get the latest block",
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[_mock_get_service_owner_request],
+                err_reqs=[_mock_get_latest_block_request],
+                expected_log=_LATEST_BLOCK_ERR_LOG,
+                expected_log_level=logging.ERROR,
+            ),
+            BehaviourTestCase(
+                name="agent fails to get zero transfer event",
+                initial_data=_INITIAL_DATA,
+                ok_reqs=[
+                    _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
+                ],
                 err_reqs=[_mock_get_zero_transfer_events_request],
                 expected_log=_ZERO_TRANSFER_EVENTS_ERR_LOG,
                 expected_log_level=logging.ERROR,
@@ -432,6 +475,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                 ],
                 err_reqs=[_mock_get_removed_owner_events_request],
@@ -443,6 +487,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                 ],
@@ -455,6 +500,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                     _mock_get_owners_request,
@@ -468,6 +514,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                     _mock_get_owners_request,
@@ -482,6 +529,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                     _mock_get_owners_request,
@@ -497,6 +545,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                     _mock_get_owners_request,
@@ -513,6 +562,7 @@ class TestBackgroundBehaviour(BaseTerminationTest):
                 initial_data=_INITIAL_DATA,
                 ok_reqs=[
                     _mock_get_service_owner_request,
+                    _mock_get_latest_block_request,
                     _mock_get_zero_transfer_events_request,
                     _mock_get_removed_owner_events_request,
                     _mock_get_owners_request,
@@ -617,14 +667,69 @@ class TestBackgroundBehaviour(BaseTerminationTest):
         with mock.patch.object(AsyncBehaviour, "sleep") as sleep:
             self.behaviour.act_wrapper()
             self._mock_get_service_owner_request()
+            self._mock_get_latest_block_request()
             self._mock_get_zero_transfer_events_request(num_events=0)
             sleep.assert_called()
 
+    def test_incremental_polling(self) -> None:
+        """Tests that every iteration only scans the blocks produced since the previous one."""
+        self.fast_forward(self._INITIAL_DATA)
+        behaviour = cast(BackgroundBehaviour, self.behaviour.current_behaviour)
+        with mock.patch.object(AsyncBehaviour, "sleep") as sleep:
+            self.behaviour.act_wrapper()
+            self._mock_get_service_owner_request()
+            self._mock_get_latest_block_request()
+            self._mock_get_zero_transfer_events_request(num_events=0)
+            assert sleep.call_count == 1
+            assert behaviour._termination_signal_cursor == self._LATEST_BLOCK
+
+            # no new blocks, no events are requested
+            self.behaviour.act_wrapper()
+            self._mock_get_latest_block_request()
+            assert sleep.call_count == 2
+            self.assert_quantity_in_outbox(0)
+
+            # only the new blocks are scanned, and the latest signal is remembered
+            with mock.patch.object(self.behaviour.context.logger, "info") as mock_info:
+                self.behaviour.act_wrapper()
+                self._mock_get_latest_block_request(block_number=2 * self._LATEST_BLOCK)
+                mock_info.assert_any_call(
+                    "Retrieving termination events on chain "
+                    f"'{behaviour.params.default_chain_id}' "
+                    f"from block {self._LATEST_BLOCK + 1} to block {2 * self._LATEST_BLOCK}"
+                )
+            self._mock_get_zero_transfer_events_request(num_events=0)
+            assert sleep.call_count == 3
+            assert behaviour._termination_signal_cursor == 2 * self._LATEST_BLOCK
+            assert behaviour._latest_termination_signal == {}
+
+    def test_reset_scans_on_change(self) -> None:
+        """Tests that the scanned events are reset when the safe contract or the service owner changes."""
+        self.fast_forward(self._INITIAL_DATA)
+        behaviour = cast(BackgroundBehaviour, self.behaviour.current_behaviour)
+        behaviour._service_owner_address = "owner"
+        behaviour._reset_scans_on_change()
+        behaviour._latest_termination_signal = {"block_number": 1}
+        behaviour._termination_signal_cursor = self._LATEST_BLOCK
+        behaviour._removed_owner_cursor = self._LATEST_BLOCK
+
+        # nothing changed, the scans are kept
+        behaviour._reset_scans_on_change()
+        assert behaviour._termination_signal_cursor == self._LATEST_BLOCK
+
+        behaviour._service_owner_address = "new_owner"
+        behaviour._reset_scans_on_change()
+        assert behaviour._latest_termination_signal == {}
+        assert behaviour._latest_removed_owner_event == {}
+        assert behaviour._termination_signal_cursor is None
+        assert behaviour._removed_owner_cursor is None
+
     def test_no_remove_owner_event_is_present(self) -> None:
         """Tests the background behaviour when the safe owner hasn't been removed."""
         self.fast_forward(self._INITIAL_DATA)
         self.behaviour.act_wrapper()
         self._mock_get_service_owner_request()
+        self._mock_get_latest_block_request()
         self._mock_get_zero_transfer_events_request()
         self._mock_get_removed_owner_events_request(num_events=0)
         self._mock_get_owners_request()
@@ -50,6 +50,7 @@ class TestSharedState:
         shared_state: SharedState,
     ) -> None:
         """Test setup."""
+        shared_state.context.params.blockchain_max_blocks = None
         shared_state.context.params.setup_params = {
             "test": [],
             "all_participants": [["0x0"]],
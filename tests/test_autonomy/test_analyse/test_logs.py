@@ -19,10 +19,21 @@
 
 """Test log parser."""
 
+import logging
+import re
 import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Iterator, List
 
-from autonomy.analyse.logs.collection import LogCollection
+import pytest
+
+from autonomy.analyse.logs.base import LogRow, TIME_FORMAT, parse_timestamp
+from autonomy.analyse.logs.collection import FromDirectory, LogCollection
+from autonomy.analyse.logs.db import AgentLogsDB
+from autonomy.analyse.logs.timeline import AgentsTimeline
 
 
 LOGS = """[2023-09-26 06:27:56,015] [INFO] [agent] Entered in the 'check_transaction_history_behaviour' behaviour
@@ -70,3 +81,292 @@ def test_multiline_parse() -> None:
 
         for line in LOGS_CLEAN.split("\n"):
             assert line in parsed
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    (
+        "2023-09-26 06:27:56,015",
+        "2023-01-01 00:00:00,000",
+        "2023-12-31 23:59:59,999",
+        "2023-9-6 6:27:56,15",
+    ),
+)
+def test_parse_timestamp(timestamp: str) -> None:
+    """Test timestamp parsing."""
+
+    assert parse_timestamp(timestamp) == datetime.strptime(timestamp, TIME_FORMAT)
+
+
+def test_insert_many() -> None:
+    """Test batched inserts."""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file = Path(temp_dir, "aea_0.txt")
+        file.write_text(LOGS)
+        db = AgentLogsDB(agent="aea_0", file=Path(temp_dir, "logs.db")).create()
+        n_rows = db.insert_many(logs=LogCollection.parse(file=file), batch_size=2)
+
+        assert n_rows == 3
+        assert len(db.select()) == 3
+        indexes = db.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='index';"
+        ).fetchall()
+        assert len(indexes) == 3
+        db.close()
+
+
+def test_create_agent_dbs_parallel() -> None:
+    """Test parallel ingestion gives the same result as the sequential one."""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for agent in ("aea_0", "aea_1", "aea_2"):
+            Path(temp_dir, f"{agent}.txt").write_text(LOGS)
+
+        collection = FromDirectory(directory=Path(temp_dir))
+        parallel = {
+            agent: AgentLogsDB(agent=agent, file=Path(temp_dir, "parallel.db"))
+            for agent in collection.agents
+        }
+        sequential = {
+            agent: AgentLogsDB(agent=agent, file=Path(temp_dir, "sequential.db"))
+            for agent in collection.agents
+        }
+
+        assert collection.create_agent_dbs(dbs=parallel) == 9
+        assert collection.create_agent_dbs(dbs=sequential, max_workers=1) == 9
+        for agent in collection.agents:
+            assert parallel[agent].select() == sequential[agent].select()
+
+        # already ingested tables are skipped unless reset
+        assert collection.create_agent_dbs(dbs=parallel) == 0
+        assert collection.create_agent_dbs(dbs=parallel, reset=True) == 9
+
+        for db in (*parallel.values(), *sequential.values()):
+            db.close()
+
+
+def _filter_in_memory(
+    rows: List[LogRow], include_regexes: List[str], exclude_regexes: List[str]
+) -> List[LogRow]:
+    """Filter the rows in python, the way the results were filtered before the regex pushdown."""
+
+    include = [re.compile(pattern) for pattern in include_regexes]
+    exclude = [re.compile(pattern) for pattern in exclude_regexes]
+    if len(include) > 0:
+        rows = [row for row in rows if any(_re.match(row[2]) for _re in include)]
+    if len(exclude) > 0:
+        rows = [row for row in rows if any(not _re.match(row[2]) for _re in exclude)]
+    return rows
+
+
+@pytest.mark.parametrize(
+    ("include_regexes", "exclude_regexes"),
+    (
+        ([], []),
+        ([r"Entered"], []),
+        ([r"Entered", r"arrived"], []),
+        ([], [r"get_safe_nonce"]),
+        ([], [r"get_safe_nonce", r"arrived"]),
+        ([r".*block"], [r"Entered"]),
+    ),
+)
+def test_select_regex_pushdown(
+    include_regexes: List[str], exclude_regexes: List[str]
+) -> None:
+    """Test the regexes evaluated by SQLite select the same rows as the python filters."""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file = Path(temp_dir, "aea_0.txt")
+        file.write_text(LOGS)
+        db = AgentLogsDB(agent="aea_0", file=Path(temp_dir, "logs.db")).create()
+        db.insert_many(logs=LogCollection.parse(file=file))
+
+        expected = _filter_in_memory(db.select(), include_regexes, exclude_regexes)
+        selected = db.iter_select(
+            include_regexes=include_regexes, exclude_regexes=exclude_regexes
+        )
+        assert isinstance(selected, Iterator)
+        assert list(selected) == expected
+        db.close()
+
+
+def _generate_logs(n_rows: int) -> Iterator[LogRow]:
+    """Generate synthetic agent logs."""
+
+    start = datetime(2023, 9, 26)
+    for i in range(n_rows):
+        period = i // 1_000
+        if i % 10 == 0:
+            message = f"Entered in the 'round_{i % 7}' round for period {period}"
+        else:
+            message = f"arrived block with timestamp: {i} " + "x" * 200
+        yield (start + timedelta(milliseconds=i), "INFO", message, period, None, None)
+
+
+@pytest.mark.benchmark
+def test_select_regex_pushdown_benchmark() -> None:
+    """Benchmark filtering the logs of several agents in SQLite against filtering them in memory."""
+
+    n_agents, n_rows = 4, 50_000
+    include_regexes = [r"Entered in the"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dbs = [
+            AgentLogsDB(agent=f"aea_{i}", file=Path(temp_dir, "logs.db")).create()
+            for i in range(n_agents)
+        ]
+        for db in dbs:
+            db.insert_many(logs=_generate_logs(n_rows))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        in_memory = sum(
+            len(_filter_in_memory(db.select(), include_regexes, [])) for db in dbs
+        )
+        in_memory_time = time.perf_counter() - start
+        _, in_memory_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        streamed = sum(
+            sum(1 for _ in db.iter_select(include_regexes=include_regexes))
+            for db in dbs
+        )
+        streamed_time = time.perf_counter() - start
+        _, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for db in dbs:
+            db.close()
+
+    logging.info(
+        f"Filtered {n_agents * n_rows} rows in memory in {in_memory_time:.3f}s "
+        f"using {in_memory_peak / 2**20:.1f}MiB, streamed from SQLite in "
+        f"{streamed_time:.3f}s using {streamed_peak / 2**20:.1f}MiB"
+    )
+    assert in_memory == streamed == n_agents * n_rows // 10
+    assert streamed_peak < in_memory_peak
+
+
+def _generate_round_logs(
+    rounds: List[str], n_periods: int, delay: float, round_time: float
+) -> str:
+    """Generate the logs of an agent which enters the rounds `delay` seconds after the start of the round."""
+
+    start = datetime(2023, 9, 26)
+    lines = []
+    for period in range(n_periods):
+        for i, round_name in enumerate(rounds):
+            offset = (period * len(rounds) + i) * round_time + delay
+            timestamp = (start + timedelta(seconds=offset)).strftime(TIME_FORMAT)[:-3]
+            lines.append(
+                f"[{timestamp}] [INFO] [agent] Entered in the '{round_name}' round for period {period}"
+            )
+            lines.append(
+                f"[{timestamp}] [INFO] [agent] Entered in the '{round_name}_behaviour' behaviour"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def test_timeline() -> None:
+    """Test the round latencies and the skew between the agents."""
+
+    rounds = ["registration", "collect", "reset"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i, delay in enumerate((0.0, 0.5, 1.5)):
+            Path(temp_dir, f"aea_{i}.txt").write_text(
+                _generate_round_logs(
+                    rounds=rounds, n_periods=3, delay=delay, round_time=2.0
+                )
+            )
+
+        collection = FromDirectory(directory=Path(temp_dir))
+        db_file = Path(temp_dir, "logs.db")
+        dbs = {
+            agent: AgentLogsDB(agent=agent, file=db_file)
+            for agent in ("aea_0", "aea_1", "aea_2")
+        }
+        collection.create_agent_dbs(dbs=dbs, max_workers=1)
+        timeline = AgentsTimeline(agents=list(dbs), file=db_file).create()
+
+        # the last round of every agent has not finished yet
+        latencies = {stats[0]: stats[1:] for stats in timeline.round_latencies()}
+        assert set(latencies) == set(rounds)
+        assert latencies["reset"][0] == 3 * 2
+        for _, mean, *percentiles in latencies.values():
+            assert mean == pytest.approx(2.0, abs=1e-3)
+            assert percentiles == pytest.approx([2.0] * 4, abs=1e-3)
+        behaviours = [stats[0] for stats in timeline.behaviour_latencies(top=2)]
+        assert len(behaviours) == 2
+        assert all(behaviour.endswith("_behaviour") for behaviour in behaviours)
+
+        slowest = timeline.slowest_rounds(top=1)
+        assert len(slowest) == 1
+        assert slowest[0][3] == pytest.approx(2.0, abs=1e-3)
+
+        skews = timeline.round_skews()
+        assert len(skews) == 9
+        for period, round_name, n_agents, enter_skew, exit_skew in skews:
+            assert n_agents == 3
+            assert enter_skew == pytest.approx(1.5, abs=1e-3)
+            if period == 2 and round_name == "reset":
+                assert exit_skew is None
+            else:
+                assert exit_skew == pytest.approx(1.5, abs=1e-3)
+
+        lags = timeline.agent_lags()
+        assert [lag[0] for lag in lags] == ["aea_2", "aea_1", "aea_0"]
+        assert [lag[2] for lag in lags] == pytest.approx([1.5, 0.5, 0.0], abs=1e-3)
+        timeline.close()
+        for db in dbs.values():
+            db.close()
+
+
+def test_timeline_filters() -> None:
+    """Test the spans are filtered once they are extracted."""
+
+    rounds = ["registration", "collect", "reset"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i, delay in enumerate((0.0, 0.5)):
+            Path(temp_dir, f"aea_{i}.txt").write_text(
+                _generate_round_logs(
+                    rounds=rounds, n_periods=3, delay=delay, round_time=2.0
+                )
+            )
+
+        collection = FromDirectory(directory=Path(temp_dir))
+        db_file = Path(temp_dir, "logs.db")
+        dbs = {
+            agent: AgentLogsDB(agent=agent, file=db_file)
+            for agent in ("aea_0", "aea_1")
+        }
+        collection.create_agent_dbs(dbs=dbs, max_workers=1)
+
+        timeline = AgentsTimeline(agents=list(dbs), file=db_file).create(
+            period=1, round_name="collect"
+        )
+        assert [stats[:2] for stats in timeline.round_latencies()] == [("collect", 2)]
+        assert [stats[:2] for stats in timeline.behaviour_latencies()] == [
+            ("collect_behaviour", 2)
+        ]
+        # the span still ends when the agent enters the next round
+        assert timeline.round_latencies()[0][2] == pytest.approx(2.0, abs=1e-3)
+        timeline.close()
+
+        start = datetime(2023, 9, 26)
+        timeline = AgentsTimeline(agents=list(dbs), file=db_file).create(
+            start_time=start + timedelta(seconds=5),
+            end_time=start + timedelta(seconds=13),
+        )
+        # the rounds entered between 6s and 12s, by both agents
+        assert sorted(skew[:2] for skew in timeline.round_skews()) == [
+            (1, "collect"),
+            (1, "registration"),
+            (1, "reset"),
+            (2, "registration"),
+        ]
+        timeline.close()
+        for db in dbs.values():
+            db.close()
@@ -25,7 +25,7 @@ from contextlib import suppress
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from autonomy.analyse.benchmark.aggregate import BlockTypes
+from autonomy.analyse.benchmark.aggregate import BlockTypes, SAMPLES_FILE, percentile
 from autonomy.deploy.constants import BENCHMARKS_DIR
 
 from tests.test_autonomy.test_cli.base import BaseCliTest
@@ -54,6 +54,42 @@ def generate_benchmark_data(
     ]
 
 
+def generate_samples(period: int) -> List[Dict]:
+    """Generate dummy samples."""
+
+    samples: List[Dict] = [
+        {
+            "period": period,
+            "behaviour": f"behaviour_{behaviour}",
+            "block": block,
+            "wall_ns": 1_000_000 * (sample + 1),
+            "cpu_ns": 500_000,
+        }
+        for behaviour in range(NUMBER_OF_BEHAVIOURS)
+        for block in (BlockTypes.LOCAL, BlockTypes.CONSENSUS)
+        for sample in range(2)
+    ]
+    samples.append(
+        {
+            "period": period,
+            "round": "round_a",
+            "abci": "deliver_tx",
+            "wall_ns": 2_000_000,
+            "cpu_ns": 1_000_000,
+        }
+    )
+    return samples
+
+
+def test_percentile() -> None:
+    """Test percentile."""
+
+    assert percentile([1.0], 99) == 1.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 90) == 4.6
+    assert percentile([1.0, 2.0], 0) == 1.0
+
+
 class TestBenchmarks(BaseCliTest):
     """Test benchmarks tool."""
 
@@ -77,6 +113,11 @@ class TestBenchmarks(BaseCliTest):
             for i in range(NUMBER_OF_PERIODS):
                 period_file = agent_dir / f"{i}.json"
                 period_file.write_text(json.dumps(generate_benchmark_data()))
+            with open(agent_dir / SAMPLES_FILE, "w", encoding="utf-8") as samples_file:
+                for i in range(NUMBER_OF_PERIODS):
+                    samples_file.writelines(
+                        json.dumps(sample) + "\n" for sample in generate_samples(i)
+                    )
 
         os.chdir(self.t)
 
@@ -106,8 +147,18 @@ class TestBenchmarks(BaseCliTest):
         file_content = self.output_file.read_text()
         block_types = [BlockTypes.LOCAL, BlockTypes.CONSENSUS, BlockTypes.TOTAL]
 
+        assert "Block: samples (ms)" in file_content
+        assert "P99" in file_content
+        sampled_block = (
+            BlockTypes.CONSENSUS
+            if block_type == BlockTypes.CONSENSUS
+            else BlockTypes.LOCAL
+        )
+        assert f"behaviour_0: {sampled_block}" in file_content
+
         if block_type == BlockTypes.ALL:
             assert any([f"Block: {b}" in file_content for b in block_types])
+            assert "abci: deliver_tx" in file_content
         else:
             block_types.remove(block_type)
             assert f"Block: {block_type}" in file_content
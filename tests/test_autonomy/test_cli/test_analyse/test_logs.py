@@ -70,6 +70,16 @@ class TestAnalyseLogs(BaseLogAnalyserTest):
         assert result.exit_code == 1, result.stdout
         assert "Available agents: ['aea_0']" in result.output
 
+    def test_ingest_rate(self) -> None:
+        """Test ingest rate is reported when the database is created."""
+
+        result = self.run_cli(
+            commands=("--from-dir", str(LOGS_DIR), "-a", "aea_0", "--reset-db")
+        )
+
+        assert result.exit_code == 0, result.stdout
+        assert "rows/s" in result.output
+
     def test_logs_table(self) -> None:
         """Test print agent options."""
 
@@ -229,6 +239,65 @@ class TestAnalyseLogs(BaseLogAnalyserTest):
             ]
         )
 
+    def test_timeline(self) -> None:
+        """Test round latency statistics."""
+
+        result = self.run_cli(
+            commands=(
+                "--from-dir",
+                str(LOGS_DIR),
+                "-a",
+                "aea_0",
+                "--timeline",
+                "--top",
+                "3",
+            )
+        )
+        assert result.exit_code == 0, result.stdout
+        assert "--- Round latencies ---" in result.output
+        assert "--- Agent lag ---" in result.output
+        assert "reset_and_pause | 2 |" in result.output
+        assert "aea_0 | 20 rounds | mean 0.000s | max 0.000s" in result.output
+
+    def test_timeline_period_filter(self) -> None:
+        """Test round latency statistics of a single period."""
+
+        result = self.run_cli(
+            commands=(
+                "--from-dir",
+                str(LOGS_DIR),
+                "-a",
+                "aea_0",
+                "--timeline",
+                "--period",
+                "1",
+            )
+        )
+        assert result.exit_code == 0, result.stdout
+        assert "aea_0 | 6 rounds | mean 0.000s | max 0.000s" in result.output
+
+    def test_timeline_unsupported_filters(self) -> None:
+        """Test the filters which select log lines cannot be used with the timeline."""
+
+        result = self.run_cli(
+            commands=(
+                "--from-dir",
+                str(LOGS_DIR),
+                "-a",
+                "aea_0",
+                "--timeline",
+                "--log-level",
+                "INFO",
+                "-ir",
+                "Entered",
+            )
+        )
+        assert result.exit_code == 1, result.stdout
+        assert (
+            "--log-level, --include-regex cannot be used with --timeline"
+            in result.output
+        )
+
     def test_empty_logs_dir(self) -> None:
         """Test print agent options."""
 
@@ -28,6 +28,7 @@ from typing import Dict, Tuple
 import _strptime  # noqa  # pylint: disable=unsed-import
 
 from autonomy.cli import cli
+from autonomy.cli.helpers.ipfs_hash import HASH_CACHE_FILE
 from autonomy.configurations.loader import load_service_config
 
 from tests.conftest import ROOT_DIR
@@ -90,6 +91,32 @@ class TestHashAll(BaseCliTest):
         assert result.exit_code == 0, result.output
         assert "Verifying packages.json" in result.output, result.output
 
+    def test_hash_cache(
+        self,
+    ) -> None:
+        """Check that `hash-all` only processes the packages which have changed since the last run."""
+
+        cli_options = ("--packages-dir", str(self.packages_dir), "--max-workers", "1")
+        result = self.run_cli(cli_options)
+        assert result.exit_code == 0, result.output
+        assert "Processing package" in result.output, result.output
+        assert "Processed dependency level 0" in result.output, result.output
+        assert (self.packages_dir / HASH_CACHE_FILE).is_file()
+
+        result = self.run_cli(cli_options)
+        assert result.exit_code == 0, result.output
+        assert "Processing package" not in result.output, result.output
+
+        protocol_message = (
+            self.packages_dir / "valory" / "protocols" / "abci" / "message.py"
+        )
+        protocol_message.write_text(protocol_message.read_text() + "\n")
+        result = self.run_cli(cli_options)
+        assert result.exit_code == 0, result.output
+        assert "Processing package abci of type protocol" in result.output
+        assert "Processing package abci of type connection" in result.output
+        assert "Processing package gnosis_safe of type contract" not in result.output
+
 
 class TestHashOne(BaseCliTest):
     """Test `hash one` command."""